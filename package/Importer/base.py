@@ -12,10 +12,18 @@ Functions:
     getFileType(str) -> str
     getYear(str) -> int
     handleNaN(float) -> int | float
+    rangesMask(np.ndarray, tuple) -> np.ndarray
+    getIntegers(pd.Series) -> np.ndarray
+    getYears(pd.Series) -> np.ndarray
+    getYearColumn(pd.Series) -> pd.Series
+    compactIntegers(pd.Series, str) -> pd.Series
+    frameToRecords(pd.DataFrame | pd.Series) -> list
+    collapseDuplicates(list, list) -> tuple[list, list, np.ndarray, np.ndarray]
 
 Misc variables:
 
-    None
+    INTEGER_PATTERN : str
+        A regular expression matching strings that int() accepts.
 
 Exceptions:
 
@@ -23,11 +31,23 @@ Exceptions:
     ColumnLabelException
     UnsupportedFileTypeException
     BoundsException
+    ChunkSizeException
+    WorkersException
+    ImporterException
 '''
 from . import constants as c
+from . import cache as ca
+from . import xlsx as xl
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import numpy as np
 import math
+import os
+import time
 from .. import exceptions as e
+from .. import instrument as ins
+
+INTEGER_PATTERN = r'[+-]?\d+'
 
 class DataSet:
     '''
@@ -41,19 +61,56 @@ class DataSet:
         The labels of the columns with relavant data.
     textFieldColumnLabels : list
         The labels of the columns with free text.
+    dateColumnLabel : str
+        The label of the column with the date data.
     trainFile : str
         The path to a file containing training data.
     testFile : str
         The path to a file containing testing data.
     fileLocations : list
         List of paths of files where data is stored.
+    chunkSize : int
+        The number of rows to read from a csv or xlsx file at a time. 0 reads 
+        whole files.
+    importWorkers : int
+        The number of files to read concurrently.
+    importCacheDir : str
+        A directory in which to cache the relavant columns of each file in a 
+        binary format. '' disables caching.
+    schema : dict
+        The compact dtype to give each column, keyed by column label. Empty 
+        unless compactDtypes is True.
+    parseDtypes : dict
+        The dtypes from schema which are assigned while parsing a file.
+
+    Constructed by running the importToFrame() method:
+    fileTimes : list
+        The time taken to read each file, in the order the files were given.
+    fileSpaces : list
+        The memory held by the records read from each file, in the order the 
+        files were given.
 
     Methods
     -------
-    importToFrame() -> pd.DataFrame | tuple:
+    importToFrame(function, str) -> pd.DataFrame | tuple:
         Creates a data frame or pair of data frames containing data from the provided files.
-    fileToFrame(str) -> pd.DataFrame:
+    filesToFrames(list, function, str) -> list:
+        Reads a list of files into a list of data frames, in order.
+    timedFileToFrame(str, function, str) -> tuple[pd.DataFrame, float, int]:
+        Extracts a data frame of records from a given file and measures the 
+        read.
+    fileToFrame(str, function, str) -> pd.DataFrame:
         Extracts a data frame of records from a given file.
+    readFile(str, str) -> pd.DataFrame:
+        Reads the relavant columns of a whole file into a data frame.
+    streamFile(str, str, function) -> pd.DataFrame:
+        Reads a csv or xlsx file in chunks, filtering each chunk as it is read.
+    filterChunk(pd.DataFrame, function) -> pd.DataFrame:
+        Prepares a chunk of records read from a file and filters it.
+    addYears(pd.DataFrame) -> pd.DataFrame:
+        Adds a column holding the year of each record.
+    applySchema(pd.DataFrame) -> pd.DataFrame:
+        Gives the columns of a data frame their compact dtypes.
     '''
 
     def __init__(self,
@@ -66,7 +123,11 @@ class DataSet:
                  ageColumnLabel : str,
                  customColumnLabels : list,
                  textFieldColumnLabels : list,
-                 flagColumnLabel : str):
+                 flagColumnLabel : str,
+                 chunkSize : int = 0,
+                 importWorkers : int = 1,
+                 importCacheDir : str = '',
+                 compactDtypes : bool = False):
         '''
         Constructs attributes for DataSet object.
 
@@ -92,6 +153,18 @@ class DataSet:
             The labels of the columns with free text.
         flagColumnLabel : str
             The label of the column with the classification flag.
+        chunkSize : int
+            The number of rows to read from a csv or xlsx file at a time. 0 
+            reads whole files.
+        importWorkers : int
+            The number of files to read concurrently.
+        importCacheDir : str
+            A directory in which to cache the relavant columns of each file in
+            a binary format. '' disables caching.
+        compactDtypes : bool
+            Whether to give columns compact dtypes based on their role. Hospital
+            codes become categorical, sex codes and flags int8, ages nullable 
+            int16 and free text the string dtype.
         '''
         if not isinstance(trainFile, str):
             raise e.FileException(
@@ -172,6 +245,28 @@ class DataSet:
                 'Must provide a flag column label.'
             )
         
+        if (not isinstance(chunkSize, int) or isinstance(chunkSize, bool)
+            or chunkSize < 0):
+            raise e.ChunkSizeException(
+                'chunkSize must be a non-negative int.'
+            )
+        
+        if (not isinstance(importWorkers, int) or isinstance(importWorkers, bool)
+            or importWorkers < 1):
+            raise e.WorkersException(
+                'importWorkers must be a positive int.'
+            )
+        
+        if not isinstance(importCacheDir, str):
+            raise e.FileException(
+                'importCacheDir must be a string.'
+            )
+        
+        if not isinstance(compactDtypes, bool):
+            raise e.ImporterException(
+                'compactDtypes must be a bool.'
+            )
+        
         self.columnLabels = []
 
         if dateColumnLabel != '':
@@ -195,18 +290,43 @@ class DataSet:
         self.columnLabels.append(flagColumnLabel)
  
         self.textFieldColumnLabels = textFieldColumnLabels
+        self.dateColumnLabel = dateColumnLabel
 
         self.trainFile = trainFile
         self.testFile = testFile
         self.fileLocations = fileLocations
+        self.chunkSize = chunkSize
+        self.importWorkers = importWorkers
+        self.importCacheDir = importCacheDir
+
+        self.schema = {}
+        if compactDtypes:
+            if hospitalColumnLabel != '':
+                self.schema[hospitalColumnLabel] = 'category'
+            if sexColumnLabel != '':
+                self.schema[sexColumnLabel] = 'int8'
+            if ageColumnLabel != '':
+                self.schema[ageColumnLabel] = 'Int16'
+            for label in textFieldColumnLabels:
+                self.schema[label] = 'string'
+            self.schema[flagColumnLabel] = 'int8'
+        self.parseDtypes = {label : dtype for label, dtype in self.schema.items()
+                            if dtype in ['category', 'string']}
 
-    def importToFrame(self) -> pd.DataFrame | tuple:
+    def importToFrame(self, 
+                      rowFilter = None,
+                      filterKey : str = '') -> pd.DataFrame | tuple:
         '''
         Creates a data frame or pair of data frames containing data from the provided files.
 
         Parameters
         ----------
-        None
+        rowFilter : function
+            When called on a data frame, returns the records to keep. Applied to
+            each chunk as it is read.
+        filterKey : str
+            A description of rowFilter, identifying the filtered records in the
+            import cache.
 
         Returns
         -------
@@ -221,24 +341,111 @@ class DataSet:
             A data frame of testing records with relavent columns from the data files.
         '''
         if self.trainFile != '' and self.testFile != '':
-            trainFrame = self.fileToFrame(self.trainFile)
-            testFrame = self.fileToFrame(self.testFile)
+            trainFrame, testFrame = self.filesToFrames([self.trainFile, 
+                                                        self.testFile],
+                                                       rowFilter,
+                                                       filterKey)
             return (trainFrame, testFrame)
         else:
-            dataFrame = self.fileToFrame(self.fileLocations[0])
-            for file in self.fileLocations[1:len(self.fileLocations)]:
-                dataFrame = pd.concat([dataFrame, self.fileToFrame(file)], axis= 0)
+            frames = self.filesToFrames(self.fileLocations, 
+                                        rowFilter, 
+                                        filterKey)
+            if len(frames) == 1:
+                return frames[0]
+            dataFrame = self.applySchema(pd.concat(frames, axis= 0))
             return dataFrame
+
+    def filesToFrames(self,
+                      files : list,
+                      rowFilter = None,
+                      filterKey : str = '') -> list:
+        '''
+        Reads a list of files into a list of data frames, in order. Files are 
+        read concurrently when importWorkers is greater than 1.
+
+        Parameters
+        ----------
+        files : list
+            The paths of the files to read.
+        rowFilter : function
+            When called on a data frame, returns the records to keep.
+        filterKey : str
+            A description of rowFilter, identifying the filtered records in the
+            import cache.
+
+        Returns
+        -------
+        frames : list
+            The data frames read from each file, in the order of files.
+        '''
+        read = lambda file : self.timedFileToFrame(file, rowFilter, filterKey)
+        if self.importWorkers > 1 and len(files) > 1:
+            workers = min(self.importWorkers, len(files))
+            with ThreadPoolExecutor(max_workers= workers) as pool:
+                results = list(pool.map(read, files))
+        else:
+            results = [read(file) for file in files]
+        frames = [result[0] for result in results]
+        self.fileTimes = [result[1] for result in results]
+        self.fileSpaces = [result[2] for result in results]
+        return frames
+
+    def timedFileToFrame(self,
+                         file : str,
+                         rowFilter = None,
+                         filterKey : str = '') -> tuple[pd.DataFrame, float, int]:
+        '''
+        Extracts a data frame of records from a given file and measures the 
+        read.
+
+        Parameters
+        ----------
+        file : str
+            The path of the file to extract the records from.
+        rowFilter : function
+            When called on a data frame, returns the records to keep.
+        filterKey : str
+            A description of rowFilter, identifying the filtered records in the
+            import cache.
+
+        Returns
+        -------
+        outFrame : pd.DataFrame
+            The data frame of records extracted from the file.
+        fileTime : float
+            The time taken to read the file.
+        fileSpace : int
+            The memory, in bytes, held by the data frame.
+        '''
+        with ins.span('read ' + os.path.basename(file)) as readSpan:
+            time0 = time.perf_counter()
+            outFrame = self.fileToFrame(file, rowFilter, filterKey)
+            fileTime = time.perf_counter() - time0
+            if readSpan is not ins.NULL_SPAN:
+                readSpan.records = len(outFrame)
+        fileSpace = int(outFrame.memory_usage(deep= True).sum())
+        return (outFrame, fileTime, fileSpace)
     
     def fileToFrame(self, 
-                   file : str) -> pd.DataFrame:
+                   file : str,
+                   rowFilter = None,
+                   filterKey : str = '') -> pd.DataFrame:
         '''
-        Extracts a data frame of records from a given file.
+        Extracts a data frame of records from a given file. If importCacheDir
+        is set, the records kept are cached, so a filtered file is only cached
+        when filterKey describes rowFilter.
 
         Parameters
         ----------
         file : str
             The path of the file to extract the records from.
+        rowFilter : function
+            When called on a data frame, returns the records to keep. If 
+            chunkSize is positive, files are read in chunks and only the
+            records kept from each chunk are held in memory.
+        filterKey : str
+            A description of rowFilter, identifying the filtered records in the
+            import cache.
 
         Retruns
         -------
@@ -250,11 +457,52 @@ class DataSet:
             raise e.UnsupportedFileTypeException(
                 'Must provide files of type csv or xlsx.'
             )
+        cached = (self.importCacheDir != '' 
+                  and (rowFilter is None or filterKey != ''))
+        if cached:
+            path = ca.cachePath(self.importCacheDir, 
+                                file, 
+                                self.columnLabels, 
+                                self.schema,
+                                filterKey if rowFilter is not None else '')
+            outFrame = ca.readCache(path)
+            if outFrame is not None:
+                return outFrame
+        if self.chunkSize > 0:
+            outFrame = self.streamFile(file, fileType, rowFilter)
+        else:
+            outFrame = self.addYears(self.readFile(file, fileType))
+            outFrame = self.applySchema(outFrame)
+            if rowFilter is not None:
+                outFrame = rowFilter(outFrame)
+        if cached:
+            ca.writeCache(outFrame, path)
+        return outFrame
+
+    def readFile(self,
+                 file : str,
+                 fileType : str) -> pd.DataFrame:
+        '''
+        Reads the relavant columns of a whole file into a data frame.
+
+        Parameters
+        ----------
+        file : str
+            The path of the file to read.
+        fileType : str
+            The file extension of the file, either "csv" or "xlsx".
+
+        Returns
+        -------
+        outFrame : pd.DataFrame
+            The data frame of records read from the file.
+        '''
         if fileType == 'csv':
             try:
                 outFrame = pd.read_csv(
                     file, 
                     usecols = self.columnLabels, 
+                    dtype = self.parseDtypes or None,
                     encoding_errors= 'ignore', 
                     low_memory= False
                     )
@@ -266,7 +514,8 @@ class DataSet:
             try:
                 outFrame = pd.read_excel(
                     file, 
-                    usecols = self.columnLabels
+                    usecols = self.columnLabels,
+                    dtype = self.parseDtypes or None
                     )
             except ValueError:
                 raise e.ColumnLabelException(
@@ -274,6 +523,121 @@ class DataSet:
                 )
         return outFrame
 
+    def streamFile(self,
+                   file : str,
+                   fileType : str,
+                   rowFilter = None) -> pd.DataFrame:
+        '''
+        Reads a csv or xlsx file in chunks of chunkSize rows, filtering each 
+        chunk as it is read. xlsx files are streamed with openpyxl's read-only
+        row iterator.
+
+        Parameters
+        ----------
+        file : str
+            The path of the file to read.
+        fileType : str
+            The file extension of the file, either "csv" or "xlsx".
+        rowFilter : function
+            When called on a data frame, returns the records to keep.
+
+        Returns
+        -------
+        outFrame : pd.DataFrame
+            The data frame of records kept from the file.
+        '''
+        chunks = []
+        if fileType == 'csv':
+            try:
+                reader = pd.read_csv(
+                    file, 
+                    usecols = self.columnLabels, 
+                    dtype = self.parseDtypes or None,
+                    encoding_errors= 'ignore', 
+                    chunksize= self.chunkSize
+                    )
+                with reader:
+                    for chunk in reader:
+                        chunks.append(self.filterChunk(chunk, rowFilter))
+            except ValueError:
+                raise e.ColumnLabelException(
+                    'One of the column labels was not found in the data file.'
+                )
+        else:
+            for chunk in xl.iterChunks(file, self.columnLabels, self.chunkSize):
+                chunks.append(self.filterChunk(chunk, rowFilter))
+        if chunks == []:
+            return self.addYears(pd.DataFrame(columns= self.columnLabels))
+        outFrame = self.applySchema(pd.concat(chunks, axis= 0))
+        return outFrame
+
+    def filterChunk(self,
+                    chunk : pd.DataFrame,
+                    rowFilter = None) -> pd.DataFrame:
+        '''
+        Prepares a chunk of records read from a file and filters it.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of records.
+        rowFilter : function
+            When called on a data frame, returns the records to keep.
+
+        Returns
+        -------
+        chunk : pd.DataFrame
+            The records kept from the chunk, with a year column and compact 
+            dtypes.
+        '''
+        chunk = self.applySchema(self.addYears(chunk))
+        if rowFilter is not None:
+            chunk = rowFilter(chunk)
+        return chunk
+
+    def addYears(self, frame : pd.DataFrame) -> pd.DataFrame:
+        '''
+        Adds a column holding the year of each record, parsed from the date 
+        column, so that filters can reuse it.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            The data frame of records read from a file.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            The data frame of records with a YEAR_COLUMN_LABEL column, unless
+            there is no date column.
+        '''
+        if self.dateColumnLabel != '' and c.YEAR_COLUMN_LABEL not in frame.columns:
+            frame[c.YEAR_COLUMN_LABEL] = getYearColumn(frame[self.dateColumnLabel])
+        return frame
+
+    def applySchema(self, frame : pd.DataFrame) -> pd.DataFrame:
+        '''
+        Gives the columns of a data frame their compact dtypes from schema.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            The data frame of records read from a file.
+
+        Returns
+        -------
+        frame : pd.DataFrame
+            The data frame of records with compact dtypes.
+        '''
+        for label, dtype in self.schema.items():
+            if label not in frame.columns or frame[label].dtype == dtype:
+                continue
+            if dtype in self.parseDtypes.values():
+                frame[label] = frame[label].astype(dtype)
+            else:
+                frame[label] = compactIntegers(frame[label], dtype)
+        return frame
+
 class Demographic:
     '''
     A class to represent a demographic.
@@ -308,6 +672,10 @@ class Demographic:
     -------
     filer(pd.DataFrame) -> pd.DataFrame
         Filters a data frame of records and returns those satisfying designated demographic.
+    mask(pd.DataFrame) -> np.ndarray
+        Determines which records of a data frame satisfy designated demographic.
+    settings() -> list
+        Describes the labels and bounds which determine the demographic.
     '''
     
     def __init__(self,
@@ -515,48 +883,84 @@ class Demographic:
         data : pd.DataFrame
             The filtered records.
         '''
+        data = data[self.mask(data)]
+        return data
+
+    def settings(self) -> list:
+        '''
+        Describes the labels and bounds which determine the demographic.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        settings : list
+            The column labels and bounds of the demographic.
+        '''
+        settings = [self.dateColumnLabel,
+                    self.hospitalColumnLabel,
+                    self.sexColumnLabel,
+                    self.ageColumnLabel,
+                    self.customColumnLabels,
+                    self.ageBounds,
+                    self.hospital,
+                    self.sex,
+                    self.yearBounds,
+                    self.customBounds]
+        return settings
+
+    def mask(self, data : pd.DataFrame) -> np.ndarray:
+        '''
+        Determines which records of a data frame satisfy designated demographic.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The records to be checked.
+
+        Returns
+        -------
+        passes : np.ndarray
+            A boolean array, True for each record satisfying the demographic.
+        '''
+        passes = np.ones(len(data), dtype= bool)
+
         if self.hospitalColumnLabel != '' and self.hospital != 'ALL':
-            data = data[data[self.hospitalColumnLabel] == self.hospital]
+            passes &= (data[self.hospitalColumnLabel] == self.hospital).to_numpy(dtype= bool, na_value= False)
 
         if self.sexColumnLabel != '' and self.sex != 0:
-            passes = [int(val) == self.sex for val in data[self.sexColumnLabel]]
-            data = data[passes]
+            sexes = pd.to_numeric(data[self.sexColumnLabel], errors= 'coerce')
+            sexes = np.trunc(sexes.to_numpy(dtype= float, na_value= np.nan))
+            passes &= sexes == self.sex
 
         if self.ageColumnLabel != '':
-            if isinstance(self.ageBounds[0], tuple):
-                passes = [inRange(handleNaN(val), self.ageBounds) for val in data[self.ageColumnLabel].values.tolist()]
-                data = data[passes]
-            else:
-                passes = [self.ageBounds[0] <= handleNaN(val) <= self.ageBounds[1] for val in data[self.ageColumnLabel].values.tolist()]
-                data = data[passes]
+            ages = getIntegers(data[self.ageColumnLabel])
+            passes &= rangesMask(ages, self.ageBounds)
 
         if self.dateColumnLabel != '':
-            if isinstance(self.yearBounds[0], tuple):
-                passes = [inRange(getYear(str(val)), self.yearBounds) for val in data[self.dateColumnLabel]]
-                data = data[passes]
+            if c.YEAR_COLUMN_LABEL in data.columns:
+                years = data[c.YEAR_COLUMN_LABEL].to_numpy()
             else:
-                passes = [(self.yearBounds[0] <= getYear(str(val)) <= self.yearBounds[1]) for val in data[self.dateColumnLabel]]
-                data = data[passes]
+                years = getYears(data[self.dateColumnLabel])
+            passes &= rangesMask(years, self.yearBounds)
 
         for i in range(0, len(self.customBounds)):
-            print(len(data))
             customBound = self.customBounds[i]
             if len(self.customColumnLabels) > i:
                 customLabel = self.customColumnLabels[i]
                 if isinstance(customBound, int):
-                    passes = [handleNaN(val) == customBound for val in data[customLabel]]
-                    data = data[passes]
+                    passes &= getIntegers(data[customLabel]) == customBound
                 elif isinstance(customBound, str):
-                    passes = [str(val) == customBound for val in data[customLabel]]
-                    data = data[passes]
+                    passes &= (data[customLabel].astype(str) == customBound).to_numpy(dtype= bool, na_value= False)
                 elif isinstance(customBound[0], int):
-                    passes = [customBound[0] <= handleNaN(val) <= customBound[1] for val in data[customLabel]]
-                    data = data[passes]
+                    passes &= rangesMask(getIntegers(data[customLabel]), customBound)
                 elif isinstance(customBound[0], tuple):
-                    passes = [inRange(val, customBound) for val in data[customLabel] if not math.isnan(val)]
-                    data = data[passes]
+                    values = pd.to_numeric(data[customLabel], errors= 'coerce').to_numpy(dtype= float, na_value= np.nan)
+                    passes &= rangesMask(values, customBound)
 
-        return data
+        return passes
     
 def inRange(value : int, bounds : tuple) -> bool:
     '''
@@ -646,4 +1050,192 @@ def handleNaN(val : float) -> int | float:
         out = -math.inf
         return out
     out = int(val)
-    return out
\ No newline at end of file
+    return out
+
+def rangesMask(values : np.ndarray, bounds : tuple) -> np.ndarray:
+    '''
+    Determines which values lie within a bound or within one of several bounds.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values to check. NaN values are never within a bound.
+    bounds : tuple
+        Either a single (minimum, maximum) bound or a tuple of such bounds.
+
+    Returns
+    -------
+    check : np.ndarray
+        A boolean array, True for each value contained in any of the bounds.
+    '''
+    if not isinstance(bounds[0], tuple):
+        bounds = (bounds,)
+    check = np.zeros(len(values), dtype= bool)
+    for bound in bounds:
+        check |= (bound[0] <= values) & (values <= bound[1])
+    return check
+
+def getIntegers(series : pd.Series) -> np.ndarray:
+    '''
+    Converts a column of values to integers in the same way as handleNaN.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column of values read from the file.
+
+    Returns
+    -------
+    values : np.ndarray
+        A float array of the truncated values, NaN where handleNaN would give
+        -inf.
+    '''
+    numeric = pd.to_numeric(series, errors= 'coerce')
+    if not pd.api.types.is_numeric_dtype(series):
+        try:
+            strings = series.str.strip()
+        except AttributeError:
+            strings = None
+        if strings is not None:
+            notInteger = strings.notna() & ~strings.str.fullmatch(INTEGER_PATTERN, na= False)
+            numeric = numeric.mask(notInteger)
+    values = np.trunc(numeric.to_numpy(dtype= float, na_value= np.nan))
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+def getYears(series : pd.Series) -> np.ndarray:
+    '''
+    Determines the year each record in a column of dates belongs to, in the 
+    same way as getYear. Each distinct date is parsed once.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column of dates read from the file.
+
+    Returns
+    -------
+    years : np.ndarray
+        A float array of the years, NaN where the date cannot be parsed.
+    '''
+    codes, uniques = pd.factorize(series, use_na_sentinel= False)
+    strings = pd.Series(uniques, dtype= object).astype(str)
+    tokens = strings.str.rsplit('/', n= 1).str[-1].str.split(' ', n= 1).str[0]
+    isInteger = tokens.str.strip().str.fullmatch(INTEGER_PATTERN, na= False)
+    tokens = tokens.where(isInteger, tokens.str.split('-', n= 1).str[0])
+    years = getIntegers(tokens)[codes]
+    return years
+
+def getYearColumn(series : pd.Series) -> pd.Series:
+    '''
+    Produces a compact column of the year each record in a column of dates
+    belongs to.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column of dates read from the file.
+
+    Returns
+    -------
+    years : pd.Series
+        An int16 column of the years, -1 where the date cannot be parsed.
+    '''
+    years = getYears(series)
+    years[~((0 <= years) & (years <= np.iinfo(np.int16).max))] = -1
+    years = pd.Series(years.astype(np.int16), index= series.index)
+    return years
+
+def compactIntegers(series : pd.Series, dtype : str) -> pd.Series:
+    '''
+    Converts a column of integer codes to a compact integer dtype.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The column of values read from the file.
+    dtype : str
+        The integer dtype to convert to, such as "int8" or "Int16". The 
+        nullable form of the dtype is used if the column has missing values.
+
+    Returns
+    -------
+    series : pd.Series
+        The converted column, or the original column if its values are not all
+        integers within the range of dtype.
+    '''
+    numeric = pd.to_numeric(series, errors= 'coerce')
+    values = numeric.to_numpy(dtype= float, na_value= np.nan)
+    present = values[~np.isnan(values)]
+    info = np.iinfo(dtype.lower())
+    if (np.any(present != np.trunc(present)) 
+        or np.any(present < info.min) 
+        or np.any(present > info.max)):
+        return series
+    if len(present) < len(values):
+        dtype = dtype.capitalize()
+    series = numeric.astype(dtype)
+    return series
+
+def frameToRecords(frame : pd.DataFrame | pd.Series) -> list:
+    '''
+    Converts a data frame of records, or a column, to lists of values. Missing
+    values in compact dtypes are given as NaN, as they are for inferred dtypes.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame | pd.Series
+        The records to convert.
+
+    Returns
+    -------
+    records : list
+        A list of lists of values of each record, or a list of values for a 
+        column.
+    '''
+    dtypes = [frame.dtype] if isinstance(frame, pd.Series) else frame.dtypes
+    if any(isinstance(dtype, pd.api.extensions.ExtensionDtype) for dtype in dtypes):
+        frame = frame.astype(object)
+        frame = frame.where(frame.notna(), np.nan)
+    records = frame.values.tolist()
+    return records
+
+def collapseDuplicates(records : list,
+                       flags : list) -> tuple[list, list, np.ndarray, np.ndarray]:
+    '''
+    Collapses records with the same text fields and flag into one record. Text
+    fields are compared as the strings they are vectorised from.
+
+    Parameters
+    ----------
+    records : list
+        A list of lists of the text fields of each record.
+    flags : list
+        The flag of each record.
+
+    Returns
+    -------
+    uniqueRecords : list
+        The first of each group of duplicate records, in order of appearance.
+    uniqueFlags : list
+        The flag of each unique record.
+    counts : np.ndarray
+        The number of records collapsed into each unique record.
+    inverse : np.ndarray
+        The position in uniqueRecords of each input record.
+    '''
+    positions = {}
+    uniqueRecords = []
+    uniqueFlags = []
+    inverse = np.empty(len(records), dtype= np.intp)
+    for index, (record, flag) in enumerate(zip(records, flags)):
+        key = (tuple(str(field) for field in record), str(flag))
+        position = positions.get(key)
+        if position is None:
+            position = len(uniqueRecords)
+            positions[key] = position
+            uniqueRecords.append(record)
+            uniqueFlags.append(flag)
+        inverse[index] = position
+    counts = np.bincount(inverse, minlength= len(uniqueRecords))
+    return (uniqueRecords, uniqueFlags, counts, inverse)
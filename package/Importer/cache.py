@@ -0,0 +1,170 @@
+'''
+Helper functions to cache imported data files in a binary columnar format, to
+support package/Importer/base.py.
+
+Classes:
+
+    None
+
+Functions:
+
+    fileFingerprint(str, list, dict, str) -> str
+    cachePath(str, str, list, dict, str) -> str
+    readCache(str) -> pd.DataFrame | None
+    writeCache(pd.DataFrame, str) -> str
+
+Misc variables:
+
+    FEATHER : bool
+        Whether pyarrow is available to read and write Feather files.
+    INDEX_LABEL : str
+        The label of the column holding the index of a frame cached as Feather.
+
+Exceptions:
+
+    None
+'''
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    FEATHER = True
+except ImportError:
+    FEATHER = False
+
+INDEX_LABEL = '__index__'
+
+def fileFingerprint(file : str,
+                    columnLabels : list,
+                    schema : dict = {},
+                    filterKey : str = '') -> str:
+    '''
+    Produces a key identifying a data file's current contents and the columns
+    read from it.
+
+    Parameters
+    ----------
+    file : str
+        The path of the data file.
+    columnLabels : list
+        The labels of the columns read from the file.
+    schema : dict
+        The dtypes given to the columns read from the file.
+    filterKey : str
+        A description of the filter applied to the records read from the 
+        file. '' if they aren't filtered.
+
+    Returns
+    -------
+    key : str
+        A hex digest of the file's path, size, modification time, the column
+        labels, their dtypes and the filter.
+    '''
+    stat = os.stat(file)
+    fingerprint = json.dumps([os.path.abspath(file),
+                              stat.st_size,
+                              stat.st_mtime_ns,
+                              sorted(columnLabels),
+                              sorted(schema.items())]
+                             + ([filterKey] if filterKey != '' else []))
+    key = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[0:32]
+    return key
+
+def cachePath(cacheDir : str,
+              file : str,
+              columnLabels : list,
+              schema : dict = {},
+              filterKey : str = '') -> str:
+    '''
+    Produces the path, without extension, at which a data file is cached.
+
+    Parameters
+    ----------
+    cacheDir : str
+        The directory containing cached files.
+    file : str
+        The path of the data file.
+    columnLabels : list
+        The labels of the columns read from the file.
+    schema : dict
+        The dtypes given to the columns read from the file.
+    filterKey : str
+        A description of the filter applied to the records read from the 
+        file. '' if they aren't filtered.
+
+    Returns
+    -------
+    path : str
+        The path of the cached file, without a file extension.
+    '''
+    path = os.path.join(cacheDir, fileFingerprint(file, 
+                                                       columnLabels, 
+                                                       schema,
+                                                       filterKey))
+    return path
+
+def readCache(path : str) -> pd.DataFrame | None:
+    '''
+    Reads a cached data frame if one exists.
+
+    Parameters
+    ----------
+    path : str
+        The path of the cached file, without a file extension.
+
+    Returns
+    -------
+    frame : pd.DataFrame | None
+        The cached data frame, or None if nothing is cached at path.
+    '''
+    if FEATHER and os.path.exists(path + '.feather'):
+        frame = pd.read_feather(path + '.feather')
+        if INDEX_LABEL in frame.columns:
+            frame = frame.set_index(INDEX_LABEL)
+            frame.index.name = None
+        for label in frame.columns:
+            if frame[label].dtype == object:
+                frame[label] = frame[label].where(frame[label].notna(), np.nan)
+        return frame
+    if os.path.exists(path + '.pkl'):
+        frame = pd.read_pickle(path + '.pkl')
+        return frame
+    return None
+
+def writeCache(frame : pd.DataFrame,
+               path : str) -> str:
+    '''
+    Writes a data frame to the cache. Feather is used when pyarrow is
+    available and can represent every column, otherwise the frame is pickled.
+    The index of the frame is kept, as records may have been filtered out.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        The data frame to cache.
+    path : str
+        The path of the cached file, without a file extension.
+
+    Returns
+    -------
+    cacheFile : str
+        The path of the file written.
+    '''
+    os.makedirs(os.path.dirname(path), exist_ok= True)
+    if FEATHER:
+        cacheFile = path + '.feather'
+        try:
+            frame.reset_index(names= INDEX_LABEL).to_feather(cacheFile + '.tmp')
+            os.replace(cacheFile + '.tmp', cacheFile)
+            return cacheFile
+        except (pyarrow.ArrowException, ValueError):
+            if os.path.exists(cacheFile + '.tmp'):
+                os.remove(cacheFile + '.tmp')
+    cacheFile = path + '.pkl'
+    frame.to_pickle(cacheFile + '.tmp', compression= None)
+    os.replace(cacheFile + '.tmp', cacheFile)
+    return cacheFile
@@ -13,9 +13,17 @@ Misc variables:
 
     SUPPORTED_FILE_TYPES : list
         A list of strings of the file types which can be imported.
+    YEAR_COLUMN_LABEL : str
+        The label of the column added to imported data holding the year of 
+        each record.
+    XLSX_CHUNK_SIZE : int
+        The number of rows classified at a time when annotating an xlsx file 
+        if no chunkSize is set.
 
 Exceptions:
 
     None
 '''
-SUPPORTED_FILE_TYPES = ['csv', 'xlsx']
\ No newline at end of file
+SUPPORTED_FILE_TYPES = ['csv', 'xlsx']
+YEAR_COLUMN_LABEL = '_year'
+XLSX_CHUNK_SIZE = 10000
\ No newline at end of file
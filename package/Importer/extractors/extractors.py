@@ -1,5 +1,5 @@
 '''
-Contains classes and helper functions to be used in 
+Contains classes and helper functions to be used in
 package/Importer/importer.py to extract data.
 
 Classes:
@@ -8,10 +8,11 @@ Classes:
     NewestBlock
     RandomBlock
     Uniform
+    Extraction
 
 Functions:
 
-    indexSet(int, function) -> str
+    complement(int, np.ndarray) -> np.ndarray
 
 Misc variables:
 
@@ -20,15 +21,16 @@ Misc variables:
 Exceptions:
 
     MoreDataThanRecordsException
+    ImporterException
 '''
-import random
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 from ... import exceptions as e
 
 class Extractor(ABC):
     '''
-    An abstract class used to create instances classes to extract data with 
+    An abstract class used to create instances classes to extract data with
     different sampling distributions.
 
     ...
@@ -37,38 +39,98 @@ class Extractor(ABC):
     ---------
     amount : int
         The number of records to extract.
-    
+    seed : int | None
+        The seed of the random number generator. None seeds it from the
+        operating system.
+    rng : np.random.Generator
+        The random number generator used to sample records.
+
     Methods
     -------
-    extract(pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
-        An abstract method that returns specified data and leftover data.
+    select(int) -> np.ndarray
+        An abstract method that chooses the positions of the records to extract.
+    extract(pd.DataFrame, np.ndarray) -> Extraction
+        Splits the input data into specified data and leftover data.
     changeAmount(int)
         Changes the amount attribute.
     '''
 
+    def __init__(self,
+                 amount : int,
+                 seed : int | None = None):
+        '''
+        Constructs attributes for the Extractor object.
+
+        Parameters
+        ----------
+        amount : int
+            The number of records to extract.
+        seed : int | None
+            The seed of the random number generator. None seeds it from the
+            operating system.
+        '''
+        if seed is not None and (not isinstance(seed, int)
+                                 or isinstance(seed, bool)):
+            raise e.ImporterException(
+                'seed must be an int or None.'
+            )
+        self.amount = amount
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
     @abstractmethod
-    def extract(self, 
-                takeFrom: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def select(self,
+               available : int) -> np.ndarray:
         '''
-        An abstract method that returns specified data and leftover data.
+        An abstract method that chooses the positions of the records to extract.
+
+        Parameters
+        ----------
+        available : int
+            The number of records available to extract from.
+
+        Returns
+        -------
+        positions : np.ndarray
+            The positions of the chosen records, between 0 and available - 1.
+        '''
+        positions = None
+        return positions
+
+    def extract(self,
+                takeFrom : pd.DataFrame,
+                rows : np.ndarray = None) -> 'Extraction':
+        '''
+        Splits the input data into specified data and leftover data.
 
         Parameters
         ----------
         takeFrom : pd.DataFrame
             A data frame of records to extract data from.
+        rows : np.ndarray
+            The positions in takeFrom of the records available to extract.
+            None makes every record available.
 
         Returns
-        ------
-        specified : pd.DataFrame
-            The desired records from takeFrom.
-        leftover : pd.DataFrame
-            All records in takeFrom which aren't in the specified data.
+        -------
+        extraction : Extraction
+            The specified and leftover records. Indexing it with 0 gives the
+            specified records and with 1 the leftover records.
         '''
-        specified = None
-        leftover = None
-        return specified, leftover
+        if rows is None:
+            rows = np.arange(len(takeFrom))
+        if len(rows) < self.amount:
+            raise e.MoreDataThanRecordsException(
+                f'Data size of {self.amount} is greater than the '
+                f'available number of records {len(rows)}.'
+                )
+        positions = self.select(len(rows))
+        extraction = Extraction(takeFrom,
+                                rows[positions],
+                                rows[complement(len(rows), positions)])
+        return extraction
 
-    def changeAmount(self, 
+    def changeAmount(self,
                      newAmount : int):
         '''
         Changes the amount attribute.
@@ -83,7 +145,7 @@ class Extractor(ABC):
         None
         '''
         self.amount = newAmount
- 
+
 class NewestBlock(Extractor):
     '''
     Can be used to extract the newest block of available records. Is an instance
@@ -95,50 +157,34 @@ class NewestBlock(Extractor):
     ----------
     amount : int
         The number of records to extract.
-    
+    seed : int | None
+        The seed of the random number generator. Unused by NewestBlock.
+    rng : np.random.Generator
+        The random number generator. Unused by NewestBlock.
+
     Methods
     -------
-    extract(pd.DataFrame) -> tuple[pd.DateFrame, pd.DataFrame]
-        Splits the input data into specified data and leftover data.
+    select(int) -> np.ndarray
+        Chooses the positions of the first amount records.
     '''
 
-    def __init__(self, 
-                 amount: int):
+    def select(self,
+               available : int) -> np.ndarray:
         '''
-        Constructs attributes for the NewestBlock object.
+        Chooses the positions of the first amount records.
 
         Parameters
         ----------
-        amount : int
-            The number of records to extract.
-        '''
-        self.amount = amount
-
-    def extract(self, 
-                takeFrom: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-        '''
-        Splits the input data into specified data and leftover data.
+        available : int
+            The number of records available to extract from.
 
-        Parameters
-        ----------
-        takeFrom : pd.DataFrame
-            A data frame of records to extract data from.
-        
         Returns
         -------
-        specified : pd.DataFrame
-            The desired records from takeFrom.
-        leftover : pd.DataFrame
-            All records in takeFrom which aren't in the specified data.
+        positions : np.ndarray
+            The positions of the chosen records.
         '''
-        if len(takeFrom) < self.amount:
-            raise e.MoreDataThanRecordsException(
-                f'Data size of {self.amount} is greater than the '
-                f'available number of records {len(takeFrom)}.'
-                )
-        specified = takeFrom.iloc[0:self.amount]
-        leftover = takeFrom.iloc[self.amount: len(takeFrom) - 1]
-        return specified, leftover
+        positions = np.arange(self.amount)
+        return positions
 
 class RandomBlock(Extractor):
     '''
@@ -151,58 +197,40 @@ class RandomBlock(Extractor):
     ----------
     amount : int
         The number of records to extract.
-    
+    seed : int | None
+        The seed of the random number generator.
+    rng : np.random.Generator
+        The random number generator used to choose the start of the block.
+
     Methods
     -------
-    extract(pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
-        Splits the input data into specified data and leftover data.
+    select(int) -> np.ndarray
+        Chooses the positions of a block of amount consecutive records.
     '''
 
-    def __init__(self, 
-                 amount: int):
+    def select(self,
+               available : int) -> np.ndarray:
         '''
-        Constructs attributes for the RandomBlock object.
+        Chooses the positions of a block of amount consecutive records,
+        starting at a random position.
 
         Parameters
         ----------
-        amount : int
-            The number of records to extract.
-        '''
-        self.amount = amount
-
-    def extract(self, 
-                takeFrom: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-        '''
-        Splits the input data into specified data and leftover data.
+        available : int
+            The number of records available to extract from.
 
-        Parameters
-        ----------
-        takeFrom : pd.DataFrame
-            A data frame of records to extract data from.
-        
         Returns
         -------
-        specified : pd.DataFrame
-            The desired records from takeFrom.
-        leftover : pd.DataFrame
-            All records in takeFrom which aren't in the specified data.
+        positions : np.ndarray
+            The positions of the chosen records.
         '''
-        if len(takeFrom) < self.amount:
-            raise e.MoreDataThanRecordsException(
-                'Data size is greater than the available number of records'
-                )
-        
-        start = random.randint(0,len(takeFrom) - self.amount - 1)
-
-        specified = takeFrom.iloc[start: start + self.amount]
-        outBlock1 = takeFrom.iloc[0: start]
-        outBlock2 = takeFrom.iloc[start + self.amount: len(takeFrom) -1]
-        leftover = pd.concat([outBlock1, outBlock2], axis= 0)
-        return specified, leftover
+        start = int(self.rng.integers(0, available - self.amount + 1))
+        positions = np.arange(start, start + self.amount)
+        return positions
 
 class Uniform(Extractor):
     '''
-    Can be used to extract a uniformly distributed selection of available 
+    Can be used to extract a uniformly distributed selection of available
     records. Is an instance of the abstract Extractor class.
 
     ...
@@ -211,77 +239,147 @@ class Uniform(Extractor):
     ----------
     amount : int
         The number of records to extract.
-    
+    seed : int | None
+        The seed of the random number generator.
+    rng : np.random.Generator
+        The random number generator used to sample records.
+
     Methods
     -------
-    extract(pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
-        Splits the input data into specified data and leftover data.
+    select(int) -> np.ndarray
+        Chooses the positions of amount records sampled without replacement.
     '''
 
-    def __init__(self, 
-                 amount: int):
+    def select(self,
+               available : int) -> np.ndarray:
         '''
-        Constructs attributes for the Uniform object.
+        Chooses the positions of amount records sampled uniformly without
+        replacement. The positions are kept in the order of the records.
 
         Parameters
         ----------
-        amount : int
-            The number of records to extract.
+        available : int
+            The number of records available to extract from.
+
+        Returns
+        -------
+        positions : np.ndarray
+            The positions of the chosen records.
         '''
-        self.amount = amount
-    
-    def extract(self, 
-                takeFrom: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        positions = np.sort(self.rng.choice(available,
+                                            size= self.amount,
+                                            replace= False))
+        return positions
+
+class Extraction:
+    '''
+    A class to represent the result of an extraction. The data frames of
+    specified and leftover records are only built when first used.
+
+    ...
+
+    Attributes
+    ----------
+    takeFrom : pd.DataFrame
+        The data frame the records were extracted from.
+    specifiedRows : np.ndarray
+        The positions in takeFrom of the specified records.
+    leftoverRows : np.ndarray
+        The positions in takeFrom of the leftover records.
+
+    Methods
+    -------
+    specified() -> pd.DataFrame
+        Returns the data frame of specified records.
+    leftover() -> pd.DataFrame
+        Returns the data frame of leftover records.
+    '''
+
+    def __init__(self,
+                 takeFrom : pd.DataFrame,
+                 specifiedRows : np.ndarray,
+                 leftoverRows : np.ndarray):
         '''
-        Splits the input data into specified data and leftover data.
+        Constructs attributes for the Extraction object.
 
         Parameters
         ----------
         takeFrom : pd.DataFrame
-            A data frame of records to extract data from.
-        
+            The data frame the records were extracted from.
+        specifiedRows : np.ndarray
+            The positions in takeFrom of the specified records.
+        leftoverRows : np.ndarray
+            The positions in takeFrom of the leftover records.
+        '''
+        self.takeFrom = takeFrom
+        self.specifiedRows = specifiedRows
+        self.leftoverRows = leftoverRows
+        self._specified = None
+        self._leftover = None
+
+    def specified(self) -> pd.DataFrame:
+        '''
+        Returns the data frame of specified records.
+
+        Parameters
+        ----------
+        None
+
         Returns
         -------
         specified : pd.DataFrame
-            The desired records from takeFrom.
+            The specified records.
+        '''
+        if self._specified is None:
+            self._specified = self.takeFrom.iloc[self.specifiedRows]
+        specified = self._specified
+        return specified
+
+    def leftover(self) -> pd.DataFrame:
+        '''
+        Returns the data frame of leftover records.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
         leftover : pd.DataFrame
             All records in takeFrom which aren't in the specified data.
         '''
-        if len(takeFrom) < self.amount:
-            raise e.MoreDataThanRecordsException(
-                'Data size is greater than the available number of records'
-                )
-        indexGen = lambda x : random.randint(0,len(takeFrom) - 1)
-        indices = indexSet(self.amount, indexGen)
-        specified = takeFrom.iloc[list(indices)]
-        remainingIndicies = list(range(0,len(takeFrom) - 1))
-        for ind in indices:
-            try:
-                remainingIndicies.remove(ind)
-            except ValueError:
-                pass
-        leftover = takeFrom.iloc[remainingIndicies]
-        return specified, leftover
-        
-def indexSet(size : int, 
-             indexGen) -> list:
+        if self._leftover is None:
+            self._leftover = self.takeFrom.iloc[self.leftoverRows]
+        leftover = self._leftover
+        return leftover
+
+    def __getitem__(self, index : int) -> pd.DataFrame:
+        return (self.specified, self.leftover)[index]()
+
+    def __iter__(self):
+        return iter((self.specified(), self.leftover()))
+
+    def __len__(self) -> int:
+        return 2
+
+def complement(available : int,
+               positions : np.ndarray) -> np.ndarray:
     '''
-    Produces a list of unique indices to be used in the Uniform extractor.
+    Produces the positions which are not in a given array of positions.
 
     Parameters
     ----------
-    size : int
-        The desired length of the output list.
-    indexGen : function
-        When called on any argument, produces an index.
-    
+    available : int
+        The number of positions.
+    positions : np.ndarray
+        The positions to leave out, between 0 and available - 1.
+
     Returns
     -------
-    indicies : list
-        A list of unique indicies.
+    remaining : np.ndarray
+        The positions between 0 and available - 1 not in positions, in order.
     '''
-    indicies = set()
-    while len(indicies) < size:
-        index = indexGen(0)
-        indicies.add(index)
-    return indicies
\ No newline at end of file
+    mask = np.ones(available, dtype= bool)
+    mask[positions] = False
+    remaining = np.flatnonzero(mask)
+    return remaining
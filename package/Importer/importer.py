@@ -7,8 +7,7 @@ Classes:
 
 Functions:
 
-    startRec() -> float
-    stopRec(float) -> (float, float)
+    recordCount(pd.DataFrame | tuple) -> int
 
 Misc variables:
 
@@ -21,13 +20,18 @@ Exceptions:
     NegTestSizeException
     TrainDistException
     TestDistException
+    ChunkSizeException
+    WorkersException
 '''
 from . import base as b
+from . import manifest as mf
 from .extractors import extractors as ex
 from .. import exceptions as e
+from .. import instrument as ins
+import json
 import time
-import tracemalloc
 import pandas as pd
+import numpy as np
 
 class Importer:
     '''
@@ -50,16 +54,24 @@ class Importer:
         The labels of the columns with free text.
     flagColumnLabel : str
         The label of the column with the classification flag.
+    splitManifestDir : str
+        A directory in which to save the rows of each train/test split. '' 
+        disables manifests.
 
     Constructed by running the importData() method:
     importTime : float
         Time taken to import data.
     importSpace : float
         Peak space used to import data.
+    fileTimes : list
+        Time taken to read each data file.
+    fileSpaces : list
+        Memory held by the records read from each data file.
     filterTime : float
         Time taken to filter data.
     filterSpace : float
-        Peak space used to filter data.
+        Peak space used to filter data. When importing in chunks, importing and
+        filtering share one peak.
     trainExtractTime : float
         Time taken to extract training data.
     trainExtractSpace : float
@@ -68,6 +80,10 @@ class Importer:
         Time taken to extract testing data.
     testExtractSpace : float
         Peak space used to extract testing data.
+    splitKey : str
+        A key identifying the train/test split. '' if manifests are disabled.
+    splitReused : bool
+        Whether the train/test split was loaded from a manifest.
     
     Methods
     -------
@@ -75,6 +91,8 @@ class Importer:
         Checks constructor inputs and creates attributes.
     importData() -> tuple[pd.DataFrame, pd.DataFrame]
         Creates a data frame of training records and a data frame of testing records.
+    streamData() -> pd.DataFrame | tuple
+        Imports data in chunks, filtering each chunk as it is read.
     '''
     def __init__(self,
                  arg_dict : dict = None,
@@ -96,7 +114,13 @@ class Importer:
                  trainSize: int = 0, 
                  trainDist: str = 'NEWESTBLOCK', 
                  testSize: int = 0, 
-                 testDist: str = 'NEWESTBLOCK'):
+                 testDist: str = 'NEWESTBLOCK',
+                 chunkSize : int = 0,
+                 importWorkers : int = 1,
+                 importCacheDir : str = '',
+                 compactDtypes : bool = False,
+                 extractSeed : int = None,
+                 splitManifestDir : str = ''):
         '''
         Passes inputs from either arg_dict or keyword arguments.
 
@@ -142,6 +166,28 @@ class Importer:
             Number of records to use for testing.
         testDistribution : str
             How to sample the testing data from the dataSet.
+        chunkSize : int
+            The number of rows to read from a csv or xlsx file at a time. If 
+            positive, each chunk is filtered as it is read. 0 reads whole 
+            files.
+        importWorkers : int
+            The number of files to read concurrently.
+        importCacheDir : str
+            A directory in which to cache the relavant columns of each data 
+            file in a binary format. When chunkSize is positive, only the 
+            records kept by the demographic filter are cached. '' disables 
+            caching.
+        compactDtypes : bool
+            Whether to give imported columns compact dtypes based on their 
+            role.
+        extractSeed : int
+            The seed used to sample training and testing records. None seeds
+            sampling from the operating system.
+        splitManifestDir : str
+            A directory in which to save the rows of each train/test split, so
+            that later runs with the same data and settings reuse the split 
+            instead of extracting it. Requires extractSeed, as an unseeded 
+            split can't be reproduced. '' disables manifests.
         '''
         if arg_dict is not None:
             if not isinstance(arg_dict, dict):
@@ -187,6 +233,18 @@ class Importer:
                 testSize = arg_dict['testSize']
             if 'testDist' in arg_dict:
                 testDist = arg_dict['testDist']
+            if 'chunkSize' in arg_dict:
+                chunkSize = arg_dict['chunkSize']
+            if 'importWorkers' in arg_dict:
+                importWorkers = arg_dict['importWorkers']
+            if 'importCacheDir' in arg_dict:
+                importCacheDir = arg_dict['importCacheDir']
+            if 'compactDtypes' in arg_dict:
+                compactDtypes = arg_dict['compactDtypes']
+            if 'extractSeed' in arg_dict:
+                extractSeed = arg_dict['extractSeed']
+            if 'splitManifestDir' in arg_dict:
+                splitManifestDir = arg_dict['splitManifestDir']
 
         self.initialise(trainFile,
                         testFile, 
@@ -206,7 +264,13 @@ class Importer:
                         trainSize, 
                         trainDist, 
                         testSize, 
-                        testDist)
+                        testDist,
+                        chunkSize,
+                        importWorkers,
+                        importCacheDir,
+                        compactDtypes,
+                        extractSeed,
+                        splitManifestDir)
 
     def initialise(self,
                 trainFile : str = '',
@@ -227,7 +291,13 @@ class Importer:
                 trainSize: int = 0, 
                 trainDist: str = 'NEWESTBLOCK', 
                 testSize: int = 0, 
-                testDist: str = 'NEWESTBLOCK'):
+                testDist: str = 'NEWESTBLOCK',
+                chunkSize : int = 0,
+                importWorkers : int = 1,
+                importCacheDir : str = '',
+                compactDtypes : bool = False,
+                extractSeed : int = None,
+                splitManifestDir : str = ''):
         '''
         Checks constructor inputs and creates attributes.
 
@@ -271,6 +341,28 @@ class Importer:
             Number of records to use for testing.
         testDistribution : str
             How to sample the testing data from the dataSet.
+        chunkSize : int
+            The number of rows to read from a csv or xlsx file at a time. If 
+            positive, each chunk is filtered as it is read. 0 reads whole 
+            files.
+        importWorkers : int
+            The number of files to read concurrently.
+        importCacheDir : str
+            A directory in which to cache the relavant columns of each data 
+            file in a binary format. When chunkSize is positive, only the 
+            records kept by the demographic filter are cached. '' disables 
+            caching.
+        compactDtypes : bool
+            Whether to give imported columns compact dtypes based on their 
+            role.
+        extractSeed : int
+            The seed used to sample training and testing records. None seeds
+            sampling from the operating system.
+        splitManifestDir : str
+            A directory in which to save the rows of each train/test split, so
+            that later runs with the same data and settings reuse the split 
+            instead of extracting it. Requires extractSeed, as an unseeded 
+            split can't be reproduced. '' disables manifests.
 
         Returns
         -------
@@ -285,7 +377,11 @@ class Importer:
                                 ageColumnLabel,
                                 customColumnLabels,
                                 textFieldColumnLabels,
-                                flagColumnLabel
+                                flagColumnLabel,
+                                chunkSize,
+                                importWorkers,
+                                importCacheDir,
+                                compactDtypes
                                 )
         
         self.demographic = b.Demographic(dateColumnLabel,
@@ -307,14 +403,25 @@ class Importer:
             raise e.NegTestSizeException(
                 'Test size must be a positive integer'
                 )
+
+        if extractSeed is None:
+            trainSeed, testSeed = None, None
+        elif isinstance(extractSeed, int) and not isinstance(extractSeed, bool) \
+            and extractSeed >= 0:
+            trainSeed, testSeed = [int(seed) for seed in 
+                np.random.SeedSequence(extractSeed).generate_state(2)]
+        else:
+            raise e.ImporterException(
+                'extractSeed must be a non-negative int or None.'
+            )
        
         match trainDist:
             case 'NEWESTBLOCK':
-                self.trainExtractor = ex.NewestBlock(trainSize)
+                self.trainExtractor = ex.NewestBlock(trainSize, trainSeed)
             case 'RANDOMBLOCK':
-                self.trainExtractor = ex.RandomBlock(trainSize)
+                self.trainExtractor = ex.RandomBlock(trainSize, trainSeed)
             case 'UNIFORM':
-                self.trainExtractor = ex.Uniform(trainSize)
+                self.trainExtractor = ex.Uniform(trainSize, trainSeed)
             case _ :
                 raise e.TrainDistException(
                     ('Training distribution must be "NEWESTBLOCK", "RANDOMBLOCK" '
@@ -323,19 +430,29 @@ class Importer:
 
         match testDist:
             case 'NEWESTBLOCK':
-                self.testExtractor = ex.NewestBlock(testSize)
+                self.testExtractor = ex.NewestBlock(testSize, testSeed)
             case 'RANDOMBLOCK':
-                self.testExtractor = ex.RandomBlock(testSize)
+                self.testExtractor = ex.RandomBlock(testSize, testSeed)
             case 'UNIFORM':
-                self.testExtractor = ex.Uniform(testSize)
+                self.testExtractor = ex.Uniform(testSize, testSeed)
             case _:
                 raise e.TestDistException(
                     ('Testing distribution must be "NEWESTBLOCK", "RANDOMBLOCK" or '
                     '"UNIFORM"')
                     )
             
+        if not isinstance(splitManifestDir, str):
+            raise e.ImporterException(
+                'splitManifestDir must be a string.'
+            )
+        if splitManifestDir != '' and extractSeed is None:
+            raise e.ImporterException(
+                'splitManifestDir requires an extractSeed.'
+            )
+
         self.textFieldColumnLabels = textFieldColumnLabels    
         self.flagColumnLabel = flagColumnLabel
+        self.splitManifestDir = splitManifestDir
 
     def importData(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         '''
@@ -352,78 +469,149 @@ class Importer:
         testData : pd.DataFrame
             A data frame of testing records.
         '''
-        print('Importing data...')
-        time0 = startRec()
-        data = self.dataSet.importToFrame()
-        self.importTime, self.importSpace = stopRec(time0)
-
-        print('Filtering data...')
-        time0 = startRec()
-        if isinstance(data, tuple):
-            data = (self.demographic.filter(data[0]), self.demographic.filter(data[1]))
+        if self.dataSet.chunkSize > 0:
+            data = self.streamData()
         else:
-            data = self.demographic.filter(data)
-        self.filterTime, self.filterSpace = stopRec(time0)
+            print('Importing data...')
+            record = ins.startRec('import')
+            data = self.dataSet.importToFrame()
+            self.importTime, self.importSpace = ins.stopRec(record, recordCount(data))
+
+            print('Filtering data...')
+            record = ins.startRec('filter')
+            if isinstance(data, tuple):
+                data = (self.demographic.filter(data[0]), self.demographic.filter(data[1]))
+            else:
+                data = self.demographic.filter(data)
+            self.filterTime, self.filterSpace = ins.stopRec(record, recordCount(data))
+        self.fileTimes = self.dataSet.fileTimes
+        self.fileSpaces = self.dataSet.fileSpaces
         
+        self.splitKey = ''
+        self.splitReused = False
+        if self.splitManifestDir != '':
+            if self.dataSet.trainFile != '' and self.dataSet.testFile != '':
+                files = [self.dataSet.trainFile, self.dataSet.testFile]
+            else:
+                files = self.dataSet.fileLocations
+            settings = mf.splitSettings(files,
+                                        self.dataSet.columnLabels,
+                                        self.dataSet.schema,
+                                        self.demographic,
+                                        self.trainExtractor,
+                                        self.testExtractor)
+            self.splitKey = mf.splitKey(settings)
+            path = mf.manifestPath(self.splitManifestDir, self.splitKey)
+            rows = mf.readManifest(path, settings)
+            if rows is not None:
+                print('Loading split manifest...')
+                record = ins.startRec('loadSplit')
+                trainFrom, testFrom = data if isinstance(data, tuple) else (data, data)
+                for frame, frameRows in [(trainFrom, rows[0]), (testFrom, rows[1])]:
+                    if len(frameRows) > 0 and int(frameRows.max()) >= len(frame):
+                        raise e.ImporterException(
+                            'The split manifest at ' + path + ' refers to rows '
+                            'beyond the filtered records. Delete it to extract '
+                            'the split again.'
+                        )
+                trainData = trainFrom.iloc[rows[0]]
+                testData = testFrom.iloc[rows[1]]
+                self.trainExtractTime, self.trainExtractSpace = ins.stopRec(
+                    record, len(trainData) + len(testData))
+                self.testExtractTime, self.testExtractSpace = 0.0, 0
+                self.splitReused = True
+                return (trainData, testData)
+
         if isinstance(data, tuple):
             print('Extracting training data...')
-            time0 = startRec()
-            trainData = self.trainExtractor.extract(data[0])[0]
-            self.trainExtractTime, self.trainExtractSpace = stopRec(time0)
+            record = ins.startRec('extractTrain')
+            trainExtraction = self.trainExtractor.extract(data[0])
+            trainData = trainExtraction[0]
+            self.trainExtractTime, self.trainExtractSpace = ins.stopRec(record, 
+                                                                        len(trainData))
 
             print('Extracting testing data...')
-            time0 = startRec()
-            testData = self.testExtractor.extract(data[1])[0]
-            self.testExtractTime, self.testExtractSpace = stopRec(time0)
+            record = ins.startRec('extractTest')
+            testExtraction = self.testExtractor.extract(data[1])
+            testData = testExtraction[0]
+            self.testExtractTime, self.testExtractSpace = ins.stopRec(record, 
+                                                                      len(testData))
         else:
             print('Extracting training data...')
-            time0 = startRec()
-            extracted = self.trainExtractor.extract(data)
-            trainData = extracted[0]
-            remainingData = extracted[1]
-            self.trainExtractTime, self.trainExtractSpace = stopRec(time0)
+            record = ins.startRec('extractTrain')
+            trainExtraction = self.trainExtractor.extract(data)
+            trainData = trainExtraction[0]
+            self.trainExtractTime, self.trainExtractSpace = ins.stopRec(record, 
+                                                                        len(trainData))
 
             print('Extracting testing data...')
-            time0 = startRec()
-            testData = self.testExtractor.extract(remainingData)[0]
-            self.testExtractTime, self.testExtractSpace = stopRec(time0)
+            record = ins.startRec('extractTest')
+            testExtraction = self.testExtractor.extract(data, 
+                                                        trainExtraction.leftoverRows)
+            testData = testExtraction[0]
+            self.testExtractTime, self.testExtractSpace = ins.stopRec(record, 
+                                                                      len(testData))
+
+        if self.splitManifestDir != '':
+            mf.writeManifest(path, 
+                             trainExtraction.specifiedRows, 
+                             testExtraction.specifiedRows, 
+                             settings)
     
         return (trainData, testData)
-    
-def startRec() -> float:
-    '''
-    Outputs the current time and begins tracking memory.
 
-    Parameters
-    ----------
-    None
+    def streamData(self) -> pd.DataFrame | tuple:
+        '''
+        Imports data in chunks, filtering each chunk as it is read.
 
-    Retruns
-    -------
-    time0 : float
-        The current time.
-    '''
-    time0 = time.time()
-    tracemalloc.start()
-    return time0
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        data : pd.DataFrame | tuple
+            The filtered records, or a pair of data frames of filtered training
+            and testing records.
+        '''
+        filterTimes = []
+
+        def rowFilter(chunk : pd.DataFrame) -> pd.DataFrame:
+            with ins.span('filter', len(chunk), aggregate= True):
+                time0 = time.perf_counter()
+                chunk = self.demographic.filter(chunk)
+                filterTimes.append(time.perf_counter() - time0)
+            return chunk
+
+        print('Importing and filtering data...')
+        record = ins.startRec('importAndFilter')
+        filterKey = json.dumps(self.demographic.settings(), default= str)
+        data = self.dataSet.importToFrame(rowFilter, filterKey)
+        streamTime, streamSpace = ins.stopRec(record, recordCount(data))
+
+        self.filterTime = sum(filterTimes)
+        self.importTime = max(streamTime - self.filterTime, 0.0)
+        self.importSpace = streamSpace
+        self.filterSpace = streamSpace
+        return data
 
-def stopRec(time0 : float) -> tuple[float, float]:
+def recordCount(data : pd.DataFrame | tuple) -> int:
     '''
-    Outputs time passed and peak memory used since the last call of startRec().
+    Counts the records in a data frame or pair of data frames.
 
     Parameters
     ----------
-    time0 : float
-        The output from the last call of startRec().
+    data : pd.DataFrame | tuple
+        A data frame of records, or a pair of data frames of training and 
+        testing records.
 
     Returns
     -------
-    time1 : float
-        The time passed since the last call of startRec().
-    space : float
-        The peak memory used since the last call of startRec().
+    count : int
+        The number of records.
     '''
-    time1 = time.time() - time0
-    _, space = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return (time1, space)
\ No newline at end of file
+    if isinstance(data, tuple):
+        count = sum(len(frame) for frame in data)
+    else:
+        count = len(data)
+    return count
\ No newline at end of file
@@ -0,0 +1,194 @@
+'''
+Helper functions to save and load train/test split manifests, to support
+package/Importer/importer.py. A manifest records the positions of the training
+and testing records among the filtered records, so that a split can be reused
+without extracting it again.
+
+Classes:
+
+    None
+
+Functions:
+
+    splitSettings(list, list, dict, Demographic, Extractor, Extractor) -> dict
+    splitKey(dict) -> str
+    manifestPath(str, str) -> str
+    readManifest(str, dict) -> tuple[np.ndarray, np.ndarray] | None
+    writeManifest(str, np.ndarray, np.ndarray, dict) -> str
+    compactRows(np.ndarray) -> np.ndarray
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    None
+'''
+from . import cache as ca
+import hashlib
+import json
+import os
+import zipfile
+import numpy as np
+
+def splitSettings(files : list,
+                  columnLabels : list,
+                  schema : dict,
+                  demographic,
+                  trainExtractor,
+                  testExtractor) -> dict:
+    '''
+    Describes everything which determines a train/test split.
+
+    Parameters
+    ----------
+    files : list
+        The paths of the data files.
+    columnLabels : list
+        The labels of the columns read from the files.
+    schema : dict
+        The dtypes given to the columns read from the files.
+    demographic : Demographic
+        The demographic the records are filtered by.
+    trainExtractor : Extractor
+        The Extractor used to obtain training data.
+    testExtractor : Extractor
+        The Extractor used to obtain testing data.
+
+    Returns
+    -------
+    settings : dict
+        The data fingerprint, demographic and extractor settings of the split.
+    '''
+    settings = {
+        'data' : [ca.fileFingerprint(file, columnLabels, schema)
+                  for file in files],
+        'demographic' : demographic.settings(),
+        'train' : [type(trainExtractor).__name__,
+                   trainExtractor.amount,
+                   trainExtractor.seed],
+        'test' : [type(testExtractor).__name__,
+                  testExtractor.amount,
+                  testExtractor.seed]
+    }
+    settings = json.loads(json.dumps(settings, default= str))
+    return settings
+
+def splitKey(settings : dict) -> str:
+    '''
+    Produces a key identifying a train/test split.
+
+    Parameters
+    ----------
+    settings : dict
+        The settings of the split, from splitSettings().
+
+    Returns
+    -------
+    key : str
+        A hex digest of the settings.
+    '''
+    fingerprint = json.dumps(settings, sort_keys= True)
+    key = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[0:32]
+    return key
+
+def manifestPath(manifestDir : str,
+                 key : str) -> str:
+    '''
+    Produces the path at which the manifest of a split is saved.
+
+    Parameters
+    ----------
+    manifestDir : str
+        The directory holding manifests.
+    key : str
+        The key of the split, from splitKey().
+
+    Returns
+    -------
+    path : str
+        The path of the manifest file.
+    '''
+    path = os.path.join(manifestDir, key + '.npz')
+    return path
+
+def readManifest(path : str,
+                 settings : dict) -> tuple[np.ndarray, np.ndarray] | None:
+    '''
+    Reads the rows of a saved split if a manifest with matching settings exists.
+
+    Parameters
+    ----------
+    path : str
+        The path of the manifest file.
+    settings : dict
+        The settings the split must have been saved with.
+
+    Returns
+    -------
+    rows : tuple[np.ndarray, np.ndarray] | None
+        The positions of the training and testing records, or None if no
+        usable manifest is saved at path.
+    '''
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as manifest:
+            if json.loads(str(manifest['settings'])) != settings:
+                return None
+            rows = (manifest['train'], manifest['test'])
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    return rows
+
+def writeManifest(path : str,
+                  trainRows : np.ndarray,
+                  testRows : np.ndarray,
+                  settings : dict) -> str:
+    '''
+    Saves the rows of a split with its settings.
+
+    Parameters
+    ----------
+    path : str
+        The path of the manifest file.
+    trainRows : np.ndarray
+        The positions of the training records among the filtered records.
+    testRows : np.ndarray
+        The positions of the testing records among the filtered records.
+    settings : dict
+        The settings of the split, from splitSettings().
+
+    Returns
+    -------
+    path : str
+        The path of the file written.
+    '''
+    os.makedirs(os.path.dirname(path) or '.', exist_ok= True)
+    with open(path + '.tmp', 'wb') as file:
+        np.savez(file,
+                 train= compactRows(trainRows),
+                 test= compactRows(testRows),
+                 settings= np.array(json.dumps(settings)))
+    os.replace(path + '.tmp', path)
+    return path
+
+def compactRows(rows : np.ndarray) -> np.ndarray:
+    '''
+    Converts an array of positions to the smallest unsigned integer dtype
+    holding them.
+
+    Parameters
+    ----------
+    rows : np.ndarray
+        The positions of records.
+
+    Returns
+    -------
+    rows : np.ndarray
+        The positions with a compact dtype.
+    '''
+    largest = int(rows.max()) if len(rows) > 0 else 0
+    rows = rows.astype(np.min_scalar_type(largest))
+    return rows
@@ -0,0 +1,351 @@
+'''
+Helper functions to stream xlsx files row by row with openpyxl's read-only
+mode, to support package/Importer/base.py and package/base.py.
+
+Classes:
+
+    None
+
+Functions:
+
+    openSheet(str, str, bool) -> tuple
+    headerIndices(tuple, list) -> list
+    rowsToFrame(list, list) -> pd.DataFrame
+    iterChunks(str, list, int, str) -> generator
+    annotate(str, str, list, int, function, str, str) -> str
+    rowChunks(iterable, int) -> generator
+    classifyChunk(list, list, function) -> list
+    writeChunk(WriteOnlyWorksheet, list, list, int, function)
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    ColumnLabelException
+'''
+import os
+import numpy as np
+import openpyxl
+import pandas as pd
+from .. import exceptions as e
+
+def openSheet(file : str,
+              sheet : str = None,
+              dataOnly : bool = True) -> tuple:
+    '''
+    Opens a workbook in read-only mode.
+
+    Parameters
+    ----------
+    file : str
+        The path of the xlsx file.
+    sheet : str
+        The name of the sheet to open. None opens the first sheet.
+    dataOnly : bool
+        Whether to read the cached values of formulas rather than the formulas.
+
+    Returns
+    -------
+    workbook : openpyxl.Workbook
+        The read-only workbook, to be closed by the caller.
+    worksheet : openpyxl.worksheet.ReadOnlyWorksheet
+        The sheet.
+    '''
+    workbook = openpyxl.load_workbook(file,
+                                      read_only= True,
+                                      data_only= dataOnly)
+    worksheet = workbook.worksheets[0] if sheet is None else workbook[sheet]
+    return (workbook, worksheet)
+
+def headerIndices(header : tuple,
+                  columnLabels : list) -> list:
+    '''
+    Finds the position of each column label in a header row.
+
+    Parameters
+    ----------
+    header : tuple
+        The values of the header row.
+    columnLabels : list
+        The labels of the columns to find.
+
+    Returns
+    -------
+    indices : list
+        The position of each label in the header row.
+    '''
+    positions = {}
+    for index, label in enumerate(header):
+        if label is not None and str(label) not in positions:
+            positions[str(label)] = index
+    try:
+        indices = [positions[label] for label in columnLabels]
+    except KeyError:
+        raise e.ColumnLabelException(
+            'One of the column labels was not found in the data file.'
+        )
+    return indices
+
+def rowsToFrame(rows : list,
+                columnLabels : list) -> pd.DataFrame:
+    '''
+    Converts rows of cell values to a data frame, with empty cells as NaN as
+    pd.read_excel gives them.
+
+    Parameters
+    ----------
+    rows : list
+        Tuples of the values of the relavant cells of each row.
+    columnLabels : list
+        The labels of the columns.
+
+    Returns
+    -------
+    frame : pd.DataFrame
+        The data frame of the rows.
+    '''
+    frame = pd.DataFrame.from_records(rows, columns= columnLabels)
+    frame = frame.infer_objects()
+    for label in frame.columns:
+        if frame[label].dtype == object:
+            frame[label] = frame[label].where(frame[label].notna(), np.nan)
+    return frame
+
+def iterChunks(file : str,
+               columnLabels : list,
+               chunkSize : int,
+               sheet : str = None):
+    '''
+    Streams the relavant columns of an xlsx sheet as data frames of at most
+    chunkSize rows. Only one chunk of rows is held in memory at a time.
+
+    Parameters
+    ----------
+    file : str
+        The path of the xlsx file.
+    columnLabels : list
+        The labels of the columns to read.
+    chunkSize : int
+        The number of rows in each data frame.
+    sheet : str
+        The name of the sheet to read. None reads the first sheet.
+
+    Yields
+    ------
+    chunk : pd.DataFrame
+        The next chunkSize rows of the relavant columns. Rows are numbered
+        consecutively from 0, as pd.read_excel numbers them, and empty rows 
+        at the end of the sheet are dropped.
+    '''
+    workbook, worksheet = openSheet(file, sheet)
+    try:
+        rows = worksheet.iter_rows(values_only= True)
+        header = next(rows, ())
+        indices = headerIndices(header, columnLabels)
+        start = 0
+        chunk = []
+        blanks = 0
+        for row in rows:
+            if all(value is None for value in row):
+                blanks += 1
+                continue
+            chunk += [(None,) * len(indices)] * blanks
+            blanks = 0
+            chunk.append(tuple(row[index] if index < len(row) else None
+                               for index in indices))
+            while len(chunk) >= chunkSize:
+                frame = rowsToFrame(chunk[0:chunkSize], columnLabels)
+                frame.index = pd.RangeIndex(start, start + chunkSize)
+                start += chunkSize
+                chunk = chunk[chunkSize:]
+                yield frame
+        if chunk != []:
+            frame = rowsToFrame(chunk, columnLabels)
+            frame.index = pd.RangeIndex(start, start + len(chunk))
+            yield frame
+    finally:
+        workbook.close()
+
+def annotate(path : str,
+             sheet : str,
+             textFieldColumnLabels : list,
+             chunkSize : int,
+             classify,
+             columnLabel : str,
+             outPath : str = '') -> str:
+    '''
+    Adds a column of classifications to a sheet of an xlsx file. Rows are 
+    classified in chunks. By default the file is edited in place, which keeps
+    its formatting but loads the whole workbook. If outPath is given, rows are
+    instead streamed, with the other sheets, to a new workbook at outPath in 
+    one pass. Only values and formulas are copied to it, so formatting, 
+    column widths, merged cells, charts and defined names are not kept. Empty
+    rows at the end of the sheet, which may only hold formatting, are not 
+    classified.
+
+    Parameters
+    ----------
+    path : str
+        The path of the xlsx file.
+    sheet : str
+        The name of the sheet to annotate.
+    textFieldColumnLabels : list
+        The labels of the columns holding the text to classify.
+    chunkSize : int
+        The number of rows to classify at a time.
+    classify : function
+        When called on a list of records, returns their classifications.
+    columnLabel : str
+        A label for the column of classifications.
+    outPath : str
+        The path of a new xlsx file to stream the annotated workbook to. '' 
+        edits the file at path in place.
+
+    Returns
+    -------
+    path : str
+        The path of the annotated file.
+    '''
+    if outPath == '':
+        workbook = openpyxl.load_workbook(path)
+        worksheet = workbook[sheet]
+        header = [cell.value for cell in next(worksheet.iter_rows(max_row= 1), ())]
+        indices = headerIndices(header, textFieldColumnLabels)
+        flagIndex = header.index(None) if None in header else len(header)
+        worksheet.cell(row= 1, column= flagIndex + 1).value = columnLabel
+        rowIndex = 2
+        for chunk in rowChunks(worksheet.iter_rows(min_row= 2, 
+                                                   values_only= True),
+                               chunkSize):
+            for flag in classifyChunk(chunk, indices, classify):
+                worksheet.cell(row= rowIndex, column= flagIndex + 1).value = flag
+                rowIndex += 1
+        workbook.save(path)
+        return path
+    if os.path.abspath(outPath) == os.path.abspath(path):
+        raise e.FileException(
+            'outPath must differ from the path of the file being annotated.'
+        )
+    source = openpyxl.load_workbook(path, read_only= True, data_only= False)
+    target = openpyxl.Workbook(write_only= True)
+    try:
+        for worksheet in source.worksheets:
+            outSheet = target.create_sheet(worksheet.title)
+            rows = worksheet.iter_rows(values_only= True)
+            if worksheet.title != sheet:
+                for row in rows:
+                    outSheet.append(row)
+                continue
+            header = list(next(rows, ()))
+            indices = headerIndices(header, textFieldColumnLabels)
+            if None in header:
+                flagIndex = header.index(None)
+            else:
+                flagIndex = len(header)
+                header.append(None)
+            header[flagIndex] = columnLabel
+            outSheet.append(header)
+            for chunk in rowChunks(rows, chunkSize):
+                writeChunk(outSheet, chunk, indices, flagIndex, classify)
+        target.save(outPath + '.tmp')
+    finally:
+        source.close()
+    os.replace(outPath + '.tmp', outPath)
+    return outPath
+
+def rowChunks(rows,
+              chunkSize : int):
+    '''
+    Splits the rows of a sheet into chunks to classify. Empty rows are held
+    back until a row with values follows, so empty rows at the end of the 
+    sheet are dropped, as iterChunks() drops them.
+
+    Parameters
+    ----------
+    rows : iterable
+        Tuples of the values of each row.
+    chunkSize : int
+        The number of rows in each chunk.
+
+    Yields
+    ------
+    chunk : list
+        The next chunkSize rows, or the rows left.
+    '''
+    chunk = []
+    blanks = []
+    for row in rows:
+        if all(value is None for value in row):
+            blanks.append(row)
+            continue
+        chunk += blanks
+        blanks = []
+        chunk.append(row)
+        while len(chunk) >= chunkSize:
+            yield chunk[0:chunkSize]
+            chunk = chunk[chunkSize:]
+    if chunk != []:
+        yield chunk
+
+def classifyChunk(chunk : list,
+                  indices : list,
+                  classify) -> list:
+    '''
+    Classifies a chunk of rows by their text columns.
+
+    Parameters
+    ----------
+    chunk : list
+        Tuples of the values of each row.
+    indices : list
+        The positions of the text columns in each row.
+    classify : function
+        When called on a list of records, returns their classifications.
+
+    Returns
+    -------
+    flags : list
+        The classification of each row, as a Python value.
+    '''
+    if chunk == []:
+        return []
+    records = rowsToFrame([tuple(row[index] if index < len(row) else None
+                                 for index in indices) for row in chunk],
+                          list(range(0, len(indices)))).values.tolist()
+    flags = [flag.item() if hasattr(flag, 'item') else flag
+             for flag in classify(records)]
+    return flags
+
+def writeChunk(outSheet,
+               chunk : list,
+               indices : list,
+               flagIndex : int,
+               classify):
+    '''
+    Classifies a chunk of rows and appends them, with their classifications, to
+    a write-only sheet.
+
+    Parameters
+    ----------
+    outSheet : openpyxl.worksheet.WriteOnlyWorksheet
+        The sheet to append the rows to.
+    chunk : list
+        Tuples of the values of each row.
+    indices : list
+        The positions of the text columns in each row.
+    flagIndex : int
+        The position of the column of classifications.
+    classify : function
+        When called on a list of records, returns their classifications.
+
+    Returns
+    -------
+    None
+    '''
+    flags = classifyChunk(chunk, indices, classify)
+    for row, flag in zip(chunk, flags):
+        row = list(row) + [None] * max(flagIndex + 1 - len(row), 0)
+        row[flagIndex] = flag
+        outSheet.append(row)
@@ -8,8 +8,7 @@ Classes:
 
 Functions:
 
-    startRec() -> float
-    stopRec(float) -> tuple[float, float]
+    None
 
 Misc variables:
 
@@ -30,23 +29,30 @@ Exceptions:
     MLearnException
     CrossValidateException
     NameExistsException
+    MeasureException
+    DuplicatesException
 '''
 import os
 
 import openpyxl.styles
 from .Importer import importer as i
+from .Importer import base as ib
+from .Importer import constants as ic
+from .Importer import xlsx as xl
 from .vectorise import vectorise as v
+from .vectorise import constants as vc
 from .mlearn import mlearn as m
 from .evaluate import evaluate as e
 from .evaluate import base as eb
 from . import exceptions as ex
+from . import instrument as ins
 import joblib
 import time
-import tracemalloc
+import numpy as np
 import openpyxl
 import pandas as pd
 import csv
-from scipy import sparse
+from contextlib import contextmanager
 from sklearn.model_selection import KFold
 
 class NLP:
@@ -67,6 +73,17 @@ class NLP:
         The vectoriser used to vectorise the data.
     mlearn : MLearn
         The machine learning model used to predict flags.
+    measureMode : str
+        How the time and memory used by each stage are measured. Applied when
+        create(), evaluateNLP() or a cross-validation method is called.
+    traceFile : str
+        A path, without extension, at which to write traces. '' disables 
+        tracing.
+    tracer : Tracer | None
+        The trace of the last traced method, if traceFile is set.
+    collapseDuplicates : bool
+        Whether duplicate training records are vectorised once and weighted
+        by their multiplicity when training.
 
     Constructed by running the create() method:
     trainData : list
@@ -126,10 +143,15 @@ class NLP:
         Pickles and exports the NLP object to the model directory.
     annotateDataCSV(str, list, str)
         Write classifications into a CSV file of records.
-    annotateDataXLSX(str, str, list, str)
+    annotateDataXLSX(str, str, list, str, str)
         Write classifications into a XLSX file of records.
     crossValidateQuantify(int) -> dict
         Compares actual and estimated positive instance counts across multiple folds.
+    collapseFold(np.ndarray, list, np.ndarray) -> tuple
+        Finds the unique training records of a cross-validation fold.
+    tracing(str)
+        Sets the measure mode and traces the stages run within it, if 
+        traceFile is set.
     viewEvaluation()
         Prints the evaluation to the command line.
     viewParameters()
@@ -161,6 +183,12 @@ class NLP:
                  trainDist: str = 'NEWESTBLOCK', 
                  testSize: int = 0, 
                  testDist: str = 'NEWESTBLOCK',
+                 chunkSize : int = 0,
+                 importWorkers : int = 1,
+                 importCacheDir : str = '',
+                 compactDtypes : bool = False,
+                 extractSeed : int = None,
+                 splitManifestDir : str = '',
                  vect_arg_dict : dict = None,
                  tokeniser : str = '',
                  preLAChanges : list = [],
@@ -168,11 +196,28 @@ class NLP:
                  textLevelLA : list = [],
                  corpusLevelLA : str = '',
                  ngramRange : tuple = (1, 1),
+                 tagWorkers : int = 1,
+                 memoSize : int = vc.MEMO_SIZE,
+                 persistMemo : bool = False,
+                 vectWorkers : int = 1,
+                 poolType : str = 'PROCESS',
+                 hashFeatures : int = vc.HASH_FEATURES,
+                 minDF : int | float = 1,
+                 maxDF : int | float = 1.0,
+                 maxFeatures : int = None,
+                 sketchWidth : int = 0,
+                 vectCacheDir : str = '',
+                 vectCacheSize : int = vc.VECT_CACHE_SIZE,
+                 featureDtype : str = 'float32',
+                 indexDtype : str = 'int32',
                  ml_arg_dict : dict = None,
                  mlAlgType : str = '',
                  macLearnInput : dict = {},
                  overSampleOps : dict = {},
-                 underSampleOps : dict = {}):
+                 underSampleOps : dict = {},
+                 measureMode : str = 'RSS',
+                 traceFile : str = '',
+                 collapseDuplicates : bool = False):
         '''
         Checks name input valid and contructs initial attributes for NLP object.
 
@@ -220,6 +265,25 @@ class NLP:
             The amount of testing records.
         testDist: str
             The distribution to use for selecting testing records.
+        chunkSize : int
+            The number of rows to read from a csv or xlsx file at a time. If 
+            positive, each chunk is filtered as it is read. 0 reads whole 
+            files.
+        importWorkers : int
+            The number of data files to read concurrently.
+        importCacheDir : str
+            A directory in which to cache imported data files in a binary 
+            format. When chunkSize is positive, only the records of each file
+            kept by the demographic filter are cached. '' disables caching.
+        compactDtypes : bool
+            Whether to give imported columns compact dtypes based on their 
+            role.
+        extractSeed : int
+            The seed used to sample training and testing records. None seeds
+            sampling from the operating system.
+        splitManifestDir : str
+            A directory in which to save train/test splits for reuse by later 
+            runs. Requires extractSeed. '' disables manifests.
         vect_arg_dict : dict
             A dictionary containing Vectorise constructor arguments.
         tokeniser : str
@@ -234,6 +298,44 @@ class NLP:
             A choice of corpus level technique for vectorising.
         ngramRange : tuple
             Lower and upper bound for n-gram sizes (inclusive).
+        tagWorkers : int
+            The number of processes used to POS tag records.
+        memoSize : int
+            The most tokens held by each memo of stems and stopword checks. 0
+            disables memoisation.
+        persistMemo : bool
+            Whether the memo is kept when the program is exported.
+        vectWorkers : int
+            The number of workers records are vectorised with.
+        poolType : str
+            The type of worker pool used when vectWorkers is greater than 1, 
+            PROCESS or THREAD.
+        hashFeatures : int
+            The number of features n-grams are hashed into by the HASHING 
+            corpus level techniques.
+        minDF : int | float
+            The fewest records, or proportion of records if a float, an n-gram
+            must appear in to be a bag of words feature.
+        maxDF : int | float
+            The most records, or proportion of records if a float, an n-gram 
+            may appear in to be a bag of words feature.
+        maxFeatures : int | None
+            The most bag of words features. None doesn't limit them.
+        sketchWidth : int
+            The width of a count-min sketch used to choose the bag of words 
+            vocabulary before exact counting. 0 chooses it from exact counts.
+        vectCacheDir : str
+            A directory in which to cache vectorised training and testing 
+            records, so that running again on the same records with the same 
+            vectorising settings, for example with other machine learning 
+            settings, skips vectorising. '' disables caching.
+        vectCacheSize : int
+            The most bytes taken up by cached vectors.
+        featureDtype : str
+            The dtype of the values of the vectors, float32 or float64.
+        indexDtype : str
+            The dtype of the indices of the vectors, int32 or int64, where 
+            their size allows.
         ml_arg_dict : dict
             A dictionary containing MLearn constructor arguments.
         mlAlgType : str
@@ -244,7 +346,23 @@ class NLP:
             A dictionary of input parameters relavent to over-sampling.
         underSampleOps : dict
             A dictionary of input parameters relavent to under-sampling.
-        
+        measureMode : str
+            How the time and memory used by each stage are measured. "OFF", 
+            "TIME", "RSS" (sampled resident set size) or "TRACEMALLOC" 
+            (traced Python allocations, slowest).
+        traceFile : str
+            A path, without extension, at which to write a trace of the nested
+            stages of create() and the cross-validation methods. A JSON tree is
+            written to traceFile.json and a Chrome trace-event file to 
+            traceFile.trace.json. '' disables tracing.
+        collapseDuplicates : bool
+            Whether to collapse training records with the same text fields and
+            flag before vectorising. Each unique record is vectorised once and
+            weighted by its multiplicity when training and when fitting the 
+            corpus level technique, whose document frequencies are counted as
+            (X > 0).T @ sampleWeight, so its vocabulary, pruning and inverse
+            document frequencies match those of the uncollapsed records.
+
         NOTE : If an argument dictionary is provided for Importer, Vectorise, or MLearn,
         the related keyword arguments provided to the NLP constructor will be ignored.
         '''
@@ -252,6 +370,24 @@ class NLP:
 
         self.parameters = {'Name' : self.name}
 
+        ins.checkMode(measureMode)
+        self.measureMode = measureMode
+        self.parameters['measureMode'] = measureMode
+
+        if not isinstance(traceFile, str):
+            raise ex.MeasureException(
+                'traceFile must be a string.'
+            )
+        self.traceFile = traceFile
+        self.tracer = None
+
+        if not isinstance(collapseDuplicates, bool):
+            raise ex.DuplicatesException(
+                'collapseDuplicates must be a bool.'
+            )
+        self.collapseDuplicates = collapseDuplicates
+        self.parameters['collapseDuplicates'] = collapseDuplicates
+
         if imp_arg_dict != None:
             if not isinstance(imp_arg_dict, dict):
                 raise ex.ImporterException()
@@ -277,7 +413,13 @@ class NLP:
                                     trainSize= trainSize,
                                     trainDist= trainDist,
                                     testSize= testSize,
-                                    testDist= testDist
+                                    testDist= testDist,
+                                    chunkSize= chunkSize,
+                                    importWorkers= importWorkers,
+                                    importCacheDir= importCacheDir,
+                                    compactDtypes= compactDtypes,
+                                    extractSeed= extractSeed,
+                                    splitManifestDir= splitManifestDir
                                     )
             imp_params = dict(
                 trainFile = trainFile,
@@ -298,7 +440,13 @@ class NLP:
                 trainSize = trainSize,
                 trainDist = trainDist,
                 testSize = testSize,
-                testDist = testDist
+                testDist = testDist,
+                chunkSize = chunkSize,
+                importWorkers = importWorkers,
+                importCacheDir = importCacheDir,
+                compactDtypes = compactDtypes,
+                extractSeed = extractSeed,
+                splitManifestDir = splitManifestDir
             )
             self.parameters.update(imp_params)
 
@@ -314,14 +462,42 @@ class NLP:
                                          tokenLevelLA= tokenLevelLA, 
                                          textLevelLA= textLevelLA,
                                          corpusLevelLA= corpusLevelLA,
-                                         ngramRange= ngramRange)
+                                         ngramRange= ngramRange,
+                                         tagWorkers= tagWorkers,
+                                         memoSize= memoSize,
+                                         persistMemo= persistMemo,
+                                         vectWorkers= vectWorkers,
+                                         poolType= poolType,
+                                         hashFeatures= hashFeatures,
+                                         minDF= minDF,
+                                         maxDF= maxDF,
+                                         maxFeatures= maxFeatures,
+                                         sketchWidth= sketchWidth,
+                                         vectCacheDir= vectCacheDir,
+                                         vectCacheSize= vectCacheSize,
+                                         featureDtype= featureDtype,
+                                         indexDtype= indexDtype)
             vect_params = dict(
                 tokeniser = tokeniser,
                 preLAChanges = preLAChanges,
                 tokenLevelLA = tokenLevelLA,
                 textLevelLA = textLevelLA,
                 corpusLevelLA = corpusLevelLA,
-                ngramRange = ngramRange
+                ngramRange = ngramRange,
+                tagWorkers = tagWorkers,
+                memoSize = memoSize,
+                persistMemo = persistMemo,
+                vectWorkers = vectWorkers,
+                poolType = poolType,
+                hashFeatures = hashFeatures,
+                minDF = minDF,
+                maxDF = maxDF,
+                maxFeatures = maxFeatures,
+                sketchWidth = sketchWidth,
+                vectCacheDir = vectCacheDir,
+                vectCacheSize = vectCacheSize,
+                featureDtype = featureDtype,
+                indexDtype = indexDtype
             )
             self.parameters.update(vect_params)
 
@@ -357,46 +533,60 @@ class NLP:
         -------
         None
         '''
-        self.trainData, testData = self.importer.importData()
-
-        trainFlags = self.trainData[self.importer.flagColumnLabel].values.tolist()
-        actualFlags = testData[self.importer.flagColumnLabel].values.tolist()
-
-        self.trainData = self.trainData[self.importer.textFieldColumnLabels].values.tolist()
-        testData = testData[self.importer.textFieldColumnLabels].values.tolist()
-
-        print('Vectorising Data...')
-        time0 = startRec()
-        trainVectors, testVectors = self.vectorise.vectorise(self.trainData, 
-                                                             testData)
-        self.vectTime, self.vectSpace = stopRec(time0)
-
-        predictedFlags, trainedModel = self.mlearn.trainAndPredict(trainVectors, 
-                                                                trainFlags, 
-                                                                testVectors)
-
-        times = [self.importer.importTime, 
-                 self.importer.filterTime,
-                 self.importer.trainExtractTime,
-                 self.importer.testExtractTime,
-                 self.vectTime,
-                 self.mlearn.trainingTime,
-                 self.mlearn.predictionTime]
+        with self.tracing('create'):
+            with ins.span('importData'):
+                self.trainData, testData = self.importer.importData()
+
+            trainFlags = ib.frameToRecords(self.trainData[self.importer.flagColumnLabel])
+            actualFlags = ib.frameToRecords(testData[self.importer.flagColumnLabel])
+
+            self.trainData = ib.frameToRecords(self.trainData[self.importer.textFieldColumnLabels])
+            testData = ib.frameToRecords(testData[self.importer.textFieldColumnLabels])
+
+            trainRecords = self.trainData
+            sampleWeight = None
+            if self.collapseDuplicates:
+                with ins.span('collapseDuplicates', len(trainRecords)):
+                    trainRecords, trainFlags, sampleWeight, _ = ib.collapseDuplicates(
+                        trainRecords,
+                        trainFlags
+                        )
+
+            print('Vectorising Data...')
+            record = ins.startRec('vectorise')
+            trainVectors, testVectors = self.vectorise.vectorise(trainRecords,
+                                                                 testData,
+                                                                 sampleWeight)
+            self.vectTime, self.vectSpace = ins.stopRec(record,
+                                                        len(trainRecords) + len(testData))
+
+            predictedFlags, trainedModel = self.mlearn.trainAndPredict(trainVectors,
+                                                                    trainFlags,
+                                                                    testVectors,
+                                                                    sampleWeight)
+
+            times = [self.importer.importTime, 
+                     self.importer.filterTime,
+                     self.importer.trainExtractTime,
+                     self.importer.testExtractTime,
+                     self.vectTime,
+                     self.mlearn.trainingTime,
+                     self.mlearn.predictionTime]
         
-        spaces = [self.importer.importSpace,
-                  self.importer.filterSpace,
-                  self.importer.trainExtractSpace,
-                  self.importer.testExtractSpace,
-                  self.vectSpace,
-                  self.mlearn.trainingSpace,
-                  self.mlearn.predictionSpace]
-
-        self.trainedModel = trainedModel
-        self.actualFlags = actualFlags
-        self.mlearn.testFlags = actualFlags
-        self.predictedFlags = predictedFlags
-        self.times = times
-        self.spaces = spaces
+            spaces = [self.importer.importSpace,
+                      self.importer.filterSpace,
+                      self.importer.trainExtractSpace,
+                      self.importer.testExtractSpace,
+                      self.vectSpace,
+                      self.mlearn.trainingSpace,
+                      self.mlearn.predictionSpace]
+
+            self.trainedModel = trainedModel
+            self.actualFlags = actualFlags
+            self.mlearn.testFlags = actualFlags
+            self.predictedFlags = predictedFlags
+            self.times = times
+            self.spaces = spaces
         print('NLP Program Created')
 
     def crossValidate(self, 
@@ -425,70 +615,93 @@ class NLP:
             )
         
         self.nFolds = nFolds
-        self.trainData, testData = self.importer.importData()
-
-        trainFlags = self.trainData[self.importer.flagColumnLabel].values.tolist()
-
-        self.trainData = self.trainData[self.importer.textFieldColumnLabels].values.tolist()
-        testData = testData[self.importer.textFieldColumnLabels].values.tolist()
-
-        print('Vectorising Data...')
-        time0 = startRec()
-        trainVectors, _ = self.vectorise.vectorise(self.trainData, 
-                                                    testData)
-        self.vectTime, self.vectSpace = stopRec(time0)
-
-        scores = {'Train F1' : [],
-                  'Train Precision' : [],
-                  'Train Recall' : [],
-                  'Test F1' : [],
-                  'Test Precision' : [],
-                  'Test Recall' : [],
-                  'Fold Times' : []}
-
-        print('Cross-Validating...')
-        kf = KFold(n_splits= nFolds)
-        for i, (trainIndex, testIndex) in enumerate(kf.split(trainFlags)):
-            print(f'Running on Fold {i + 1}...')
-
-            time0 = time.time()
+        with self.tracing('crossValidate'):
+            with ins.span('importData'):
+                self.trainData, testData = self.importer.importData()
+
+            trainFlags = ib.frameToRecords(self.trainData[self.importer.flagColumnLabel])
+
+            self.trainData = ib.frameToRecords(self.trainData[self.importer.textFieldColumnLabels])
+            testData = ib.frameToRecords(testData[self.importer.textFieldColumnLabels])
+
+            trainRecords = self.trainData
+            recordWeight = None
+            inverse = None
+            if self.collapseDuplicates:
+                with ins.span('collapseDuplicates', len(trainRecords)):
+                    trainRecords, _, recordWeight, inverse = ib.collapseDuplicates(
+                        trainRecords,
+                        trainFlags
+                        )
+
+            print('Vectorising Data...')
+            record = ins.startRec('vectorise')
+            trainVectors, _ = self.vectorise.vectorise(trainRecords,
+                                                        testData,
+                                                        recordWeight)
+            self.vectTime, self.vectSpace = ins.stopRec(record,
+                                                        len(trainRecords) + len(testData))
+
+            scores = {'Train F1' : [],
+                      'Train Precision' : [],
+                      'Train Recall' : [],
+                      'Test F1' : [],
+                      'Test Precision' : [],
+                      'Test Recall' : [],
+                      'Fold Times' : []}
+
+            print('Cross-Validating...')
+            kf = KFold(n_splits= nFolds)
+            for i, (trainIndex, testIndex) in enumerate(kf.split(trainFlags)):
+                print(f'Running on Fold {i + 1}...')
+                with ins.span(f'fold {i + 1}', len(trainIndex)):
+                    time0 = time.perf_counter()
             
-            subTrainVectors = sparse.vstack([trainVectors.getrow(i) for i in trainIndex])
-            subTrainFlags = [trainFlags[i] for i in trainIndex]
-            subTestVectors = sparse.vstack([trainVectors.getrow(i) for i in testIndex])
-            subTestFlags = [trainFlags[i] for i in testIndex]
-
-            predictedTestFlags, _ = self.mlearn.trainAndPredict(subTrainVectors, 
-                                                            subTrainFlags, 
-                                                            subTestVectors)
+                    trainRows, uniqueFlags, sampleWeight, expand = self.collapseFold(
+                        trainIndex,
+                        trainFlags,
+                        inverse
+                        )
+                    subTrainVectors = trainVectors[trainRows]
+                    subTrainFlags = [trainFlags[i] for i in trainIndex]
+                    testRows = testIndex if inverse is None else inverse[testIndex]
+                    subTestVectors = trainVectors[testRows]
+                    subTestFlags = [trainFlags[i] for i in testIndex]
+
+                    predictedTestFlags, _ = self.mlearn.trainAndPredict(subTrainVectors,
+                                                                    uniqueFlags,
+                                                                    subTestVectors,
+                                                                    sampleWeight)
+
+                    print('Predicting on Training Vectors...')
+                    predictedTrainFlags = self.mlearn.trainedModel.predict(subTrainVectors)
+                    if expand is not None:
+                        predictedTrainFlags = predictedTrainFlags[expand]
+
+                    trainPrecision, trainRecall = eb.precisionAndRecall(subTrainFlags,
+                                                                        predictedTrainFlags)
             
-            print('Predicting on Training Vectors...')
-            predictedTrainFlags = self.mlearn.trainedModel.predict(subTrainVectors)
-
-            trainPrecision, trainRecall = eb.precisionAndRecall(subTrainFlags,
-                                                                predictedTrainFlags)
+                    if trainPrecision == 0 and trainRecall == 0:
+                        trainf1 = 0
+                    else:
+                        trainf1 = (2 * trainPrecision * trainRecall) / (trainPrecision + trainRecall)
+
+                    scores['Train F1'].append(trainf1)
+                    scores['Train Precision'].append(trainPrecision)
+                    scores['Train Recall'].append(trainRecall)
             
-            if trainPrecision == 0 and trainRecall == 0:
-                trainf1 = 0
-            else:
-                trainf1 = (2 * trainPrecision * trainRecall) / (trainPrecision + trainRecall)
-
-            scores['Train F1'].append(trainf1)
-            scores['Train Precision'].append(trainPrecision)
-            scores['Train Recall'].append(trainRecall)
+                    testPrecision, testRecall = eb.precisionAndRecall(subTestFlags,
+                                                                      predictedTestFlags)
             
-            testPrecision, testRecall = eb.precisionAndRecall(subTestFlags,
-                                                              predictedTestFlags)
-            
-            if testPrecision == 0 and testRecall == 0:
-                testf1 = 0
-            else:
-                testf1 = (2 * testPrecision * testRecall) / (testPrecision + testRecall)
+                    if testPrecision == 0 and testRecall == 0:
+                        testf1 = 0
+                    else:
+                        testf1 = (2 * testPrecision * testRecall) / (testPrecision + testRecall)
         
-            scores['Test F1'].append(testf1)
-            scores['Test Precision'].append(testPrecision)
-            scores['Test Recall'].append(testRecall)
-            scores['Fold Times'].append(time.time() - time0)
+                    scores['Test F1'].append(testf1)
+                    scores['Test Precision'].append(testPrecision)
+                    scores['Test Recall'].append(testRecall)
+                    scores['Fold Times'].append(time.perf_counter() - time0)
 
         print('NLP Program Cross-Validated')
         if hasattr(self, 'outputDic'):
@@ -510,13 +723,14 @@ class NLP:
         None
         '''
         print('Evaluating Model...')
-        time0 = startRec()
+        ins.setMode(self.measureMode)
+        record = ins.startRec('evaluate')
         self.eval = e.Evaluate(self.actualFlags, 
                                 self.predictedFlags,
                                 self.times,
                                 self.spaces)
         self.outputDic = self.eval.evaluate()
-        evalTime, evalSpace = stopRec(time0)
+        evalTime, evalSpace = ins.stopRec(record, len(self.actualFlags))
         self.eval.times.append(evalTime)
         self.eval.spaces.append(evalSpace)
         self.outputDic['EvaluateTime'] = evalTime
@@ -559,7 +773,14 @@ class NLP:
                         textFieldColumnLabels : list,
                         columnLabel : str):
         '''
-        Write classifications into a CSV file of records.
+        Write classifications into a CSV file of records. The file is 
+        streamed in batches of rows, which are vectorised and classified one 
+        at a time, so only one batch is held in memory at a time. Batches have
+        the chunk size of the importer, or vectorise's default batch size if 
+        files aren't read in chunks.
+        Blank lines are kept but not annotated. If the records parsed from 
+        the file can't be paired one to one with its rows, the file is left
+        unchanged.
 
         Parameters
         ----------
@@ -574,40 +795,63 @@ class NLP:
         -------
         None
         '''
-        print('Importing text...')
-        outList = pd.read_csv(
-                    path, 
-                    usecols = textFieldColumnLabels, 
-                    encoding_errors= 'ignore', 
-                    low_memory= False
-                    ).values.tolist()
-        print('Vectorising...')
-        vectors = self.vectorise.vectoriseList(outList)
-        print('Predicting...')
-        flags = self.trainedModel.predict(vectors)
+        batchSize = self.importer.dataSet.chunkSize
+        if batchSize == 0:
+            batchSize = vc.ITER_BATCH_SIZE
+        def classify(chunks):
+            records = (record for chunk in chunks 
+                       for record in chunk.values.tolist())
+            for vectors in self.vectorise.vectoriseIter(records, batchSize):
+                yield from self.trainedModel.predict(vectors)
         print('Annotating file...')
-        csv_file_path = path
-        with open(file= csv_file_path, mode= 'r', errors= 'replace') as file:
-            reader = csv.reader(file)
-            data = list(reader)
-        data[0].append(columnLabel)
-        rowIndex = 1
-        for flag in flags:
-            data[rowIndex].append(flag)
-            rowIndex += 1
-        print('Saving file...')
-        with open(csv_file_path, 'w', newline='', errors= 'replace') as file:
-            writer = csv.writer(file)
-            writer.writerows(data)
+        tempPath = path + '.tmp'
+        with ins.span('annotate'):
+            chunks = pd.read_csv(
+                        path, 
+                        usecols = textFieldColumnLabels, 
+                        encoding_errors= 'ignore', 
+                        skip_blank_lines= False,
+                        chunksize= batchSize
+                        )
+            try:
+                with chunks, \
+                     open(path, 'r', errors= 'replace') as inFile, \
+                     open(tempPath, 'w', newline= '', errors= 'replace') as outFile:
+                    flags = classify(chunks)
+                    reader = csv.reader(inFile)
+                    writer = csv.writer(outFile)
+                    writer.writerow(next(reader) + [columnLabel])
+                    for row in reader:
+                        flag = next(flags, None)
+                        if flag is None:
+                            raise ex.FileException(
+                                'Fewer records than rows were read from ' + path + '.'
+                            )
+                        if row != []:
+                            row.append(flag)
+                        writer.writerow(row)
+                    if next(flags, None) is not None:
+                        raise ex.FileException(
+                            'More records than rows were read from ' + path + '.'
+                        )
+            except ex.FileException:
+                os.remove(tempPath)
+                raise
+            os.replace(tempPath, path)
         print('Data annotated.')
 
     def annotateDataXLSX(self, 
                         path : str, 
                         sheet : str, 
                         textFieldColumnLabels : list,
-                        columnLabel : str):
+                        columnLabel : str,
+                        outPath : str = ''):
         '''
-        Write classifications into an XLSX file of records.
+        Write classifications into an XLSX file of records. Records are 
+        classified in chunks of rows. By default the file is edited in place,
+        keeping its formatting. If outPath is given, the file is instead 
+        streamed to a new file at outPath, so only one chunk is held in memory
+        at a time, but formatting is not kept.
 
         Parameters
         ----------
@@ -619,36 +863,29 @@ class NLP:
             The lables of the columns containg the text to be used.
         columnLabel : str
             A label for the column of annotations.
+        outPath : str
+            The location of a new XLSX file to write the annotated records to.
+            '' annotates the file at path in place.
 
         Returns
         -------
         None
         '''
-        print('Opening file...')
-        file = openpyxl.load_workbook(path)
-        sheet_name = sheet
-        sheet = file[sheet]
-        print('Importing text...')
-        outList = pd.read_excel(
-                    path,
-                    sheet_name= sheet_name, 
-                    usecols = textFieldColumnLabels
-                    ).values.tolist()
-        print('Vectorising...')
-        vectors = self.vectorise.vectoriseList(outList)
-        print('Predicting...')
-        flags = self.trainedModel.predict(vectors)
+        chunkSize = self.importer.dataSet.chunkSize
+        if chunkSize == 0:
+            chunkSize = ic.XLSX_CHUNK_SIZE
+        def classify(records : list):
+            return self.trainedModel.predict(
+                self.vectorise.vectoriseList(records))
         print('Annotating file...')
-        colIndex = 1
-        while sheet.cell(row = 1, column = colIndex).value != None:
-            colIndex += 1
-        sheet.cell(row = 1, column = colIndex).value = columnLabel
-        rowIndex = 2
-        for flag in flags:
-            sheet.cell(row = rowIndex, column = colIndex).value = flag
-            rowIndex += 1
-        print('Saving file...')
-        file.save(path)
+        with ins.span('annotate'):
+            xl.annotate(path, 
+                        sheet, 
+                        textFieldColumnLabels, 
+                        chunkSize, 
+                        classify, 
+                        columnLabel,
+                        outPath)
 
     def crossValidateQuantify(self,
                               nFolds : int = 5) -> dict:
@@ -673,53 +910,142 @@ class NLP:
                 'nFolds must be greater than or equal to 1.'
             )
         
-        self.trainData, testData = self.importer.importData()
-
-        trainFlags = self.trainData[self.importer.flagColumnLabel].values.tolist()
+        with self.tracing('crossValidateQuantify'):
+            with ins.span('importData'):
+                self.trainData, testData = self.importer.importData()
+
+            trainFlags = ib.frameToRecords(self.trainData[self.importer.flagColumnLabel])
+
+            self.trainData = ib.frameToRecords(self.trainData[self.importer.textFieldColumnLabels])
+            testData = ib.frameToRecords(testData[self.importer.textFieldColumnLabels])
+
+            trainRecords = self.trainData
+            recordWeight = None
+            inverse = None
+            if self.collapseDuplicates:
+                with ins.span('collapseDuplicates', len(trainRecords)):
+                    trainRecords, _, recordWeight, inverse = ib.collapseDuplicates(
+                        trainRecords,
+                        trainFlags
+                        )
+
+            print('Vectorising Data...')
+            record = ins.startRec('vectorise')
+            trainVectors, _ = self.vectorise.vectorise(trainRecords,
+                                                        testData,
+                                                        recordWeight)
+            self.vectTime, self.vectSpace = ins.stopRec(record,
+                                                        len(trainRecords) + len(testData))
+
+            counts = {'Actual Counts' : [],
+                      'Estimated Counts' : []}
+
+            print('Cross-Validating...')
+            kf = KFold(n_splits= nFolds)
+            for i, (trainIndex, testIndex) in enumerate(kf.split(trainFlags)):
+                print(f'Running on Fold {i + 1}...')
+                with ins.span(f'fold {i + 1}', len(trainIndex)):
+                    trainRows, uniqueFlags, sampleWeight, _ = self.collapseFold(
+                        trainIndex,
+                        trainFlags,
+                        inverse
+                        )
+                    subTrainVectors = trainVectors[trainRows]
+                    testRows = testIndex if inverse is None else inverse[testIndex]
+                    subTestVectors = trainVectors[testRows]
+                    subTestFlags = [trainFlags[i] for i in testIndex]
+
+                    predictedTestFlags, _ = self.mlearn.trainAndPredict(subTrainVectors,
+                                                                    uniqueFlags,
+                                                                    subTestVectors,
+                                                                    sampleWeight)
+
+                    counts['Actual Counts'].append(sum(subTestFlags))
+                    counts['Estimated Counts'].append(sum(predictedTestFlags))
+
+                    testPrecision, testRecall = eb.precisionAndRecall(subTestFlags,
+                                                                      predictedTestFlags)
+            
+                    if testPrecision == 0 and testRecall == 0:
+                        testf1 = 0
+                    else:
+                        testf1 = (2 * testPrecision * testRecall) / (testPrecision + testRecall)
 
-        self.trainData = self.trainData[self.importer.textFieldColumnLabels].values.tolist()
-        testData = testData[self.importer.textFieldColumnLabels].values.tolist()
+                    print('Fold F1-score: ', testf1)
 
-        print('Vectorising Data...')
-        time0 = startRec()
-        trainVectors, _ = self.vectorise.vectorise(self.trainData, 
-                                                    testData)
-        self.vectTime, self.vectSpace = stopRec(time0)
+        return counts
 
-        counts = {'Actual Counts' : [],
-                  'Estimated Counts' : []}
+    def collapseFold(self,
+                     trainIndex : np.ndarray,
+                     trainFlags : list,
+                     inverse : np.ndarray = None) -> tuple:
+        '''
+        Finds the unique training records of a cross-validation fold.
 
-        print('Cross-Validating...')
-        kf = KFold(n_splits= nFolds)
-        for i, (trainIndex, testIndex) in enumerate(kf.split(trainFlags)):
-            print(f'Running on Fold {i + 1}...')
+        Parameters
+        ----------
+        trainIndex : np.ndarray
+            The positions of the fold's training records among all training
+            records.
+        trainFlags : list
+            The flags of all training records.
+        inverse : np.ndarray
+            The row of the training vectors holding each training record, from
+            ib.collapseDuplicates(). None if duplicates weren't collapsed.
 
-            time0 = time.time()
-            
-            subTrainVectors = sparse.vstack([trainVectors.getrow(i) for i in trainIndex])
-            subTrainFlags = [trainFlags[i] for i in trainIndex]
-            subTestVectors = sparse.vstack([trainVectors.getrow(i) for i in testIndex])
-            subTestFlags = [trainFlags[i] for i in testIndex]
-
-            predictedTestFlags, _ = self.mlearn.trainAndPredict(subTrainVectors, 
-                                                            subTrainFlags, 
-                                                            subTestVectors)
-            
-            counts['Actual Counts'].append(sum(subTestFlags))
-            counts['Estimated Counts'].append(sum(predictedTestFlags))
+        Returns
+        -------
+        trainRows : np.ndarray
+            The rows of the training vectors to train the fold on.
+        uniqueFlags : list
+            The flag of each of those rows.
+        sampleWeight : np.ndarray | None
+            The number of the fold's training records each row stands for.
+            None if duplicates weren't collapsed.
+        expand : np.ndarray | None
+            The position in trainRows of each of the fold's training records.
+            None if duplicates weren't collapsed.
+        '''
+        if inverse is None:
+            return (trainIndex, [trainFlags[i] for i in trainIndex], None, None)
+        trainRows, first, expand = np.unique(inverse[trainIndex],
+                                             return_index= True,
+                                             return_inverse= True)
+        uniqueFlags = [trainFlags[trainIndex[i]] for i in first]
+        sampleWeight = np.bincount(expand, minlength= len(trainRows))
+        return (trainRows, uniqueFlags, sampleWeight, expand)
+
+    @contextmanager
+    def tracing(self,
+                name : str):
+        '''
+        Measures the stages run within it in this program's measureMode and, 
+        if traceFile is set, traces them within an outermost span, writing 
+        the trace to traceFile.json and traceFile.trace.json. The span is 
+        closed and the trace stopped even if a stage raises an exception.
 
-            testPrecision, testRecall = eb.precisionAndRecall(subTestFlags,
-                                                              predictedTestFlags)
-            
-            if testPrecision == 0 and testRecall == 0:
-                testf1 = 0
-            else:
-                testf1 = (2 * testPrecision * testRecall) / (testPrecision + testRecall)
+        Parameters
+        ----------
+        name : str
+            The name of the outermost span.
 
-            print('Fold F1-score: ', testf1)
+        Yields
+        ------
+        None
+        '''
+        ins.setMode(self.measureMode)
+        if self.traceFile != '':
+            ins.startTrace()
+        try:
+            with ins.span(name):
+                yield
+        finally:
+            if self.traceFile != '':
+                self.tracer = ins.stopTrace()
+        if self.traceFile != '':
+            self.tracer.writeJSON(self.traceFile + '.json')
+            self.tracer.writeChromeTrace(self.traceFile + '.trace.json')
 
-        return counts
-    
     def viewEvaluation(self):
         '''
         Prints the evaluation to the command line.
@@ -865,44 +1191,6 @@ class NLP:
 
         wb.save(file)
 
-def startRec() -> float:
-    '''
-    Outputs the current time and begins tracking memory.
-
-    Parameters
-    ----------
-    None
-
-    Retruns
-    -------
-    time0 : float
-        The current time.
-    '''
-    time0 = time.time()
-    tracemalloc.start()
-    return time0
-
-def stopRec(time0 : float) -> tuple[float, float]:
-    '''
-    Outputs time passed and peak memory used since the last call of startRec().
-
-    Parameters
-    ----------
-    time0 : float
-        The output from the last call of startRec().
-
-    Returns
-    -------
-    time1 : float
-        The time passed since the last call of startRec().
-    space : float
-        The peak memory used since the last call of startRec().
-    '''
-    time1 = time.time() - time0
-    _, space = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return (time1, space)
-
 cwd = os.getcwd()
 
 all_possible_params = [
@@ -925,12 +1213,32 @@ all_possible_params = [
     'trainDist',
     'testSize',
     'testDist',
+    'chunkSize',
+    'importWorkers',
+    'importCacheDir',
+    'compactDtypes',
+    'extractSeed',
+    'splitManifestDir',
     'tokeniser',
     'preLAChanges', 
     'tokenLevelLA', 
     'textLevelLA',
     'corpusLevelLA',
     'ngramRange',
+    'tagWorkers',
+    'memoSize',
+    'persistMemo',
+    'vectWorkers',
+    'poolType',
+    'hashFeatures',
+    'minDF',
+    'maxDF',
+    'maxFeatures',
+    'sketchWidth',
+    'vectCacheDir',
+    'vectCacheSize',
+    'featureDtype',
+    'indexDtype',
     'mlAlgType',
     'impurity',
     'ratio',
@@ -945,7 +1253,9 @@ all_possible_params = [
     'r',
     'C',
     'overSampleOps',
-    'underSampleOps'        
+    'underSampleOps',
+    'measureMode',
+    'collapseDuplicates'
 ]
 
 space_measures = [
@@ -48,6 +48,11 @@ Classes:
     MinSamplesException
     CArgException
     CrossValidateException
+    ChunkSizeException
+    WorkersException
+    MeasureException
+    SampleWeightException
+    DuplicatesException
 
 Functions:
 
@@ -331,4 +336,34 @@ class CrossValidateException(Exception):
     '''
     Raised when nFolds input to crossValidate function is invalid.
     '''
+    pass
+
+class ChunkSizeException(Exception):
+    '''
+    Raised when chunkSize input is invalid.
+    '''
+    pass
+
+class WorkersException(Exception):
+    '''
+    Raised when a number of workers input is invalid.
+    '''
+    pass
+
+class MeasureException(Exception):
+    '''
+    Raised when measureMode input is invalid.
+    '''
+    pass
+
+class SampleWeightException(Exception):
+    '''
+    Raised when sampleWeight input is invalid.
+    '''
+    pass
+
+class DuplicatesException(Exception):
+    '''
+    Raised when collapseDuplicates input is invalid.
+    '''
     pass
\ No newline at end of file
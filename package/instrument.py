@@ -0,0 +1,702 @@
+'''
+Measures the time and memory used by each stage of an NLP program. Used by
+package/base.py, package/Importer/importer.py and package/mlearn/mlearn.py.
+
+Classes:
+
+    Record
+    Span
+    Tracer
+
+Functions:
+
+    checkMode(str)
+    setMode(str)
+    getMode() -> str
+    startRec(str) -> Record
+    stopRec(Record, int) -> tuple[float, float]
+    currentRSS() -> int
+    peakRSS() -> int
+    startTrace() -> Tracer
+    stopTrace() -> Tracer | None
+    span(str, int, bool) -> Span
+
+Misc variables:
+
+    MEASURE_MODES : list
+        The ways stages can be measured. 'OFF' records nothing, 'TIME' records
+        wall and CPU time, 'RSS' also samples the resident set size of the
+        process and 'TRACEMALLOC' instead traces every Python allocation.
+    RSS_INTERVAL : float
+        The number of seconds between samples of the resident set size.
+    NULL_SPAN : Span
+        The span returned by span() when no trace is active.
+
+Exceptions:
+
+    MeasureException
+'''
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from . import exceptions as e
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MEASURE_MODES = ['OFF', 'TIME', 'RSS', 'TRACEMALLOC']
+RSS_INTERVAL = 0.01
+
+_mode = 'RSS'
+_tracer = None
+_traced = []
+_tracedLock = threading.Lock()
+_startedTracing = False
+
+class Record:
+    '''
+    A class to represent the measurement of one stage.
+
+    ...
+
+    Attributes
+    ----------
+    mode : str
+        The mode the stage is measured in.
+    wallTime : float
+        The wall time taken by the stage. Set by stopRec().
+    cpuTime : float
+        The CPU time used by the process during the stage. Set by stopRec().
+    space : float
+        The peak memory used by the stage, above the memory in use when it 
+        started. Set by stopRec().
+    span : Span
+        The span of the stage in the active trace.
+
+    Methods
+    -------
+    sample()
+        Samples the resident set size until the stage is stopped.
+    '''
+
+    def __init__(self,
+                 mode : str,
+                 name : str = ''):
+        '''
+        Starts measuring a stage.
+
+        Parameters
+        ----------
+        mode : str
+            The mode to measure the stage in.
+        name : str
+            The name of the stage's span in the active trace.
+        '''
+        self.mode = mode
+        self.span = span(name).__enter__() if name != '' else NULL_SPAN
+        self.wallTime = 0.0
+        self.cpuTime = 0.0
+        self.space = 0
+        self._sampler = None
+        self._stopped = threading.Event()
+
+        if mode == 'RSS':
+            self._startRSS = currentRSS()
+            self._peakRSS = self._startRSS
+            if self._startRSS > 0:
+                self._sampler = threading.Thread(target= self.sample,
+                                                 daemon= True)
+                self._sampler.start()
+            else:
+                self._startRSS = peakRSS()
+        elif mode == 'TRACEMALLOC':
+            global _startedTracing
+            with _tracedLock:
+                if tracemalloc.is_tracing():
+                    self._startTraced, peak = tracemalloc.get_traced_memory()
+                    for outer in _traced:
+                        outer._peakTraced = max(outer._peakTraced, peak)
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.start()
+                    _startedTracing = True
+                    self._startTraced = 0
+                self._peakTraced = self._startTraced
+                _traced.append(self)
+
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def sample(self):
+        '''
+        Samples the resident set size until the stage is stopped.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        while not self._stopped.wait(RSS_INTERVAL):
+            self._peakRSS = max(self._peakRSS, currentRSS())
+
+class Span:
+    '''
+    A class to represent a timed span of work within a trace. Used as a context
+    manager, which closes the span on exit.
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        The name of the span.
+    tracer : Tracer | None
+        The trace the span belongs to. None for a span which records nothing.
+    id : int
+        The identifier of the span within its trace.
+    parent : Span | None
+        The span which was open when this span was opened.
+    thread : int
+        The identifier of the thread which opened the span.
+    start : float
+        The time the span was opened, in seconds since the trace started.
+    duration : float
+        The total time the span was open, in seconds.
+    records : int | None
+        The number of records processed within the span.
+    calls : int
+        The number of times the span was opened. Greater than 1 only for
+        aggregate spans.
+    aggregate : bool
+        Whether repeated spans with this name and parent are summed into one.
+
+    Methods
+    -------
+    throughput() -> float | None
+        Returns the number of records processed per second.
+    toDict() -> dict
+        Describes the span as a dictionary.
+    '''
+
+    def __init__(self,
+                 name : str,
+                 tracer = None,
+                 records : int = None,
+                 aggregate : bool = False):
+        '''
+        Constructs attributes for the Span object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        tracer : Tracer | None
+            The trace the span belongs to.
+        records : int
+            The number of records processed within the span.
+        aggregate : bool
+            Whether repeated spans with this name and parent are summed into 
+            one.
+        '''
+        self.name = name
+        self.tracer = tracer
+        self.id = 0
+        self.parent = None
+        self.thread = 0
+        self.start = 0.0
+        self.duration = 0.0
+        self.records = records
+        self.calls = 0
+        self.aggregate = aggregate
+
+    def __enter__(self):
+        if self.tracer is not None:
+            self.tracer.open(self)
+        return self
+
+    def __exit__(self, *exc):
+        if self.tracer is not None:
+            self.tracer.close(self)
+        return False
+
+    def throughput(self) -> float | None:
+        '''
+        Returns the number of records processed per second.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        rate : float | None
+            The records processed per second, or None if the number of records
+            is unknown.
+        '''
+        if self.records is None or self.duration <= 0:
+            return None
+        rate = self.records / self.duration
+        return rate
+
+    def toDict(self) -> dict:
+        '''
+        Describes the span as a dictionary.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        description : dict
+            The name, timing, record count and throughput of the span.
+        '''
+        description = dict(id = self.id,
+                           parent = None if self.parent is None else self.parent.id,
+                           name = self.name,
+                           thread = self.thread,
+                           start = self.start,
+                           duration = self.duration,
+                           records = self.records,
+                           throughput = self.throughput(),
+                           calls = self.calls)
+        return description
+
+NULL_SPAN = Span('')
+
+class Tracer:
+    '''
+    A class to represent a trace of nested spans.
+
+    ...
+
+    Attributes
+    ----------
+    spans : list
+        The closed spans, and every aggregate span, in the order they were 
+        opened.
+    origin : float
+        The perf_counter() time the trace started.
+    rootThread : int
+        The identifier of the thread which started the trace. Spans opened on
+        other threads with no open span are nested under this thread's 
+        innermost open span.
+
+    Methods
+    -------
+    open(Span)
+        Opens a span, nesting it under the innermost open span.
+    close(Span)
+        Closes a span.
+    toTree() -> list
+        Describes the spans as a list of nested dictionaries.
+    writeJSON(str) -> str
+        Writes the spans to a JSON file.
+    writeChromeTrace(str) -> str
+        Writes the spans to a Chrome trace-event file.
+    '''
+
+    def __init__(self):
+        '''
+        Constructs attributes for the Tracer object.
+        '''
+        self.spans = []
+        self.origin = time.perf_counter()
+        self.rootThread = threading.get_ident()
+        self._stacks = {}
+        self._aggregates = {}
+        self._lock = threading.Lock()
+        self._nextId = 1
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state : dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def open(self,
+             span : Span):
+        '''
+        Opens a span, nesting it under the innermost open span.
+
+        Parameters
+        ----------
+        span : Span
+            The span to open.
+
+        Returns
+        -------
+        None
+        '''
+        thread = threading.get_ident()
+        with self._lock:
+            stack = self._stacks.setdefault(thread, [])
+            parent = stack[-1] if stack != [] else None
+            if parent is None and thread != self.rootThread:
+                rootStack = self._stacks.get(self.rootThread, [])
+                parent = rootStack[-1] if rootStack != [] else None
+            span.parent = parent
+            span.thread = thread
+            span._opened = time.perf_counter()
+            if span.aggregate:
+                key = (None if parent is None else parent.id, span.name, thread)
+                total = self._aggregates.get(key)
+                if total is None:
+                    total = Span(span.name, None, None, True)
+                    total.id = self._nextId
+                    total.parent = parent
+                    total.thread = thread
+                    total.start = span._opened - self.origin
+                    self._nextId += 1
+                    self._aggregates[key] = total
+                    self.spans.append(total)
+                span._total = total
+            else:
+                span.id = self._nextId
+                span.start = span._opened - self.origin
+                self._nextId += 1
+            stack.append(span)
+
+    def close(self,
+              span : Span):
+        '''
+        Closes a span.
+
+        Parameters
+        ----------
+        span : Span
+            The span to close.
+
+        Returns
+        -------
+        None
+        '''
+        duration = time.perf_counter() - span._opened
+        with self._lock:
+            stack = self._stacks[threading.get_ident()]
+            stack.remove(span)
+            if span.aggregate:
+                total = span._total
+                total.duration += duration
+                total.calls += 1
+                if span.records is not None:
+                    total.records = (total.records or 0) + span.records
+            else:
+                span.duration = duration
+                span.calls = 1
+                self.spans.append(span)
+
+    def toTree(self) -> list:
+        '''
+        Describes the spans as a list of nested dictionaries.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        roots : list
+            Dictionaries of the spans with no parent, each holding the 
+            dictionaries of its child spans under "children".
+        '''
+        described = {}
+        for span in sorted(self.spans, key= lambda span : span.start):
+            described[id(span)] = dict(span.toDict(), children= [])
+        roots = []
+        for span in sorted(self.spans, key= lambda span : span.start):
+            if span.parent is not None and id(span.parent) in described:
+                described[id(span.parent)]['children'].append(described[id(span)])
+            else:
+                roots.append(described[id(span)])
+        return roots
+
+    def writeJSON(self,
+                  path : str) -> str:
+        '''
+        Writes the spans to a JSON file as a tree.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write.
+
+        Returns
+        -------
+        path : str
+            The path of the file written.
+        '''
+        with open(path, 'w') as file:
+            json.dump({'spans' : self.toTree()}, file, indent= 1)
+        return path
+
+    def writeChromeTrace(self,
+                         path : str) -> str:
+        '''
+        Writes the spans to a Chrome trace-event file, which can be opened with
+        chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write.
+
+        Returns
+        -------
+        path : str
+            The path of the file written.
+        '''
+        events = []
+        for span in self.spans:
+            args = dict(records = span.records,
+                        throughput = span.throughput())
+            if span.aggregate:
+                args['calls'] = span.calls
+            events.append(dict(name = span.name,
+                               ph = 'X',
+                               ts = span.start * 1e6,
+                               dur = span.duration * 1e6,
+                               pid = os.getpid(),
+                               tid = span.thread,
+                               args = args))
+        with open(path, 'w') as file:
+            json.dump({'traceEvents' : events, 
+                       'displayTimeUnit' : 'ms'}, file)
+        return path
+
+def checkMode(mode : str):
+    '''
+    Checks that a mode is one of MEASURE_MODES.
+
+    Parameters
+    ----------
+    mode : str
+        The mode to check.
+
+    Returns
+    -------
+    None
+    '''
+    if mode not in MEASURE_MODES:
+        raise e.MeasureException(
+            'Measure mode must be "OFF", "TIME", "RSS" or "TRACEMALLOC".'
+        )
+
+def setMode(mode : str):
+    '''
+    Chooses how subsequent stages are measured.
+
+    Parameters
+    ----------
+    mode : str
+        One of MEASURE_MODES.
+
+    Returns
+    -------
+    None
+    '''
+    global _mode
+    checkMode(mode)
+    _mode = mode
+
+def getMode() -> str:
+    '''
+    Returns how stages are currently measured.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    mode : str
+        One of MEASURE_MODES.
+    '''
+    mode = _mode
+    return mode
+
+def startRec(name : str = '') -> Record:
+    '''
+    Starts measuring a stage in the current mode.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage's span in the active trace. '' opens no span.
+
+    Returns
+    -------
+    record : Record
+        The measurement of the stage.
+    '''
+    record = Record(_mode, name)
+    return record
+
+def stopRec(record : Record,
+            records : int = None) -> tuple[float, float]:
+    '''
+    Stops measuring a stage and outputs the time and peak memory it used.
+
+    Parameters
+    ----------
+    record : Record
+        The output from the call of startRec() which started the stage.
+    records : int
+        The number of records the stage processed, noted on its span.
+
+    Returns
+    -------
+    time1 : float
+        The wall time taken by the stage. 0.0 in 'OFF' mode.
+    space : float
+        The peak memory used by the stage in bytes, above the memory in use 
+        when it started. 0 in 'OFF' and 'TIME' modes.
+    '''
+    if record.mode != 'OFF':
+        record.wallTime = time.perf_counter() - record._wall0
+        record.cpuTime = time.process_time() - record._cpu0
+
+    if record.mode == 'RSS':
+        if record._sampler is not None:
+            record._stopped.set()
+            record._sampler.join()
+            record._peakRSS = max(record._peakRSS, currentRSS())
+            record.space = max(record._peakRSS - record._startRSS, 0)
+        else:
+            record.space = max(peakRSS() - record._startRSS, 0)
+    elif record.mode == 'TRACEMALLOC':
+        global _startedTracing
+        with _tracedLock:
+            _, peak = tracemalloc.get_traced_memory()
+            _traced.remove(record)
+            for traced in _traced + [record]:
+                traced._peakTraced = max(traced._peakTraced, peak)
+            record.space = max(record._peakTraced - record._startTraced, 0)
+            if _traced == [] and _startedTracing:
+                tracemalloc.stop()
+                _startedTracing = False
+
+    if records is not None and record.span is not NULL_SPAN:
+        record.span.records = records
+    record.span.__exit__(None, None, None)
+
+    time1 = record.wallTime
+    space = record.space
+    return (time1, space)
+
+def currentRSS() -> int:
+    '''
+    Reads the current resident set size of the process from /proc.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    rss : int
+        The resident set size in bytes, or 0 if it cannot be read.
+    '''
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    rss = pages * os.sysconf('SC_PAGE_SIZE')
+    return rss
+
+def peakRSS() -> int:
+    '''
+    Reads the peak resident set size of the process so far.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    rss : int
+        The peak resident set size in bytes, or 0 if it cannot be read.
+    '''
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return rss
+
+def startTrace() -> Tracer:
+    '''
+    Starts a trace, replacing any active trace. Spans opened afterwards are
+    recorded in it.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    tracer : Tracer
+        The new trace.
+    '''
+    global _tracer
+    tracer = Tracer()
+    _tracer = tracer
+    return tracer
+
+def stopTrace() -> Tracer | None:
+    '''
+    Stops the active trace.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    tracer : Tracer | None
+        The stopped trace, or None if no trace was active.
+    '''
+    global _tracer
+    tracer = _tracer
+    _tracer = None
+    return tracer
+
+def span(name : str,
+         records : int = None,
+         aggregate : bool = False) -> Span:
+    '''
+    Creates a span in the active trace, to be used as a context manager. When
+    no trace is active a shared span which records nothing is returned.
+
+    Parameters
+    ----------
+    name : str
+        The name of the span.
+    records : int
+        The number of records processed within the span. Can also be set on
+        the span before it closes.
+    aggregate : bool
+        Whether repeated spans with this name and parent are summed into one,
+        for work done once per record.
+
+    Returns
+    -------
+    newSpan : Span
+        The span.
+    '''
+    if _tracer is None:
+        return NULL_SPAN
+    newSpan = Span(name, _tracer, records, aggregate)
+    return newSpan
@@ -7,8 +7,7 @@ Classes:
 
 Functions:
 
-    startRec() -> float
-    stopRec -> (float, float)
+    None
 
 Misc variables:
 
@@ -35,6 +34,7 @@ Exceptions:
     EmptyFlagsVectorsException
     TrainVectorsFlagsNotEqualException
     VectorsNotEqualException
+    SampleWeightException
 '''
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.svm import SVC
@@ -44,9 +44,9 @@ from imblearn.under_sampling import TomekLinks, ClusterCentroids, NeighbourhoodC
 from scipy import sparse
 from typing import Union
 import copy
-import time
-import tracemalloc
+import numpy as np
 from .. import exceptions as e
+from .. import instrument as ins
 
 class MLearn:
     '''
@@ -84,6 +84,9 @@ class MLearn:
         Vectorised testing records.
     testFlags : list
         Classification flags associated with testing vectors.
+    sampleWeight : np.ndarray | None
+        The weight of each training vector, such as the number of duplicate 
+        records it stands for. None weights every vector equally.
     sampledTrainVectors : sparse.csr_matrix
         Over/under-sampled training vectors.
     sampledTrainFlags : list
@@ -107,7 +110,7 @@ class MLearn:
         Applies over-sampling to training vectors.
     underSample(sparse.csr_matrix, list) -> (sparse.csr_matrix, list)
         Applies under-sampling to training vectors.
-    trainAndPredict(sparse.csr_matrix, list, sparse.csr_matrix) -> 
+    trainAndPredict(sparse.csr_matrix, list, sparse.csr_matrix, np.ndarray) -> 
         tuple[list, Union[DecisionTreeClassifier,
                           BalancedRandomForestClassifier,
                           RUSBoostClassifier,
@@ -702,7 +705,8 @@ class MLearn:
     def trainAndPredict(self, 
                         trainVectors : sparse.csr_matrix, 
                         trainFlags : list, 
-                        testVectors : sparse.csr_matrix) -> tuple[list, Union[DecisionTreeClassifier, 
+                        testVectors : sparse.csr_matrix,
+                        sampleWeight : np.ndarray = None) -> tuple[list, Union[DecisionTreeClassifier, 
                                                                               BalancedRandomForestClassifier, 
                                                                               RUSBoostClassifier, 
                                                                               SVC]]:
@@ -717,6 +721,11 @@ class MLearn:
             The flags associated with the training data.
         testVectors : sparse.cst_matrix
             Vectorised testing records.
+        sampleWeight : np.ndarray
+            The weight of each training vector, such as the number of 
+            duplicate records it stands for. None weights every vector 
+            equally. If over or under-sampling is used, each vector is 
+            repeated by its weight before sampling instead.
 
         Returns
         -------
@@ -744,70 +753,57 @@ class MLearn:
                 'same length.'
             )
         
+        if sampleWeight is not None:
+            sampleWeight = np.asarray(sampleWeight)
+            if sampleWeight.shape != (len(trainFlags),):
+                raise e.SampleWeightException(
+                    'sampleWeight must have one weight for each training flag.'
+                )
+            if np.any(sampleWeight < 0):
+                raise e.SampleWeightException(
+                    'sampleWeight must not be negative.'
+                )
+        
         self.trainVectors = trainVectors
         self.trainFlags = trainFlags
         self.testVectors = testVectors
         self.testFlags = None
+        self.sampleWeight = sampleWeight
+
+        if sampleWeight is not None and (self.overSampleOps != {} 
+                                         or self.underSampleOps != {}):
+            rows = np.repeat(np.arange(len(trainFlags)), 
+                             sampleWeight.astype(np.intp))
+            trainVectors = trainVectors[rows]
+            trainFlags = [trainFlags[row] for row in rows]
+            sampleWeight = None
         
         if self.overSampleOps != {}:
             print('Over-Sampling...')
-            trainVectors, trainFlags = self.overSample(trainVectors, trainFlags)
+            with ins.span('overSample', len(trainFlags)):
+                trainVectors, trainFlags = self.overSample(trainVectors, trainFlags)
             
         if self.underSampleOps != {}:
             print('Under-Sampling...')
-            trainVectors, trainFlags = self.underSample(trainVectors, trainFlags)
+            with ins.span('underSample', len(trainFlags)):
+                trainVectors, trainFlags = self.underSample(trainVectors, trainFlags)
 
         self.sampledTrainVectors = trainVectors
         self.sampledTrainFlags = trainFlags
 
         print('Training Machine Learning Algorithm...')
-        time0 = startRec()
-        self.trainedModel.fit(trainVectors, trainFlags)
-        self.trainingTime, self.trainingSpace = stopRec(time0)
+        record = ins.startRec('fit')
+        self.trainedModel.fit(trainVectors, trainFlags, 
+                              sample_weight= sampleWeight)
+        self.trainingTime, self.trainingSpace = ins.stopRec(record, 
+                                                            len(trainFlags))
 
         print('Predicting with Machine Learning Algorithm...')
-        time0 = startRec()
+        record = ins.startRec('predict')
         predictedFlags = self.trainedModel.predict(testVectors)
-        self.predictionTime, self.predictionSpace = stopRec(time0)
+        self.predictionTime, self.predictionSpace = ins.stopRec(record, 
+                                                                len(predictedFlags))
 
         self.predictedFlags = predictedFlags
 
-        return (predictedFlags, self.trainedModel)
-    
-def startRec() -> float:
-    '''
-    Outputs the current time and begins tracking memory.
-
-    Parameters
-    ----------
-    None
-
-    Retruns
-    -------
-    time0 : float
-        The current time.
-    '''
-    time0 = time.time()
-    tracemalloc.start()
-    return time0
-
-def stopRec(time0 : float) -> tuple[float, float]:
-    '''
-    Outputs time passed and peak memory used since the last call of startRec().
-
-    Parameters
-    ----------
-    time0 : float
-        The output from the last call of startRec().
-
-    Returns
-    -------
-    time1 : float
-        The time passed since the last call of startRec().
-    space : float
-        The peak memory used since the last call of startRec().
-    '''
-    time1 = time.time() - time0
-    _, space = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return (time1, space)
\ No newline at end of file
+        return (predictedFlags, self.trainedModel)
\ No newline at end of file
@@ -7,19 +7,52 @@ Classes:
 
 Functions:
 
+    getMatcher() -> KeywordMatcher
     keywordCheck(str) -> list
+    keywordBatch(list) -> np.ndarray
     asciiConversion(str) -> list
     wordCheck(list, str) -> bool
+    asciiPositions(list) -> tuple[np.ndarray, np.ndarray, np.ndarray]
+    asciiEncode(list) -> np.ndarray
+    asciiSparse(list) -> sparse.csr_matrix
+    blockToCSR(np.ndarray) -> sparse.csr_matrix
+    featureMatrix(sparse.spmatrix, str, str) -> sparse.csr_matrix
 
 Misc variables:
 
-    None
+    _matcher : KeywordMatcher | None
+        The matcher of KEYWORDS, compiled by the first call to getMatcher().
 
 Exceptions:
 
     None
 '''
 from . import constants as c
+from . import keywords as kw
+import numpy as np
+from scipy import sparse
+
+_matcher = None
+
+def getMatcher() -> kw.KeywordMatcher:
+    '''
+    Returns the matcher of KEYWORDS, compiling it the first time it is needed
+    in each process.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    matcher : KeywordMatcher
+        The compiled matcher.
+    '''
+    global _matcher
+    if _matcher is None:
+        _matcher = kw.KeywordMatcher(c.KEYWORDS)
+    matcher = _matcher
+    return matcher
 
 def keyWordCheck(text: str) -> list:
     '''
@@ -35,13 +68,32 @@ def keyWordCheck(text: str) -> list:
     check : list
         A list of 0s and 1s corresponding to whether keywords are present.
     '''
-    text = str(text).lower()
-    check = [int(wordCheck(words,text)) for words in c.KEYWORDS]
+    check = getMatcher().check(text)
     return check
 
+def keywordBatch(texts : list) -> np.ndarray:
+    '''
+    Produces an array detailing which keywords are present in each of a list
+    of texts, searching the whole list in one pass.
+
+    Parameters
+    ----------
+    texts : list
+        The texts to search for keywords in.
+
+    Returns
+    -------
+    checks : np.ndarray
+        An int8 array of 0s and 1s with a row for each text and a column for
+        each group of KEYWORDS.
+    '''
+    checks = getMatcher().checkBatch(texts)
+    return checks
+
 def asciiConversion(text : str) -> list:
     '''
-    Converts the text into a list of ascii codes for each character.
+    Converts the text into a list of ascii codes for each character, truncated
+    or padded with 0s to MAX_CHARS.
 
     Parameters
     ----------
@@ -53,10 +105,7 @@ def asciiConversion(text : str) -> list:
     codes : list
         The list of ascii codes associated with each character.
     '''
-    chars = list(str(text))
-    codes = [ord(char) for char in chars]
-    while len(codes) < c.MAX_CHARS:
-        codes.append(-1)
+    codes = asciiEncode([text])[0].tolist()
     return codes
 
 def wordCheck(listOfWords: list, 
@@ -79,4 +128,139 @@ def wordCheck(listOfWords: list,
     for word in listOfWords:
         if word not in string:
             return False
-    return True
\ No newline at end of file
+    return True
+
+def asciiPositions(texts : list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Finds the code, row and column of the first MAX_CHARS characters of each 
+    of a list of texts. The texts are encoded together as one UTF-32 buffer,
+    which is viewed as an array of codes without copying.
+
+    Parameters
+    ----------
+    texts : list
+        The texts to be converted.
+
+    Returns
+    -------
+    codes : np.ndarray
+        The int16 code of each character, with codes beyond the range of int16
+        clipped to its maximum.
+    rows : np.ndarray
+        The position in texts of each character's text.
+    columns : np.ndarray
+        The position of each character in its text.
+    '''
+    texts = [str(text)[0:c.MAX_CHARS] for text in texts]
+    lengths = np.fromiter((len(text) for text in texts), 
+                          dtype= np.int64, 
+                          count= len(texts))
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype= '<u4')
+    codes = np.minimum(codes, np.iinfo(np.int16).max).astype(np.int16)
+    indexType = np.int32 if len(codes) < np.iinfo(np.int32).max else np.int64
+    rows = np.repeat(np.arange(len(texts), dtype= indexType), lengths)
+    starts = (np.cumsum(lengths) - lengths).astype(indexType)
+    columns = np.arange(len(codes), dtype= indexType)
+    columns -= np.repeat(starts, lengths)
+    return (codes, rows, columns)
+
+def asciiEncode(texts : list) -> np.ndarray:
+    '''
+    Converts a list of texts into a fixed width array of the ascii codes of 
+    each character, truncated or padded with 0s to MAX_CHARS.
+
+    Parameters
+    ----------
+    texts : list
+        The texts to be converted.
+
+    Returns
+    -------
+    codes : np.ndarray
+        An int16 array with a row of codes for each text.
+    '''
+    values, rows, columns = asciiPositions(texts)
+    codes = np.zeros((len(texts), c.MAX_CHARS), dtype= np.int16)
+    codes[rows, columns] = values
+    return codes
+
+def asciiSparse(texts : list) -> sparse.csr_matrix:
+    '''
+    Converts a list of texts into a CSR matrix of the ascii codes of each 
+    character, as asciiEncode() does but with the padding left implicit.
+
+    Parameters
+    ----------
+    texts : list
+        The texts to be converted.
+
+    Returns
+    -------
+    codes : sparse.csr_matrix
+        An int16 matrix with MAX_CHARS columns and a row for each text.
+    '''
+    values, rows, columns = asciiPositions(texts)
+    nonZero = values != 0
+    if not nonZero.all():
+        values, rows, columns = values[nonZero], rows[nonZero], columns[nonZero]
+    indptr = np.zeros(len(texts) + 1, dtype= np.int64)
+    np.cumsum(np.bincount(rows, minlength= len(texts)), out= indptr[1:])
+    codes = sparse.csr_matrix((values, columns, indptr),
+                              shape= (len(texts), c.MAX_CHARS))
+    return codes
+
+def blockToCSR(values : np.ndarray) -> sparse.csr_matrix:
+    '''
+    Converts a block of feature values with one row per record into a CSR 
+    matrix, using the block's buffer as the data array and a fixed column 
+    layout for the indices.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A 2-d array of the feature values of each record.
+
+    Returns
+    -------
+    matrix : sparse.csr_matrix
+        The values, with zeros removed.
+    '''
+    rows, columns = values.shape
+    indexType = np.int32 if rows * columns < np.iinfo(np.int32).max else np.int64
+    indices = np.tile(np.arange(columns, dtype= indexType), rows)
+    indptr = np.arange(rows + 1, dtype= indexType) * columns
+    matrix = sparse.csr_matrix((values.ravel(), indices, indptr),
+                               shape= (rows, columns))
+    matrix.eliminate_zeros()
+    return matrix
+
+def featureMatrix(matrix : sparse.spmatrix,
+                  valueDtype : str,
+                  indexDtype : str) -> sparse.csr_matrix:
+    '''
+    Converts vectors to the format they are passed on in, so that no further
+    conversions are needed before fitting or predicting. The matrix given is
+    left unchanged.
+
+    Parameters
+    ----------
+    matrix : sparse.spmatrix
+        The vectors.
+    valueDtype : str
+        The dtype of the values, one of FEATURE_DTYPES.
+    indexDtype : str
+        The dtype of the indices, one of INDEX_DTYPES. int32 indices are 
+        widened to int64 if the matrix is too large for them.
+
+    Returns
+    -------
+    matrix : sparse.csr_matrix
+        The vectors as a CSR matrix with values and indices of those dtypes.
+    '''
+    matrix = sparse.csr_matrix(matrix).astype(valueDtype, copy= False)
+    if (indexDtype == 'int32' 
+        and max(matrix.nnz, *matrix.shape) > np.iinfo(np.int32).max):
+        indexDtype = 'int64'
+    matrix.indices = matrix.indices.astype(indexDtype, copy= False)
+    matrix.indptr = matrix.indptr.astype(indexDtype, copy= False)
+    return matrix
@@ -0,0 +1,215 @@
+'''
+Helper functions to cache blocks of vectorised records on disk, keyed by the
+records and the settings of each block, to support 
+package/vectorise/vectorise.py.
+
+Classes:
+
+    None
+
+Functions:
+
+    recordsFingerprint(list, list) -> str
+    cachePath(str, str, str, dict) -> str
+    entryFiles(str) -> list
+    readCache(str) -> tuple | None
+    writeCache(sparse.csr_matrix, sparse.csr_matrix, object, str) -> str
+    evictCache(str, int) -> list
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    None
+'''
+from . import constants as c
+import hashlib
+import json
+import os
+import pickle
+from scipy import sparse
+
+def recordsFingerprint(trainRecords : list,
+                       testRecords : list) -> str:
+    '''
+    Produces a key identifying some training and testing records.
+
+    Parameters
+    ----------
+    trainRecords : list
+        The training records.
+    testRecords : list
+        The testing records.
+
+    Returns
+    -------
+    fingerprint : str
+        A hex digest of the number of training and testing records and the 
+        contents of every record.
+    '''
+    digest = hashlib.sha256()
+    digest.update(json.dumps([len(trainRecords), 
+                              len(testRecords)]).encode('utf-8'))
+    for records in [trainRecords, testRecords]:
+        for start in range(0, len(records), c.VECT_CHUNK_SIZE):
+            digest.update(json.dumps(records[start: start + c.VECT_CHUNK_SIZE],
+                                     default= str).encode('utf-8'))
+    fingerprint = digest.hexdigest()
+    return fingerprint
+
+def cachePath(cacheDir : str,
+              fingerprint : str,
+              block : str,
+              config : dict) -> str:
+    '''
+    Produces the path, without extension, at which a block of the vectors of
+    some records is cached.
+
+    Parameters
+    ----------
+    cacheDir : str
+        The directory containing cached vectors.
+    fingerprint : str
+        The fingerprint of the records, from recordsFingerprint().
+    block : str
+        The name of the block.
+    config : dict
+        The settings which change the block.
+
+    Returns
+    -------
+    path : str
+        The path of the cache entry, without a file extension.
+    '''
+    key = json.dumps([c.VECT_CACHE_VERSION,
+                      fingerprint,
+                      block,
+                      sorted(config.items())],
+                     default= str)
+    path = os.path.join(cacheDir, 
+                        hashlib.sha256(key.encode('utf-8')).hexdigest()[0:32])
+    return path
+
+def entryFiles(path : str) -> list:
+    '''
+    Lists the files of a cache entry. The pickled vectoriser is written last,
+    so an entry is complete once it exists.
+
+    Parameters
+    ----------
+    path : str
+        The path of the cache entry, without a file extension.
+
+    Returns
+    -------
+    files : list
+        The paths of the training vectors, testing vectors and vectoriser.
+    '''
+    files = [path + '.train.npz', path + '.test.npz', path + '.pkl']
+    return files
+
+def readCache(path : str) -> tuple | None:
+    '''
+    Reads a cached block of vectors and its vectoriser if a complete entry 
+    exists, marking the entry as recently used.
+
+    Parameters
+    ----------
+    path : str
+        The path of the cache entry, without a file extension.
+
+    Returns
+    -------
+    cached : tuple | None
+        The blocks of the training and testing vectors and the fitted 
+        vectoriser, or None if nothing is cached at path.
+    '''
+    files = entryFiles(path)
+    if not all(os.path.exists(file) for file in files):
+        return None
+    trainVectors = sparse.load_npz(files[0]).tocsr()
+    testVectors = sparse.load_npz(files[1]).tocsr()
+    with open(files[2], 'rb') as file:
+        vectoriser = pickle.load(file)
+    for file in files:
+        os.utime(file)
+    return (trainVectors, testVectors, vectoriser)
+
+def writeCache(trainVectors : sparse.csr_matrix,
+               testVectors : sparse.csr_matrix,
+               vectoriser,
+               path : str) -> str:
+    '''
+    Writes a block of vectors and its fitted vectoriser to the cache. Each 
+    file is written under a temporary name and then renamed, so that readers
+    never see part of an entry.
+
+    Parameters
+    ----------
+    trainVectors : sparse.csr_matrix
+        The block of the training vectors.
+    testVectors : sparse.csr_matrix
+        The block of the testing vectors.
+    vectoriser : Union[CountVectorizer, TfidfVectorizer, HashingVectorizer,
+                       Pipeline] | None
+        The fitted bag of words vectoriser, or None for hand-crafted blocks.
+    path : str
+        The path of the cache entry, without a file extension.
+
+    Returns
+    -------
+    path : str
+        The path of the cache entry written.
+    '''
+    os.makedirs(os.path.dirname(path), exist_ok= True)
+    trainFile, testFile, vectoriserFile = entryFiles(path)
+    for vectors, vectorsFile in [(trainVectors, trainFile),
+                                 (testVectors, testFile)]:
+        with open(vectorsFile + '.tmp', 'wb') as file:
+            sparse.save_npz(file, sparse.csr_matrix(vectors), compressed= False)
+        os.replace(vectorsFile + '.tmp', vectorsFile)
+    with open(vectoriserFile + '.tmp', 'wb') as file:
+        pickle.dump(vectoriser, file, protocol= pickle.HIGHEST_PROTOCOL)
+    os.replace(vectoriserFile + '.tmp', vectoriserFile)
+    return path
+
+def evictCache(cacheDir : str,
+               maxSize : int) -> list:
+    '''
+    Removes the least recently used cache entries until the files of the
+    remaining entries take up at most maxSize bytes.
+
+    Parameters
+    ----------
+    cacheDir : str
+        The directory containing cached vectors.
+    maxSize : int
+        The most bytes the cache may take up.
+
+    Returns
+    -------
+    evicted : list
+        The paths, without file extensions, of the entries removed.
+    '''
+    entries = {}
+    for name in os.listdir(cacheDir):
+        key = name.split('.')[0]
+        if name not in [os.path.basename(file) for file in entryFiles(key)]:
+            continue
+        stat = os.stat(os.path.join(cacheDir, name))
+        size, used = entries.get(key, (0, 0))
+        entries[key] = (size + stat.st_size, max(used, stat.st_mtime_ns))
+    total = sum(size for size, _ in entries.values())
+    evicted = []
+    for key in sorted(entries, key= lambda key: entries[key][1]):
+        if total <= maxSize:
+            break
+        path = os.path.join(cacheDir, key)
+        for file in entryFiles(path):
+            if os.path.exists(file):
+                os.remove(file)
+        total -= entries[key][0]
+        evicted.append(path)
+    return evicted
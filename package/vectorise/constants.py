@@ -35,11 +35,53 @@ Misc variables:
         An NLTK stemmer.
     UNIVERSAL_TAGS : dict
         A dictionary indexing the possible POS tags.
+    BOW_TOKEN_PATTERN : re.Pattern
+        Matches the words used as bag of words features, as sklearn's default
+        token pattern does.
+    BOW_VECTORISERS : dict
+        The vectoriser used by each corpus level LA technique.
+    HASH_VECTORISERS : list
+        The vectorisers which hash n-grams rather than fitting a vocabulary.
+    HASH_FEATURES : int
+        The default number of features n-grams are hashed into.
+    SKETCH_DEPTH : int
+        The number of rows of the count-min sketch of n-gram document 
+        frequencies.
+    SKETCH_CHUNK_SIZE : int
+        The number of documents counted into the sketch at a time.
+    EMPTY_VOCABULARY : str
+        The message raised when no n-grams are left in the bag of words 
+        vocabulary.
+    TAG_CHUNK_SIZE : int
+        The number of texts in each chunk POS tagged by a worker process.
+    MEMO_SIZE : int
+        The default number of tokens held by each memo of stems and stopword 
+        checks.
+    POOL_TYPES : list
+        A list of the types of worker pool available for parallel 
+        vectorising.
+    VECT_CHUNK_SIZE : int
+        The most records in each chunk vectorised by a worker.
+    VECT_CACHE_SIZE : int
+        The default most bytes taken up by cached vectors.
+    VECT_CACHE_VERSION : int
+        Part of the key of cached vectors, to be increased whenever a change
+        to the package changes the vectors produced.
+    CORPUS_BLOCK : str
+        The name of the block of the corpus level features in the cache.
+    FEATURE_DTYPES : list
+        A list of the dtypes available for the values of vectors.
+    INDEX_DTYPES : list
+        A list of the dtypes available for the indices of vectors.
+    ITER_BATCH_SIZE : int
+        The default most records in each batch vectorised by 
+        Vectorise.vectoriseIter().
 
 Exceptions:
 
     None
 '''
+import re
 from nltk.corpus import stopwords
 from nltk.stem.snowball import SnowballStemmer
 
@@ -54,7 +96,9 @@ CORPUS_LEVEL = ['',
                 'BAG_OF_WORDS_C', 
                 'MOD_BAG_OF_WORDS_C', 
                 'BAG_OF_WORDS_F', 
-                'MOD_BAG_OF_WORDS_F']
+                'MOD_BAG_OF_WORDS_F',
+                'HASHING_C',
+                'HASHING_F']
 
 MAX_CHARS = 1571
 MAX_TOKENS = 225
@@ -97,4 +141,27 @@ UNIVERSAL_TAGS = dict(CC = 0,
                       VBZ = 27,
                       WDT = 28,
                       WP = 29,
-                      WRB = 30)
\ No newline at end of file
+                      WRB = 30)
+BOW_TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+BOW_VECTORISERS = {'BAG_OF_WORDS_C' : 'COUNT',
+                   'MOD_BAG_OF_WORDS_C' : 'COUNT',
+                   'BAG_OF_WORDS_F' : 'FREQ',
+                   'MOD_BAG_OF_WORDS_F' : 'FREQ',
+                   'HASHING_C' : 'HASH_COUNT',
+                   'HASHING_F' : 'HASH_FREQ'}
+HASH_VECTORISERS = ['HASH_COUNT', 'HASH_FREQ']
+HASH_FEATURES = 2 ** 20
+SKETCH_DEPTH = 4
+SKETCH_CHUNK_SIZE = 10000
+EMPTY_VOCABULARY = ('No n-grams are left in the bag of words vocabulary. '
+                    'Try a lower minDF or a higher maxDF.')
+TAG_CHUNK_SIZE = 2000
+MEMO_SIZE = 100000
+POOL_TYPES = ['PROCESS', 'THREAD']
+VECT_CHUNK_SIZE = 2000
+VECT_CACHE_SIZE = 2 * 1024 ** 3
+VECT_CACHE_VERSION = 3
+CORPUS_BLOCK = 'CORPUS_LEVEL'
+FEATURE_DTYPES = ['float32', 'float64']
+INDEX_DTYPES = ['int32', 'int64']
+ITER_BATCH_SIZE = 10000
\ No newline at end of file
@@ -0,0 +1,275 @@
+'''
+A compiled multi-pattern keyword matcher, to support
+package/vectorise/base.py.
+
+Classes:
+
+    KeywordMatcher
+
+Functions:
+
+    triePattern(list) -> str
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    None
+'''
+import re
+import numpy as np
+
+def triePattern(terms : list) -> str:
+    '''
+    Produces a regular expression matching the longest of some terms, with
+    common prefixes factored out so that the regex engine follows one branch
+    per character rather than trying every term.
+
+    Parameters
+    ----------
+    terms : list
+        The non-empty terms to match.
+
+    Returns
+    -------
+    pattern : str
+        The regular expression.
+    '''
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def nodePattern(node : dict) -> str:
+        branches = [re.escape(char) + nodePattern(child)
+                    for char, child in node.items() if char != '']
+        if branches == []:
+            return ''
+        pattern = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            pattern += '?'
+        return pattern
+
+    pattern = nodePattern(trie)
+    return pattern
+
+class KeywordMatcher:
+    '''
+    A class to find which groups of keywords are present in texts. Every
+    keyword is found in one pass over each text and the groups, which need
+    all of their keywords to be present, are resolved with bitmasks.
+
+    ...
+
+    Attributes
+    ----------
+    groups : list
+        The lists of keywords whose presence is checked.
+    terms : list
+        The distinct keywords of all groups. Keyword i is bit i of a mask.
+    pattern : re.Pattern | None
+        A lookahead of the keywords, factored into a trie, which matches the 
+        longest keyword at every position a keyword starts. None if there are
+        no non-empty keywords.
+    prefixMasks : dict
+        The mask of the keywords each keyword starts with, including itself.
+    groupMasks : list
+        The mask of the keywords of each group.
+    termGroups : list
+        The positions of the groups containing each keyword.
+    alwaysGroups : list
+        The positions of the groups without keywords, which are present in 
+        every text.
+    emptyMask : int
+        The mask of empty keywords, which are present in every text.
+
+    Methods
+    -------
+    termMask(str) -> int
+        Finds the mask of the keywords present in a lowercase text.
+    presentGroups(int) -> list
+        Finds the groups whose keywords are all in a mask of keywords.
+    resolve(int) -> list
+        Converts a mask of keywords into a list of group checks.
+    check(str) -> list
+        Produces a list detailing which groups are present in a text.
+    checkBatch(list) -> np.ndarray
+        Produces an array detailing which groups are present in each text.
+    '''
+
+    def __init__(self,
+                 groups : list):
+        '''
+        Constructs attributes for the KeywordMatcher object.
+
+        Parameters
+        ----------
+        groups : list
+            The lists of keywords whose presence is checked. Keywords are
+            matched against lowercased text.
+        '''
+        self.groups = groups
+        self.terms = list(dict.fromkeys(term for group in groups
+                                        for term in group))
+        bits = {term : 1 << index for index, term in enumerate(self.terms)}
+        self.prefixMasks = {}
+        for term in self.terms:
+            mask = 0
+            for end in range(0, len(term) + 1):
+                mask |= bits.get(term[0:end], 0)
+            self.prefixMasks[term] = mask
+        self.groupMasks = []
+        self.termGroups = [[] for _ in self.terms]
+        self.alwaysGroups = []
+        for position, group in enumerate(groups):
+            mask = 0
+            for term in group:
+                mask |= bits[term]
+            self.groupMasks.append(mask)
+            for term in set(group):
+                self.termGroups[bits[term].bit_length() - 1].append(position)
+            if mask == 0:
+                self.alwaysGroups.append(position)
+        self.emptyMask = bits.get('', 0)
+        nonEmpty = [term for term in self.terms if term != '']
+        if nonEmpty == []:
+            self.pattern = None
+        else:
+            self.pattern = re.compile('(?=(' + triePattern(nonEmpty) + '))',
+                                      re.DOTALL)
+
+    def termMask(self,
+                 text : str) -> int:
+        '''
+        Finds the mask of the keywords present in a lowercase text. The
+        longest keyword starting at each position is matched, and every
+        keyword it starts with is present too.
+
+        Parameters
+        ----------
+        text : str
+            The lowercase text to search for keywords in.
+
+        Returns
+        -------
+        mask : int
+            The mask of the keywords present.
+        '''
+        mask = self.emptyMask
+        if self.pattern is not None:
+            for match in self.pattern.finditer(text):
+                mask |= self.prefixMasks[match.group(1)]
+        return mask
+
+    def presentGroups(self,
+                      mask : int) -> list:
+        '''
+        Finds the groups whose keywords are all in a mask of keywords. Only 
+        the groups containing one of the keywords present are checked.
+
+        Parameters
+        ----------
+        mask : int
+            The mask of the keywords present.
+
+        Returns
+        -------
+        present : list
+            The positions of the groups present.
+        '''
+        present = list(self.alwaysGroups)
+        remaining = mask
+        while remaining != 0:
+            bit = remaining & -remaining
+            remaining ^= bit
+            for group in self.termGroups[bit.bit_length() - 1]:
+                groupMask = self.groupMasks[group]
+                if mask & groupMask == groupMask:
+                    present.append(group)
+        return present
+
+    def resolve(self,
+                mask : int) -> list:
+        '''
+        Converts a mask of keywords into a list of group checks.
+
+        Parameters
+        ----------
+        mask : int
+            The mask of the keywords present.
+
+        Returns
+        -------
+        check : list
+            A list of 0s and 1s corresponding to whether all the keywords of
+            each group are present.
+        '''
+        check = [0] * len(self.groups)
+        for group in self.presentGroups(mask):
+            check[group] = 1
+        return check
+
+    def check(self,
+              text : str) -> list:
+        '''
+        Produces a list detailing which groups of keywords are present in a
+        text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search for keywords in.
+
+        Returns
+        -------
+        check : list
+            A list of 0s and 1s corresponding to whether groups are present.
+        '''
+        check = self.resolve(self.termMask(str(text).lower()))
+        return check
+
+    def checkBatch(self,
+                   texts : list) -> np.ndarray:
+        '''
+        Produces an array detailing which groups of keywords are present in
+        each of a list of texts. The lowercased texts are joined and searched
+        in one pass, and each match is assigned to its text by position.
+
+        Parameters
+        ----------
+        texts : list
+            The texts to search for keywords in.
+
+        Returns
+        -------
+        checks : np.ndarray
+            An int8 array of 0s and 1s with a row for each text and a column
+            for each group.
+        '''
+        texts = [str(text).lower() for text in texts]
+        masks = [self.emptyMask] * len(texts)
+        if (self.pattern is not None and texts != []
+            and not any('\x00' in term for term in self.terms)):
+            lengths = np.fromiter((len(text) + 1 for text in texts),
+                                  dtype= np.int64,
+                                  count= len(texts))
+            starts = np.cumsum(lengths) - lengths
+            matches = [(match.start(), match.group(1))
+                       for match in self.pattern.finditer('\x00'.join(texts))]
+            rows = np.searchsorted(starts,
+                                   [position for position, _ in matches],
+                                   side= 'right') - 1
+            for row, (_, term) in zip(rows.tolist(), matches):
+                masks[row] |= self.prefixMasks[term]
+        elif self.pattern is not None:
+            masks = [self.termMask(text) for text in texts]
+        checks = np.zeros((len(texts), len(self.groups)), dtype= np.int8)
+        checks[:, self.alwaysGroups] = 1
+        for row, mask in enumerate(masks):
+            if mask != 0:
+                checks[row, self.presentGroups(mask)] = 1
+        return checks
@@ -0,0 +1,225 @@
+'''
+A bounded memo of stems and stopword checks keyed on raw tokens, to support
+package/vectorise/vectorise.py.
+
+Classes:
+
+    TokenMemo
+
+Functions:
+
+    None
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    None
+'''
+from . import constants as c
+import threading
+
+class TokenMemo:
+    '''
+    A class to memoise the stem of each token and whether each token is a
+    stopword. Each memo holds at most maxSize tokens, evicting the oldest
+    entry when full, and counts its hits and misses.
+
+    ...
+
+    Attributes
+    ----------
+    maxSize : int
+        The most tokens held by each memo. 0 disables memoisation.
+    persist : bool
+        Whether the memoised tokens are kept when the object is pickled.
+    stems : dict
+        The stem of each memoised token.
+    stops : dict
+        Whether each memoised token is a stopword.
+    stemHits : int
+        The number of stems found in the memo.
+    stemMisses : int
+        The number of stems computed.
+    stopHits : int
+        The number of stopword checks found in the memo.
+    stopMisses : int
+        The number of stopword checks computed.
+    _lock : threading.Lock
+        Serialises additions to the memos between threads.
+
+    Methods
+    -------
+    stem(list) -> list
+        Stems a list of tokens.
+    removeStop(list) -> list
+        Removes stopwords from a list of tokens.
+    remember(dict, str, str | bool)
+        Adds a token to a memo, evicting the oldest token if the memo is full.
+    hitRates() -> dict
+        Reports the proportion of lookups found in each memo.
+    clear()
+        Empties the memos and resets their counts.
+    '''
+
+    def __init__(self,
+                 maxSize : int,
+                 persist : bool = False):
+        '''
+        Constructs attributes for the TokenMemo object.
+
+        Parameters
+        ----------
+        maxSize : int
+            The most tokens held by each memo. 0 disables memoisation.
+        persist : bool
+            Whether the memoised tokens are kept when the object is pickled,
+            so that an exported program starts with a warm memo.
+        '''
+        self.maxSize = maxSize
+        self.persist = persist
+        self._lock = threading.Lock()
+        self.clear()
+
+    def stem(self,
+             tokens : list) -> list:
+        '''
+        Stems a list of tokens, as nltkvectorise.stem does.
+
+        Parameters
+        ----------
+        tokens : list
+            The tokens to be stemmed.
+
+        Returns
+        -------
+        newTokens : list
+            The stemmed tokens.
+        '''
+        stems = self.stems
+        newTokens = []
+        for token in tokens:
+            stemmed = stems.get(token)
+            if stemmed is None:
+                stemmed = c.STEMMER.stem(token)
+                self.stemMisses += 1
+                self.remember(stems, token, stemmed)
+            else:
+                self.stemHits += 1
+            newTokens.append(stemmed)
+        return newTokens
+
+    def removeStop(self,
+                   tokens : list) -> list:
+        '''
+        Removes stopwords from a list of tokens, as nltkvectorise.removeStop
+        does.
+
+        Parameters
+        ----------
+        tokens : list
+            The list of tokens to remove the stopwords from.
+
+        Returns
+        -------
+        newTokens : list
+            The list of tokens with the stopwords removed.
+        '''
+        stops = self.stops
+        newTokens = []
+        for token in tokens:
+            isStop = stops.get(token)
+            if isStop is None:
+                isStop = token.lower() in c.STOPWORDS
+                self.stopMisses += 1
+                self.remember(stops, token, isStop)
+            else:
+                self.stopHits += 1
+            if not isStop:
+                newTokens.append(token)
+        return newTokens
+
+    def remember(self,
+                 memo : dict,
+                 token : str,
+                 value):
+        '''
+        Adds a token to a memo, evicting the oldest token if the memo is full.
+
+        Parameters
+        ----------
+        memo : dict
+            The memo to add to.
+        token : str
+            The token.
+        value : str | bool
+            The value memoised for the token.
+
+        Returns
+        -------
+        None
+        '''
+        if self.maxSize == 0:
+            return
+        with self._lock:
+            if len(memo) >= self.maxSize:
+                del memo[next(iter(memo))]
+            memo[token] = value
+
+    def hitRates(self) -> dict:
+        '''
+        Reports the proportion of lookups found in each memo.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        rates : dict
+            The hit rate, lookups and size of the stem and stopword memos. Hit
+            rates are 0 before any lookups.
+        '''
+        rates = {}
+        for name, hits, misses, memo in [
+            ('stem', self.stemHits, self.stemMisses, self.stems),
+            ('stopword', self.stopHits, self.stopMisses, self.stops)]:
+            lookups = hits + misses
+            rates[name] = {'hitRate' : hits / lookups if lookups > 0 else 0,
+                           'lookups' : lookups,
+                           'size' : len(memo)}
+        return rates
+
+    def clear(self):
+        '''
+        Empties the memos and resets their counts.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        '''
+        self.stems = {}
+        self.stops = {}
+        self.stemHits = 0
+        self.stemMisses = 0
+        self.stopHits = 0
+        self.stopMisses = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        if not self.persist:
+            state['stems'] = {}
+            state['stops'] = {}
+        return state
+
+    def __setstate__(self,
+                     state : dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
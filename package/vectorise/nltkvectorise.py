@@ -3,7 +3,7 @@ Helper functions using NLTK package to support package/vectorise/vectorise.py.
 
 Classes:
 
-    None
+    TokenAnalyser
 
 Functions:
 
@@ -12,7 +12,11 @@ Functions:
     tweetTokeniser(str) -> list
     stopwordRemoval(str) -> str
     stemming(str) -> str
+    getTagger() -> PerceptronTagger
     posTag(list) -> list
+    tagVector(list) -> list
+    posTagSents(list, int) -> list
+    tagChunk(list) -> list
     bagOfWordsC(list, list, tuple) -> 
         tuple[sparse.csr_matrix, sparse.csr_matrix, CountVectorizer]
     modBagOfWordsC(list, list, tuple) -> 
@@ -32,26 +36,56 @@ Functions:
               Union[CountVectorizer, 
                     TfidfVectorizer]]
     recordToCorpusText(list) -> str
+    corpusWeights(np.ndarray | None, int) -> np.ndarray | None
+    weightedVocabulary(list, function, np.ndarray, int | float, int | float,
+                       int | None) -> list
+    weightedIdf(TfidfTransformer, sparse.csr_matrix, np.ndarray | None) -> 
+        sparse.csr_matrix
+    bagOfTokens(list, list, str, tuple, int, int | float, int | float, 
+                int | None, int, np.ndarray | None) -> 
+        tuple[sparse.csr_matrix, 
+              sparse.csr_matrix, 
+              Union[CountVectorizer, 
+                    TfidfVectorizer,
+                    HashingVectorizer,
+                    Pipeline]]
+    hashingVectoriser(str, tuple, int) -> Union[HashingVectorizer, Pipeline]
+    hashedBagOfWords(sparse.csr_matrix, sparse.csr_matrix, str, tuple, int,
+                     np.ndarray | None) ->
+        tuple[sparse.csr_matrix, 
+              sparse.csr_matrix, 
+              Union[HashingVectorizer, Pipeline]]
 
 Misc variables:
 
-    None
+    _tagger : PerceptronTagger | None
+        The POS tagger of this process, loaded by the first call to 
+        getTagger().
 
 Exceptions:
 
-    None
+    CorpusLevelException
 '''
 from . import constants as vc
+from . import sketch as sk
+from .. import exceptions as e
 from nltk.tokenize import wordpunct_tokenize
 from nltk.tokenize import word_tokenize 
 from nltk.tokenize import TweetTokenizer
-from nltk.tag import pos_tag
+from nltk.tag import PerceptronTagger
+from concurrent.futures import ProcessPoolExecutor
 from nltk.tokenize import word_tokenize
 from scipy import sparse
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.pipeline import Pipeline
+import numpy as np
 from typing import Union
 
+_tagger = None
+
 def wordTokeniser(text : str) -> list:
     '''
     Tokenises a text using NLTK's word tokeniser.
@@ -140,6 +174,26 @@ def stemming(text : str) -> str:
     newText = reconstruct(tokens)
     return newText
 
+def getTagger() -> PerceptronTagger:
+    '''
+    Returns the POS tagger used by nltk.pos_tag, loading it the first time it
+    is needed in each process.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    tagger : PerceptronTagger
+        The POS tagger.
+    '''
+    global _tagger
+    if _tagger is None:
+        _tagger = PerceptronTagger()
+    tagger = _tagger
+    return tagger
+
 def posTag(tokens : list) -> list:
     '''
     Outputs a list of indices associated with the POS tags of each token.
@@ -154,12 +208,77 @@ def posTag(tokens : list) -> list:
     vector : list
         List of indices associated with the POS tags of each token.
     '''
-    tags = pos_tag(tokens)
+    vector = tagVector(getTagger().tag(tokens))
+    return vector
+
+def tagVector(tags : list) -> list:
+    '''
+    Converts the (token, POS tag) tuples of a text into a vector of POS tag
+    indices, padded to MAX_TOKENS.
+
+    Parameters
+    ----------
+    tags : list
+        The (token, POS tag) tuples of each token.
+
+    Returns
+    -------
+    vector : list
+        List of indices associated with the POS tags of each token.
+    '''
     vector = [tagToIndex(tag) for tag in tags]
     while len(vector) < vc.MAX_TOKENS:
         vector += [-2] 
     return vector
 
+def posTagSents(sentences : list,
+                workers : int = 1) -> list:
+    '''
+    Outputs the POS tag index vector of each of a list of texts, tagging them
+    in batches with one tagger per process as nltk.pos_tag_sents does.
+
+    Parameters
+    ----------
+    sentences : list
+        A list of the tokens of each text.
+    workers : int
+        The number of processes to tag with. If greater than 1, the texts are 
+        split into chunks which are tagged in parallel.
+
+    Returns
+    -------
+    vectors : list
+        The POS tag index vector of each text, in the order of sentences.
+    '''
+    if workers <= 1 or len(sentences) < vc.TAG_CHUNK_SIZE:
+        vectors = tagChunk(sentences)
+        return vectors
+    chunks = [sentences[i: i + vc.TAG_CHUNK_SIZE] 
+              for i in range(0, len(sentences), vc.TAG_CHUNK_SIZE)]
+    vectors = []
+    with ProcessPoolExecutor(max_workers= workers) as executor:
+        for chunkVectors in executor.map(tagChunk, chunks):
+            vectors += chunkVectors
+    return vectors
+
+def tagChunk(sentences : list) -> list:
+    '''
+    Outputs the POS tag index vector of each of a list of texts. Helper 
+    function for posTagSents.
+
+    Parameters
+    ----------
+    sentences : list
+        A list of the tokens of each text.
+
+    Returns
+    -------
+    vectors : list
+        The POS tag index vector of each text.
+    '''
+    vectors = [tagVector(tags) for tags in getTagger().tag_sents(sentences)]
+    return vectors
+
 def bagOfWordsC(trainRecords : list, 
                 testRecords : list,
                 ngramRange : tuple) -> tuple[sparse.csr_matrix, 
@@ -455,4 +574,364 @@ def recordToCorpusText(record : list) -> str:
     text = ''
     for field in record[0: len(record)]:
         text = text + str(field)
-    return text
\ No newline at end of file
+    return text
+
+class TokenAnalyser:
+    '''
+    A callable given to CountVectorizer and TfidfVectorizer as their analyzer,
+    so that bag of words features are built from the tokens produced for each
+    record rather than by tokenising its text again.
+
+    ...
+
+    Attributes
+    ----------
+    ngramRange : tuple
+        Lower and upper bound for n-gram sizes (inclusive).
+
+    Methods
+    -------
+    __call__(list) -> list
+        Produces the n-gram features of a record's tokens.
+    '''
+
+    def __init__(self,
+                 ngramRange : tuple):
+        '''
+        Constructs attributes for the TokenAnalyser object.
+
+        Parameters
+        ----------
+        ngramRange : tuple
+            Lower and upper bound for n-gram sizes (inclusive).
+        '''
+        self.ngramRange = ngramRange
+
+    def __call__(self,
+                 tokens : list) -> list:
+        '''
+        Produces the n-gram features of a record's tokens. Tokens are lowercased
+        and split into words as sklearn's default token pattern splits text.
+
+        Parameters
+        ----------
+        tokens : list
+            The tokens of a record.
+
+        Returns
+        -------
+        features : list
+            The n-grams of the record's words.
+        '''
+        words = [word 
+                 for token in tokens 
+                 for word in vc.BOW_TOKEN_PATTERN.findall(token.lower())]
+        lower, upper = self.ngramRange
+        features = []
+        for n in range(lower, upper + 1):
+            features += [' '.join(words[i: i + n]) 
+                         for i in range(0, len(words) - n + 1)]
+        return features
+
+def corpusWeights(sampleWeight : np.ndarray,
+                  nTest : int) -> np.ndarray:
+    '''
+    Gives the number of times each document of a corpus of training and 
+    testing records is counted, each testing record being counted once.
+
+    Parameters
+    ----------
+    sampleWeight : np.ndarray | None
+        The number of times each training record is counted.
+    nTest : int
+        The number of testing records.
+
+    Returns
+    -------
+    weights : np.ndarray | None
+        The number of times each document is counted, or None if sampleWeight
+        is None.
+    '''
+    if sampleWeight is None:
+        return None
+    weights = np.concatenate((np.asarray(sampleWeight, dtype= np.int64),
+                              np.ones(nTest, dtype= np.int64)))
+    return weights
+
+def weightedVocabulary(corpus : list,
+                       analyser,
+                       weights : np.ndarray,
+                       minDF : int | float = 1,
+                       maxDF : int | float = 1.0,
+                       maxFeatures : int = None) -> list:
+    '''
+    Chooses a bag of words vocabulary from exact frequencies, counting each 
+    document as many times as its weight, so that the vocabulary is the one 
+    CountVectorizer chooses when each document is repeated that many times.
+
+    Parameters
+    ----------
+    corpus : list
+        The tokens of each document.
+    analyser : function
+        Produces the n-grams of a document's tokens.
+    weights : np.ndarray
+        The number of times each document is counted.
+    minDF : int | float
+        The fewest documents, or proportion of documents if a float, an
+        n-gram must appear in.
+    maxDF : int | float
+        The most documents, or proportion of documents if a float, an n-gram
+        may appear in.
+    maxFeatures : int | None
+        The most n-grams in the vocabulary. None keeps every n-gram within the
+        thresholds.
+
+    Returns
+    -------
+    vocabulary : list
+        The chosen n-grams, sorted.
+    '''
+    counter = CountVectorizer(analyzer= analyser)
+    counts = counter.fit_transform(corpus)
+    docFrequency = (counts > 0).astype(np.int64).T @ weights
+    keep = ((docFrequency >= sk.docCount(minDF, weights.sum())) 
+            & (docFrequency <= sk.docCount(maxDF, weights.sum())))
+    if maxFeatures is not None and keep.sum() > maxFeatures:
+        termFrequency = counts.T @ weights
+        ranked = np.where(keep)[0][(-termFrequency[keep]).argsort()]
+        keep = np.zeros(len(keep), dtype= bool)
+        keep[ranked[0:maxFeatures]] = True
+    vocabulary = counter.get_feature_names_out()[keep].tolist()
+    return vocabulary
+
+def weightedIdf(transformer : TfidfTransformer,
+                counts : sparse.csr_matrix,
+                weights : np.ndarray = None) -> sparse.csr_matrix:
+    '''
+    Fits the inverse document frequencies of a TfidfTransformer to n-gram 
+    counts, counting each document as many times as its weight, and weights 
+    the counts with them.
+
+    Parameters
+    ----------
+    transformer : TfidfTransformer
+        The transformer to fit.
+    counts : sparse.csr_matrix
+        The n-gram counts of each document.
+    weights : np.ndarray | None
+        The number of times each document is counted. None counts each once.
+
+    Returns
+    -------
+    vectors : sparse.csr_matrix
+        The weighted counts.
+    '''
+    transformer.fit(counts)
+    if weights is not None:
+        docFrequency = (counts > 0).astype(np.int64).T @ weights
+        transformer.idf_ = np.log((1 + weights.sum()) / (1 + docFrequency)) + 1
+    vectors = transformer.transform(counts)
+    return vectors
+
+def bagOfTokens(trainTokens : list,
+                testTokens : list,
+                vect : str,
+                ngramRange : tuple,
+                hashFeatures : int = vc.HASH_FEATURES,
+                minDF : int | float = 1,
+                maxDF : int | float = 1.0,
+                maxFeatures : int = None,
+                sketchWidth : int = 0,
+                sampleWeight : np.ndarray = None) -> tuple[
+                    sparse.csr_matrix, 
+                    sparse.csr_matrix, 
+                    Union[CountVectorizer, 
+                          TfidfVectorizer,
+                          HashingVectorizer,
+                          Pipeline]]:
+    '''
+    Applies the bag of words pipeline to the tokens of a set of training and 
+    testing records. A CorpusLevelException is raised if no n-grams are left
+    in the vocabulary.
+
+    Parameters
+    ----------
+    trainTokens : list
+        A list of the tokens of each training record.
+    testTokens : list
+        A list of the tokens of each testing record.
+    vect : str
+        A choice of vectoriser, "COUNT", "FREQ", "HASH_COUNT" or "HASH_FREQ".
+    ngramRange : tuple
+        Lower and upper bound for n-gram sizes (inclusive).
+    hashFeatures : int
+        The number of features n-grams are hashed into by the hashing 
+        vectorisers.
+    minDF : int | float
+        The fewest records, or proportion of records if a float, an n-gram 
+        must appear in to be in the vocabulary.
+    maxDF : int | float
+        The most records, or proportion of records if a float, an n-gram may 
+        appear in to be in the vocabulary.
+    maxFeatures : int | None
+        The most n-grams in the vocabulary, keeping the most frequent. None 
+        doesn't limit the vocabulary.
+    sketchWidth : int
+        The width of a count-min sketch used to choose the vocabulary before
+        exact counting. 0 chooses it from exact counts. The vocabulary options
+        don't apply to the hashing vectorisers.
+    sampleWeight : np.ndarray | None
+        The number of times each training record is counted in the document
+        frequencies, for records standing for several identical ones. The 
+        vocabulary and inverse document frequencies are those of the corpus
+        with each record repeated. None counts each record once.
+
+    Returns
+    -------
+    trainVectors : sparse.csr_matrix
+        The training vectors.
+    testVectors : sparse.csr_matrix
+        The testing vectors.
+    vectoriser : Union[CountVectorizer, TfidfVectorizer, HashingVectorizer, 
+                       Pipeline]
+        Vectoriser to convert a list of tokens to a bag of words vector.
+    '''
+    corpus = trainTokens + testTokens
+    analyser = TokenAnalyser(ngramRange)
+    weights = corpusWeights(sampleWeight, len(testTokens))
+    if vect in vc.HASH_VECTORISERS:
+        vectoriser = hashingVectoriser(vect, ngramRange, hashFeatures)
+        if weights is not None and vect == 'HASH_FREQ':
+            counts = vectoriser.named_steps['hash'].transform(corpus)
+            vectorized_corpus = weightedIdf(vectoriser.named_steps['idf'], 
+                                            counts, 
+                                            weights)
+        else:
+            vectorized_corpus = vectoriser.fit_transform(corpus)
+    else:
+        try:
+            if sketchWidth > 0:
+                options = dict(vocabulary= sk.sketchVocabulary(corpus, 
+                                                               analyser, 
+                                                               sketchWidth,
+                                                               minDF,
+                                                               maxDF,
+                                                               maxFeatures,
+                                                               weights))
+            elif weights is not None:
+                options = dict(vocabulary= weightedVocabulary(corpus,
+                                                              analyser,
+                                                              weights,
+                                                              minDF,
+                                                              maxDF,
+                                                              maxFeatures))
+            else:
+                options = dict(min_df= minDF, 
+                               max_df= maxDF, 
+                               max_features= maxFeatures)
+            if vect == 'COUNT':
+                vectoriser = CountVectorizer(analyzer= analyser, **options)
+            if vect == 'FREQ':
+                vectoriser = TfidfVectorizer(analyzer= analyser, **options)
+            if weights is not None and vect == 'FREQ':
+                counts = CountVectorizer(analyzer= analyser, 
+                                         **options).fit_transform(corpus)
+                transformer = TfidfTransformer()
+                vectorized_corpus = weightedIdf(transformer, counts, weights)
+                vectoriser.idf_ = transformer.idf_
+            else:
+                vectorized_corpus = vectoriser.fit_transform(corpus)
+        except ValueError:
+            raise e.CorpusLevelException(vc.EMPTY_VOCABULARY)
+
+    trainVectors = vectorized_corpus[0:len(trainTokens),:]
+    testVectors = vectorized_corpus[len(trainTokens):len(corpus),:]
+
+    return (trainVectors, testVectors, vectoriser)
+
+def hashingVectoriser(vect : str,
+                      ngramRange : tuple,
+                      hashFeatures : int) -> Union[HashingVectorizer, Pipeline]:
+    '''
+    Creates a vectoriser which hashes the n-grams of a record's tokens into a
+    fixed number of features, so that no vocabulary is fitted or stored.
+
+    Parameters
+    ----------
+    vect : str
+        A choice of hashing vectoriser, either "HASH_COUNT" for n-gram counts 
+        or "HASH_FREQ" for counts weighted by inverse document frequency, as
+        TfidfVectorizer weights them.
+    ngramRange : tuple
+        Lower and upper bound for n-gram sizes (inclusive).
+    hashFeatures : int
+        The number of features n-grams are hashed into.
+
+    Returns
+    -------
+    vectoriser : Union[HashingVectorizer, Pipeline]
+        The HashingVectorizer, followed by a TfidfTransformer for 
+        "HASH_FREQ".
+    '''
+    hasher = HashingVectorizer(analyzer= TokenAnalyser(ngramRange),
+                               n_features= hashFeatures,
+                               alternate_sign= False,
+                               norm= None,
+                               dtype= np.int64 if vect == 'HASH_COUNT' 
+                                     else np.float64)
+    if vect == 'HASH_COUNT':
+        return hasher
+    vectoriser = Pipeline([('hash', hasher), ('idf', TfidfTransformer())])
+    return vectoriser
+
+def hashedBagOfWords(trainCounts : sparse.csr_matrix,
+                     testCounts : sparse.csr_matrix,
+                     vect : str,
+                     ngramRange : tuple,
+                     hashFeatures : int,
+                     sampleWeight : np.ndarray = None) -> tuple[
+                         sparse.csr_matrix, 
+                         sparse.csr_matrix, 
+                         Union[HashingVectorizer, Pipeline]]:
+    '''
+    Completes the bag of words pipeline for n-gram counts hashed separately,
+    for example in chunks by worker processes, fitting the inverse document 
+    frequencies of "HASH_FREQ" to all the counts.
+
+    Parameters
+    ----------
+    trainCounts : sparse.csr_matrix
+        The hashed n-gram counts of the training records.
+    testCounts : sparse.csr_matrix
+        The hashed n-gram counts of the testing records.
+    vect : str
+        A choice of hashing vectoriser, either "HASH_COUNT" or "HASH_FREQ".
+    ngramRange : tuple
+        Lower and upper bound for n-gram sizes (inclusive).
+    hashFeatures : int
+        The number of features n-grams are hashed into.
+    sampleWeight : np.ndarray | None
+        The number of times each training record is counted in the document
+        frequencies. None counts each record once.
+
+    Returns
+    -------
+    trainVectors : sparse.csr_matrix
+        The training vectors.
+    testVectors : sparse.csr_matrix
+        The testing vectors.
+    vectoriser : Union[HashingVectorizer, Pipeline]
+        Vectoriser to convert a list of tokens to a bag of words vector.
+    '''
+    vectoriser = hashingVectoriser(vect, ngramRange, hashFeatures)
+    if vect == 'HASH_COUNT':
+        return (trainCounts, testCounts, vectoriser)
+    counts = sparse.vstack((trainCounts, testCounts), format= 'csr')
+    vectorized_corpus = weightedIdf(vectoriser.named_steps['idf'],
+                                    counts,
+                                    corpusWeights(sampleWeight, 
+                                                  testCounts.shape[0]))
+    trainVectors = vectorized_corpus[0:trainCounts.shape[0],:]
+    testVectors = vectorized_corpus[trainCounts.shape[0]:,:]
+    return (trainVectors, testVectors, vectoriser)
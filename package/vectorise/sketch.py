@@ -0,0 +1,267 @@
+'''
+A count-min sketch of n-gram document frequencies, used to choose a bounded
+bag of words vocabulary before exact counting, to support
+package/vectorise/nltkvectorise.py.
+
+Classes:
+
+    CountMinSketch
+
+Functions:
+
+    docCount(int | float, int) -> float
+    chunked(list, int) -> generator
+    sketchVocabulary(list, function, int, int | float, int | float,
+                     int | None, np.ndarray | None) -> list
+
+Misc variables:
+
+    None
+
+Exceptions:
+
+    CorpusLevelException
+'''
+from . import constants as c
+from .. import exceptions as e
+from collections import Counter
+import numpy as np
+from sklearn.utils import murmurhash3_32
+
+class CountMinSketch:
+    '''
+    A class to estimate how many times keys were counted in fixed memory.
+    Each key is hashed to one counter in each of depth rows, and its estimate
+    is the smallest of those counters, which is never below its true count.
+
+    ...
+
+    Attributes
+    ----------
+    width : int
+        The number of counters in each row.
+    depth : int
+        The number of rows, each hashing keys with a different seed.
+    counts : np.ndarray
+        The counters.
+
+    Methods
+    -------
+    indices(list) -> np.ndarray
+        Finds the counter of each key in each row.
+    add(np.ndarray, list)
+        Adds amounts to the counts of keys.
+    estimate(np.ndarray) -> np.ndarray
+        Estimates the counts of keys.
+    '''
+
+    def __init__(self,
+                 width : int,
+                 depth : int = c.SKETCH_DEPTH):
+        '''
+        Constructs attributes for the CountMinSketch object.
+
+        Parameters
+        ----------
+        width : int
+            The number of counters in each row.
+        depth : int
+            The number of rows.
+        '''
+        self.width = width
+        self.depth = depth
+        self.counts = np.zeros((depth, width), dtype= np.int64)
+
+    def indices(self,
+                keys : list) -> np.ndarray:
+        '''
+        Finds the counter of each key in each row.
+
+        Parameters
+        ----------
+        keys : list
+            The string keys.
+
+        Returns
+        -------
+        indices : np.ndarray
+            An array with a row of counter positions for each row of counters.
+        '''
+        indices = np.array([[murmurhash3_32(key, seed= seed, positive= True)
+                             for key in keys]
+                            for seed in range(0, self.depth)],
+                           dtype= np.int64).reshape(self.depth, len(keys))
+        indices %= self.width
+        return indices
+
+    def add(self,
+            indices : np.ndarray,
+            amounts : list):
+        '''
+        Adds amounts to the counts of keys. Sketches of the same width and 
+        depth share the indices of keys.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            The counters of the keys, from indices().
+        amounts : list
+            The amount to add to the count of each key.
+
+        Returns
+        -------
+        None
+        '''
+        for row in range(0, self.depth):
+            np.add.at(self.counts[row], indices[row], amounts)
+
+    def estimate(self,
+                 indices : np.ndarray) -> np.ndarray:
+        '''
+        Estimates the counts of keys.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            The counters of the keys, from indices().
+
+        Returns
+        -------
+        estimates : np.ndarray
+            The smallest counter of each key.
+        '''
+        estimates = self.counts[np.arange(self.depth)[:, None], indices]
+        estimates = estimates.min(axis= 0, initial= np.iinfo(np.int64).max)
+        return estimates
+
+def docCount(threshold : int | float,
+             nDocs : int) -> float:
+    '''
+    Converts a document frequency threshold to a number of documents, as
+    CountVectorizer converts min_df and max_df.
+
+    Parameters
+    ----------
+    threshold : int | float
+        A number of documents, or a proportion of documents if a float.
+    nDocs : int
+        The number of documents.
+
+    Returns
+    -------
+    count : float
+        The threshold as a number of documents.
+    '''
+    count = threshold if isinstance(threshold, int) else threshold * nDocs
+    return count
+
+def chunked(items : list,
+            size : int):
+    '''
+    Splits a list into consecutive chunks.
+
+    Parameters
+    ----------
+    items : list
+        The list to split.
+    size : int
+        The most items in each chunk.
+
+    Yields
+    ------
+    chunk : list
+        The next size items.
+    '''
+    for start in range(0, len(items), size):
+        yield items[start: start + size]
+
+def sketchVocabulary(corpus : list,
+                     analyser,
+                     width : int,
+                     minDF : int | float = 1,
+                     maxDF : int | float = 1.0,
+                     maxFeatures : int = None,
+                     weights : np.ndarray = None) -> list:
+    '''
+    Chooses a bag of words vocabulary from sketched frequencies. A first 
+    streaming pass counts the documents containing each n-gram, and its total
+    occurrences, into count-min sketches. A second pass keeps the n-grams 
+    whose estimated document frequency is within the thresholds, pruning to 
+    the maxFeatures with the most occurrences as it goes, as CountVectorizer
+    does, so only the chosen vocabulary is ever held exactly. Estimates are 
+    never below the true frequencies, so n-grams at least as frequent as 
+    minDF are always kept, but some rarer ones may be too, and some n-grams
+    rarer than maxDF may be dropped. Each document is counted as many times
+    as its weight, as if it were repeated. A CorpusLevelException is raised
+    if no n-gram is chosen.
+
+    Parameters
+    ----------
+    corpus : list
+        The tokens of each document.
+    analyser : function
+        Produces the n-grams of a document's tokens.
+    width : int
+        The number of counters in each row of the sketch.
+    minDF : int | float
+        The fewest documents, or proportion of documents if a float, an
+        n-gram must appear in.
+    maxDF : int | float
+        The most documents, or proportion of documents if a float, an n-gram
+        may appear in.
+    maxFeatures : int | None
+        The most n-grams in the vocabulary. None keeps every n-gram within the
+        thresholds.
+    weights : np.ndarray | None
+        The number of times each document is counted. None counts each once.
+
+    Returns
+    -------
+    vocabulary : list
+        The chosen n-grams, sorted.
+    '''
+    if weights is None:
+        weights = np.ones(len(corpus), dtype= np.int64)
+    nDocs = int(weights.sum())
+    minCount = docCount(minDF, nDocs)
+    maxCount = docCount(maxDF, nDocs)
+    docSketch = CountMinSketch(width)
+    termSketch = CountMinSketch(width)
+    for chunk, chunkWeights in zip(chunked(corpus, c.SKETCH_CHUNK_SIZE),
+                                   chunked(weights.tolist(), 
+                                           c.SKETCH_CHUNK_SIZE)):
+        docFrequencies = Counter()
+        termFrequencies = Counter()
+        for tokens, weight in zip(chunk, chunkWeights):
+            for gram, count in Counter(analyser(tokens)).items():
+                termFrequencies[gram] += count * weight
+                docFrequencies[gram] += weight
+        grams = list(termFrequencies)
+        indices = docSketch.indices(grams)
+        docSketch.add(indices, [docFrequencies[gram] for gram in grams])
+        termSketch.add(indices, [termFrequencies[gram] for gram in grams])
+
+    def ranked(candidates : dict) -> list:
+        return sorted(candidates, key= lambda gram: (-candidates[gram], gram))
+
+    candidates = {}
+    for chunk in chunked(corpus, c.SKETCH_CHUNK_SIZE):
+        grams = list({gram for tokens in chunk
+                      for gram in analyser(tokens)}.difference(candidates))
+        indices = docSketch.indices(grams)
+        for gram, docEstimate, termEstimate in zip(
+            grams,
+            np.minimum(docSketch.estimate(indices), nDocs).tolist(),
+            termSketch.estimate(indices).tolist()):
+            if minCount <= docEstimate <= maxCount:
+                candidates[gram] = termEstimate
+        if maxFeatures is not None and len(candidates) > 2 * maxFeatures:
+            candidates = {gram : candidates[gram]
+                          for gram in ranked(candidates)[0:maxFeatures]}
+    vocabulary = ranked(candidates)
+    if maxFeatures is not None:
+        vocabulary = vocabulary[0:maxFeatures]
+    vocabulary = sorted(vocabulary)
+    if vocabulary == []:
+        raise e.CorpusLevelException(c.EMPTY_VOCABULARY)
+    return vocabulary
@@ -7,11 +7,13 @@ Classes:
 
 Functions:
 
-    None
+    initWorker(Vectorise)
+    workerChunk(tuple) -> tuple | sparse.csr_matrix
 
 Misc Variables:
 
-    None
+    _worker : Vectorise | None
+        The Vectorise object used by a worker process, set by initWorker().
 
 Exceptions:
 
@@ -22,13 +24,25 @@ Exceptions:
     TextLevelException
     CorpusLevelException
     NGramException
+    WorkersException
 '''
 from . import base as b
 from . import constants as c
 from . import nltkvectorise as n
+from . import memo as mm
+from . import cache as vca
+import numpy as np
 from scipy import sparse
 from scipy.sparse import hstack
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import copy
+import itertools
+import math
+import time
 from .. import exceptions as e
+from .. import instrument as ins
+
+_worker = None
 
 class Vectorise:
     '''
@@ -51,22 +65,109 @@ class Vectorise:
         The name of the corpus level LA technique to use.
     ngramRange : tuple
         Lower and upper bound for n-gram sizes (inclusive).
-    vectoriser : Union[CountVectorizer, TfidfVectorizer]
-        The bag-of-words vectoriser.
+    tagWorkers : int
+        The number of processes used to POS tag records.
+    memo : TokenMemo
+        The memo of stems and stopword checks shared by vectorise() and 
+        vectoriseList().
+    vectWorkers : int
+        The number of workers records are vectorised with.
+    poolType : str
+        The type of worker pool used when vectWorkers is greater than 1.
+    hashFeatures : int
+        The number of features n-grams are hashed into by the HASHING corpus
+        level techniques.
+    minDF : int | float
+        The fewest records, or proportion of records, an n-gram must appear 
+        in to be a bag of words feature.
+    maxDF : int | float
+        The most records, or proportion of records, an n-gram may appear in 
+        to be a bag of words feature.
+    maxFeatures : int | None
+        The most bag of words features.
+    sketchWidth : int
+        The width of the count-min sketch used to choose the bag of words 
+        vocabulary, or 0 if it is chosen from exact counts.
+    vectCacheDir : str
+        The directory vectors are cached in, or '' if they aren't cached.
+    vectCacheSize : int
+        The most bytes taken up by cached vectors.
+    featureDtype : str
+        The dtype of the values of the vectors produced.
+    indexDtype : str
+        The dtype of the indices of the vectors produced, where their size 
+        allows.
+    iterRecords : int
+        The number of records vectorised by the latest vectoriseIter() call.
+    iterBatches : int
+        The number of batches yielded by the latest vectoriseIter() call.
+    iterSeconds : float
+        The seconds spent vectorising batches in the latest vectoriseIter() 
+        call.
+    vectoriser : Union[CountVectorizer, TfidfVectorizer, HashingVectorizer, 
+                       Pipeline]
+        The bag-of-words vectoriser, which takes lists of tokens.
 
     Methods
     -------
-    initialise(str, list, list, list, str, tuple)
+    initialise(str, list, list, list, str, tuple, int, int, bool, int, str, 
+               int, int | float, int | float, int | None, int, str, int, str,
+               str)
         Checks constructor inputs and creates attributes.
-    buildVector(str) -> list
+    tokenise(str) -> list
+        Tokenises a text with the chosen tokeniser.
+    tokeniseRecord(list) -> list
+        Tokenises each field of a record once.
+    corpusTokens(list) -> list
+        Produces the tokens of a record given to the bag of words pipeline.
+    prepareText(str, list) -> tuple[str, list]
+        Applies the pre LA changes to a text and its tokens.
+    buildVector(str, list) -> list
         Creates a vector, of consistent length, representing some input text.
-    recordToVector(list) -> list
+    textVector(str, list, list) -> list
+        Creates the vector of a text the pre LA changes have been applied to.
+    recordToVector(list, list) -> list
         Creates a vector, of consistent length, representing some input record.
-    vectorise(list, list) -> tuple[sparse.csr_matrix, sparse.csr_matrix]
-        Vectorises the input training and testing data.
+    fieldBlocks() -> list
+        Gives the hand-crafted feature blocks of each field and their widths.
+    fieldWidth() -> int
+        Gives the number of hand-crafted features of each field.
+    blockColumns(int) -> dict
+        Finds the hand-crafted feature columns of each block.
+    recordsToVectors(list, list, int) -> sparse.csr_matrix
+        Creates the vectors of a list of records, POS tagging them in batches.
+    featureChunk(list, bool) -> tuple | sparse.csr_matrix
+        Vectorises a chunk of records in a worker.
+    parallelChunks(list, bool) -> list
+        Vectorises chunks of records across a pool of workers.
+    blockConfigs(np.ndarray | None) -> dict
+        Gives the settings which change each feature block.
+    splitBlocks(sparse.csr_matrix, int) -> dict
+        Splits vectors into their feature blocks.
+    joinBlocks(dict, int) -> sparse.csr_matrix
+        Assembles vectors from their feature blocks.
+    computeBlocks(list, list, list, np.ndarray | None) -> dict
+        Vectorises the input training and testing data with only some feature
+        blocks.
+    vectorise(list, list, np.ndarray | None) -> tuple[sparse.csr_matrix, 
+                                                      sparse.csr_matrix]
+        Vectorises the input training and testing data, reading any cached
+        feature blocks.
+    serialVectorise(list, list, np.ndarray | None) -> tuple[
+        sparse.csr_matrix, sparse.csr_matrix]
+        Vectorises the input training and testing data in this thread.
+    parallelVectorise(list, list, np.ndarray | None) -> tuple[
+        sparse.csr_matrix, sparse.csr_matrix]
+        Vectorises the input training and testing data across a pool of 
+        workers.
     vectoriseList(list) -> sparse.csr_matrix
         Converts a list of records into a list of vectors. Can only
         be used after the vectorise() method has been run.
+    vectoriseIter(iterable, int) -> generator
+        Converts records into vectors in batches of batchSize records. Can 
+        only be used after the vectorise() method has been run.
+    iterThroughput() -> dict
+        Reports the throughput of the latest vectoriseIter() call.
     '''
 
     def __init__(self,
@@ -76,7 +177,21 @@ class Vectorise:
                  tokenLevelLA : list = [], 
                  textLevelLA : list = [],
                  corpusLevelLA : str = '',
-                 ngramRange : tuple = (1, 1)):
+                 ngramRange : tuple = (1, 1),
+                 tagWorkers : int = 1,
+                 memoSize : int = c.MEMO_SIZE,
+                 persistMemo : bool = False,
+                 vectWorkers : int = 1,
+                 poolType : str = 'PROCESS',
+                 hashFeatures : int = c.HASH_FEATURES,
+                 minDF : int | float = 1,
+                 maxDF : int | float = 1.0,
+                 maxFeatures : int = None,
+                 sketchWidth : int = 0,
+                 vectCacheDir : str = '',
+                 vectCacheSize : int = c.VECT_CACHE_SIZE,
+                 featureDtype : str = 'float32',
+                 indexDtype : str = 'int32'):
         '''
         Passes inputs from either arg_dict or keyword arguments.
 
@@ -96,6 +211,50 @@ class Vectorise:
             The name of the corpus level LA technique to use.
         ngramRange : tuple
             Lower and upper bound for n-gram sizes (inclusive).
+        tagWorkers : int
+            The number of processes used to POS tag records.
+        memoSize : int
+            The most tokens held by each memo of stems and stopword checks. 0
+            disables memoisation.
+        persistMemo : bool
+            Whether the memo is kept when the object is pickled, so that an 
+            exported program starts with a warm memo.
+        vectWorkers : int
+            The number of workers records are vectorised with. 1 vectorises 
+            records in this thread.
+        poolType : str
+            The type of worker pool used when vectWorkers is greater than 1,
+            PROCESS or THREAD. THREAD suits free-threaded builds of Python.
+        hashFeatures : int
+            The number of features n-grams are hashed into by the HASHING 
+            corpus level techniques.
+        minDF : int | float
+            The fewest records, or proportion of records if a float, an n-gram
+            must appear in to be a bag of words feature.
+        maxDF : int | float
+            The most records, or proportion of records if a float, an n-gram 
+            may appear in to be a bag of words feature.
+        maxFeatures : int | None
+            The most bag of words features, keeping the most frequent n-grams.
+            None doesn't limit them.
+        sketchWidth : int
+            The width of a count-min sketch of n-gram document frequencies
+            used to choose the bag of words vocabulary before exact counting.
+            0 chooses it from exact counts.
+        vectCacheDir : str
+            A directory in which to cache the vectors of training and testing
+            records, with the fitted vectoriser, keyed by the records and the
+            settings which change them. '' disables caching.
+        vectCacheSize : int
+            The most bytes taken up by cached vectors. The least recently used
+            are removed first.
+        featureDtype : str
+            The dtype of the values of the vectors produced, float32 or 
+            float64. Vectors are always CSR matrices.
+        indexDtype : str
+            The dtype of the indices of the vectors produced, int32 or int64.
+            int32 indices are widened to int64 if the vectors are too large 
+            for them.
         '''
         if arg_dict is not None:
             if not isinstance(arg_dict, dict):
@@ -115,13 +274,55 @@ class Vectorise:
                 corpusLevelLA = arg_dict['corpusLevelLA']
             if 'ngramRange' in arg_dict:
                 ngramRange = arg_dict['ngramRange']
-                
+            if 'tagWorkers' in arg_dict:
+                tagWorkers = arg_dict['tagWorkers']
+            if 'memoSize' in arg_dict:
+                memoSize = arg_dict['memoSize']
+            if 'persistMemo' in arg_dict:
+                persistMemo = arg_dict['persistMemo']
+            if 'vectWorkers' in arg_dict:
+                vectWorkers = arg_dict['vectWorkers']
+            if 'poolType' in arg_dict:
+                poolType = arg_dict['poolType']
+            if 'hashFeatures' in arg_dict:
+                hashFeatures = arg_dict['hashFeatures']
+            if 'minDF' in arg_dict:
+                minDF = arg_dict['minDF']
+            if 'maxDF' in arg_dict:
+                maxDF = arg_dict['maxDF']
+            if 'maxFeatures' in arg_dict:
+                maxFeatures = arg_dict['maxFeatures']
+            if 'sketchWidth' in arg_dict:
+                sketchWidth = arg_dict['sketchWidth']
+            if 'vectCacheDir' in arg_dict:
+                vectCacheDir = arg_dict['vectCacheDir']
+            if 'vectCacheSize' in arg_dict:
+                vectCacheSize = arg_dict['vectCacheSize']
+            if 'featureDtype' in arg_dict:
+                featureDtype = arg_dict['featureDtype']
+            if 'indexDtype' in arg_dict:
+                indexDtype = arg_dict['indexDtype']
+
         self.initialise(tokeniser,
                         preLAChanges,
                         tokenLevelLA,
                         textLevelLA,
                         corpusLevelLA,
-                        ngramRange)
+                        ngramRange,
+                        tagWorkers,
+                        memoSize,
+                        persistMemo,
+                        vectWorkers,
+                        poolType,
+                        hashFeatures,
+                        minDF,
+                        maxDF,
+                        maxFeatures,
+                        sketchWidth,
+                        vectCacheDir,
+                        vectCacheSize,
+                        featureDtype,
+                        indexDtype)
 
     def initialise(self,
                    tokeniser : str = '', 
@@ -129,7 +330,21 @@ class Vectorise:
                    tokenLevelLA : list = [], 
                    textLevelLA : list = [],
                    corpusLevelLA : str = '',
-                   ngramRange : tuple = (1, 1)):
+                   ngramRange : tuple = (1, 1),
+                   tagWorkers : int = 1,
+                   memoSize : int = c.MEMO_SIZE,
+                   persistMemo : bool = False,
+                   vectWorkers : int = 1,
+                   poolType : str = 'PROCESS',
+                   hashFeatures : int = c.HASH_FEATURES,
+                   minDF : int | float = 1,
+                   maxDF : int | float = 1.0,
+                   maxFeatures : int = None,
+                   sketchWidth : int = 0,
+                   vectCacheDir : str = '',
+                   vectCacheSize : int = c.VECT_CACHE_SIZE,
+                   featureDtype : str = 'float32',
+                   indexDtype : str = 'int32'):
         '''
         Checks constructor inputs and creates attributes.
 
@@ -147,6 +362,42 @@ class Vectorise:
             The name of the corpus level LA technique to use.
         ngramRange : tuple
             Lower and upper bound for n-gram sizes (inclusive).
+        tagWorkers : int
+            The number of processes used to POS tag records.
+        memoSize : int
+            The most tokens held by each memo of stems and stopword checks. 0
+            disables memoisation.
+        persistMemo : bool
+            Whether the memo is kept when the object is pickled, so that an 
+            exported program starts with a warm memo.
+        vectWorkers : int
+            The number of workers records are vectorised with.
+        poolType : str
+            The type of worker pool used when vectWorkers is greater than 1.
+        hashFeatures : int
+            The number of features n-grams are hashed into by the HASHING 
+            corpus level techniques.
+        minDF : int | float
+            The fewest records, or proportion of records if a float, an n-gram
+            must appear in to be a bag of words feature.
+        maxDF : int | float
+            The most records, or proportion of records if a float, an n-gram 
+            may appear in to be a bag of words feature.
+        maxFeatures : int | None
+            The most bag of words features, keeping the most frequent n-grams.
+            None doesn't limit them.
+        sketchWidth : int
+            The width of a count-min sketch of n-gram document frequencies
+            used to choose the bag of words vocabulary before exact counting.
+            0 chooses it from exact counts.
+        vectCacheDir : str
+            A directory in which to cache vectors. '' disables caching.
+        vectCacheSize : int
+            The most bytes taken up by cached vectors.
+        featureDtype : str
+            The dtype of the values of the vectors produced.
+        indexDtype : str
+            The dtype of the indices of the vectors produced.
 
         Returns
         -------
@@ -226,16 +477,204 @@ class Vectorise:
                 'ngramRange upper bound must be greater than or equal to ',
                 'ngramRange lower bound.'
             )
+        if (not isinstance(tagWorkers, int) or isinstance(tagWorkers, bool) 
+            or tagWorkers < 1):
+            raise e.TokenLevelException(
+                'tagWorkers must be a positive int.'
+            )
+        if (not isinstance(memoSize, int) or isinstance(memoSize, bool) 
+            or memoSize < 0):
+            raise e.PreLAException(
+                'memoSize must be a non-negative int.'
+            )
+        if not isinstance(persistMemo, bool):
+            raise e.PreLAException(
+                'persistMemo must be a bool.'
+            )
+        if (not isinstance(vectWorkers, int) or isinstance(vectWorkers, bool)
+            or vectWorkers < 1):
+            raise e.WorkersException(
+                'vectWorkers must be a positive int.'
+            )
+        if poolType not in c.POOL_TYPES:
+            raise e.VectoriseException(
+                'poolType must be PROCESS or THREAD.'
+            )
+        if (not isinstance(hashFeatures, int) or isinstance(hashFeatures, bool)
+            or hashFeatures < 1):
+            raise e.CorpusLevelException(
+                'hashFeatures must be a positive int.'
+            )
+        for name, threshold in [('minDF', minDF), ('maxDF', maxDF)]:
+            if isinstance(threshold, bool) or not (
+                (isinstance(threshold, int) and threshold >= 1)
+                or (isinstance(threshold, float) and 0 <= threshold <= 1)):
+                raise e.CorpusLevelException(
+                    f'{name} must be a positive int or a float between 0 and 1.'
+                )
+        if maxFeatures is not None and (
+            not isinstance(maxFeatures, int) or isinstance(maxFeatures, bool)
+            or maxFeatures < 1):
+            raise e.CorpusLevelException(
+                'maxFeatures must be None or a positive int.'
+            )
+        if (not isinstance(sketchWidth, int) or isinstance(sketchWidth, bool)
+            or sketchWidth < 0):
+            raise e.CorpusLevelException(
+                'sketchWidth must be a non-negative int.'
+            )
+        if not isinstance(vectCacheDir, str):
+            raise e.VectoriseException(
+                'vectCacheDir must be a string.'
+            )
+        if (not isinstance(vectCacheSize, int) 
+            or isinstance(vectCacheSize, bool) or vectCacheSize < 1):
+            raise e.VectoriseException(
+                'vectCacheSize must be a positive int.'
+            )
+        if featureDtype not in c.FEATURE_DTYPES:
+            raise e.VectoriseException(
+                f'featureDtype must be one of {c.FEATURE_DTYPES}.'
+            )
+        if indexDtype not in c.INDEX_DTYPES:
+            raise e.VectoriseException(
+                f'indexDtype must be one of {c.INDEX_DTYPES}.'
+            )
         self.tokeniser = tokeniser
         self.preLAChanges = preLAChanges
         self.tokenLevelLA = tokenLevelLA
         self.textLevelLA = textLevelLA
         self.corpusLevelLA = corpusLevelLA
         self.ngramRange = ngramRange
+        self.tagWorkers = tagWorkers
+        self.memo = mm.TokenMemo(memoSize, persistMemo)
+        self.vectWorkers = vectWorkers
+        self.poolType = poolType
+        self.hashFeatures = hashFeatures
+        self.minDF = minDF
+        self.maxDF = maxDF
+        self.maxFeatures = maxFeatures
+        self.sketchWidth = sketchWidth
+        self.vectCacheDir = vectCacheDir
+        self.vectCacheSize = vectCacheSize
+        self.featureDtype = featureDtype
+        self.indexDtype = indexDtype
+        self.iterRecords = 0
+        self.iterBatches = 0
+        self.iterSeconds = 0.0
         self.vectoriser = None
 
+    def tokenise(self,
+                 text : str) -> list:
+        '''
+        Tokenises a text with the chosen tokeniser, or NLTK's word tokeniser if
+        no tokeniser is chosen.
+
+        Parameters
+        ----------
+        text : str
+            The text to be tokenised.
+
+        Returns
+        -------
+        tokens : list
+            A list of tokens.
+        '''
+        match self.tokeniser:
+            case 'PUNC_TOKENISER':
+                tokens = n.puncTokeniser(text)
+            case 'TWEET_TOKENISER':
+                tokens = n.tweetTokeniser(text)
+            case _:
+                tokens = n.wordTokeniser(text)
+        return tokens
+
+    def tokeniseRecord(self,
+                       record : list) -> list:
+        '''
+        Tokenises each field of a record once, to be shared by the pre LA 
+        changes and token level techniques.
+
+        Parameters
+        ----------
+        record : list
+            The record to be tokenised.
+
+        Returns
+        -------
+        fieldTokens : list
+            A list of the tokens of each field, or of None for each field if no
+            technique uses tokens.
+        '''
+        if self.preLAChanges == [] and self.tokenLevelLA == []:
+            return [None] * len(record)
+        fieldTokens = [self.tokenise(str(text)) for text in record]
+        return fieldTokens
+
+    def corpusTokens(self,
+                     record : list) -> list:
+        '''
+        Produces the tokens of a record given to the bag of words pipeline.
+        These don't depend on the chosen tokeniser, so the bag of words 
+        features are those of the text-based pipeline in n.bagOfWords().
+
+        Parameters
+        ----------
+        record : list
+            The record.
+
+        Returns
+        -------
+        tokens : list
+            The record's corpus text as one token, for the analyser to split 
+            into words. For the modified bag of words techniques, the word 
+            tokens of the corpus text with stopwords removed and stemmed.
+        '''
+        text = n.recordToCorpusText(record)
+        if self.corpusLevelLA in ['MOD_BAG_OF_WORDS_C', 'MOD_BAG_OF_WORDS_F']:
+            tokens = self.memo.stem(self.memo.removeStop(n.wordTokeniser(text)))
+        else:
+            tokens = [text]
+        return tokens
+
+    def prepareText(self,
+                    text : str,
+                    tokens : list = None) -> tuple[str, list]:
+        '''
+        Applies the pre LA changes to a text and its tokens.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+        tokens : list
+            The tokens of the text, from tokenise(). None tokenises the text if
+            tokens are needed.
+
+        Returns
+        -------
+        text : str
+            The text, reconstructed from its tokens if pre LA changes are used.
+        tokens : list
+            The tokens with the pre LA changes applied.
+        '''
+        if tokens is None and (self.preLAChanges != [] 
+                               or self.tokenLevelLA != []):
+            with ins.span('tokenise', 1, aggregate= True):
+                tokens = self.tokenise(text)
+
+        if self.preLAChanges != []:
+            with ins.span('preLA', 1, aggregate= True):
+                if 'REMOVE_STOPWORDS' in self.preLAChanges:
+                    tokens = self.memo.removeStop(tokens)
+                if 'STEMMING' in self.preLAChanges:
+                    tokens = self.memo.stem(tokens)
+                text = n.reconstruct(tokens)
+        return (text, tokens)
+
     def buildVector(self, 
-                    text : str) -> list:
+                    text : str,
+                    tokens : list = None) -> list:
         '''
         Creates a vector, of consistent length, representing some input text.
 
@@ -243,38 +682,60 @@ class Vectorise:
         ----------
         text : str
             The text to be represented as a vector.
+        tokens : list
+            The tokens of the text, from tokenise(). None tokenises the text if
+            tokens are needed.
         
         Returns
         -------
         vector : list
             The vector representing the input text.
         '''
-        if 'REMOVE_STOPWORDS' in self.preLAChanges:
-            text = n.stopwordRemoval(text)
-        if 'STEMMING' in self.preLAChanges:
-            text = n.stemming(text)
-        
-        match self.tokeniser:
-            case 'WORD_TOKENISER':
-                tokens = n.wordTokeniser(text)
-            case 'PUNC_TOKENISER':
-               tokens = n.puncTokeniser(text)
-            case 'TWEET_TOKENISER':
-                tokens = n.tweetTokeniser(text)
-        
+        text, tokens = self.prepareText(text, tokens)
+        vector = self.textVector(text, tokens)
+        return vector
+
+    def textVector(self,
+                   text : str,
+                   tokens : list,
+                   tagVector : list = None) -> list:
+        '''
+        Creates the vector of a text the pre LA changes have been applied to.
+
+        Parameters
+        ----------
+        text : str
+            The text, from prepareText().
+        tokens : list
+            The tokens of the text, from prepareText().
+        tagVector : list
+            The POS tag vector of the tokens. None tags the tokens if POS 
+            tagging is used.
+
+        Returns
+        -------
+        vector : list
+            The vector representing the text.
+        '''
         vector = []
         if 'POS_TAG' in self.tokenLevelLA:
-            vector += n.posTag(tokens)
+            if tagVector is None:
+                with ins.span('posTag', 1, aggregate= True):
+                    tagVector = n.posTag(tokens)
+            vector += tagVector
 
         if 'KEYWORDS' in self.textLevelLA:
-            vector = vector + b.keyWordCheck(text)
+            with ins.span('keywords', 1, aggregate= True):
+                vector += b.keyWordCheck(text)
         if 'ASCII_CONVERSION' in self.textLevelLA:
-            vector += b.asciiConversion(text)
+            with ins.span('asciiConversion', 1, aggregate= True):
+                vector += b.asciiConversion(text)
 
         return vector
     
     def recordToVector(self, 
-                       record : list) -> list:
+                       record : list,
+                       fieldTokens : list = None) -> list:
         '''
         Creates a vector, of consistent length, representing some input record.
 
@@ -282,23 +743,428 @@ class Vectorise:
         ----------
         record : list
             The record to be represented as a vector.
+        fieldTokens : list
+            The tokens of each field of the record, from tokeniseRecord(). 
+            None tokenises the fields if tokens are needed.
         
         Returns
         -------
         vector : list
             The vector representing the input record.
         '''
+        if fieldTokens is None:
+            fieldTokens = [None] * len(record)
         vector = []
-        for text in record[0: len(record)]:
-            vector = vector + self.buildVector(str(text))
+        for text, tokens in zip(record, fieldTokens):
+            vector += self.buildVector(str(text), tokens)
         return vector
 
+    def fieldBlocks(self) -> list:
+        '''
+        Gives the hand-crafted feature blocks of each field, which are laid out
+        as the POS tag, keyword and ascii blocks in that order.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        blocks : list
+            The name and number of features of each block used.
+        '''
+        blocks = []
+        if 'POS_TAG' in self.tokenLevelLA:
+            blocks.append(('POS_TAG', c.MAX_TOKENS))
+        if 'KEYWORDS' in self.textLevelLA:
+            blocks.append(('KEYWORDS', len(c.KEYWORDS)))
+        if 'ASCII_CONVERSION' in self.textLevelLA:
+            blocks.append(('ASCII_CONVERSION', c.MAX_CHARS))
+        return blocks
+
+    def fieldWidth(self) -> int:
+        '''
+        Gives the number of hand-crafted features of each field.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        width : int
+            The number of POS tag, keyword and ascii features of a field.
+        '''
+        width = sum(blockWidth for _, blockWidth in self.fieldBlocks())
+        return width
+
+    def blockColumns(self,
+                     nFields : int) -> dict:
+        '''
+        Finds the hand-crafted feature columns of each block, in records of 
+        nFields fields, whose fields are laid out one after another.
+
+        Parameters
+        ----------
+        nFields : int
+            The number of fields in each record.
+
+        Returns
+        -------
+        columns : dict
+            The columns of the hand-crafted features holding each block, field
+            by field.
+        '''
+        columns = {}
+        offset = 0
+        for name, blockWidth in self.fieldBlocks():
+            columns[name] = (np.arange(nFields)[:, None] * self.fieldWidth()
+                             + offset + np.arange(blockWidth)).ravel()
+            offset += blockWidth
+        return columns
+
+    def recordsToVectors(self,
+                         records : list,
+                         recordTokens : list,
+                         tagWorkers : int = None) -> sparse.csr_matrix:
+        '''
+        Creates the vectors of a list of records. The fields of every record 
+        are POS tagged together in batches rather than one at a time, and 
+        each feature block is built as a CSR matrix of every field, from a 
+        preallocated array or, for the ascii codes, with the padding left 
+        implicit. Fields with more than MAX_TOKENS tokens or MAX_CHARS 
+        characters are truncated.
+
+        Parameters
+        ----------
+        records : list
+            The records to be represented as vectors.
+        recordTokens : list
+            The tokens of each field of each record, from tokeniseRecord().
+        tagWorkers : int
+            The number of processes used to POS tag the records. None uses 
+            tagWorkers.
+
+        Returns
+        -------
+        vectors : sparse.csr_matrix
+            The vector representing each record.
+        '''
+        if tagWorkers is None:
+            tagWorkers = self.tagWorkers
+        fields = [self.prepareText(str(text), tokens)
+                  for record, fieldTokens in zip(records, recordTokens)
+                  for text, tokens in zip(record, fieldTokens)]
+        if 'POS_TAG' in self.tokenLevelLA:
+            with ins.span('posTag', len(fields)):
+                tagVectors = n.posTagSents([tokens for _, tokens in fields],
+                                           tagWorkers)
+        else:
+            tagVectors = [None] * len(fields)
+
+        blocks = []
+        if 'POS_TAG' in self.tokenLevelLA:
+            values = np.zeros((len(fields), c.MAX_TOKENS), dtype= np.int64)
+            for row, tagVector in enumerate(tagVectors):
+                tagVector = tagVector[0:c.MAX_TOKENS]
+                values[row, 0: len(tagVector)] = tagVector
+            blocks.append(b.blockToCSR(values))
+        if 'KEYWORDS' in self.textLevelLA:
+            with ins.span('keywords', len(fields)):
+                values = b.keywordBatch([text for text, _ in fields])
+                blocks.append(b.blockToCSR(values))
+        if 'ASCII_CONVERSION' in self.textLevelLA:
+            with ins.span('asciiConversion', len(fields)):
+                blocks.append(b.asciiSparse([text for text, _ in fields]))
+
+        if blocks == []:
+            return sparse.csr_matrix((len(records), 0), dtype= np.int64)
+        fieldsPerRecord = len(records[0]) if records != [] else 0
+        fieldVectors = hstack(blocks, format= 'csr', dtype= np.int64)
+        vectors = fieldVectors.reshape((len(records), 
+                                        fieldsPerRecord * self.fieldWidth()))
+        vectors = sparse.csr_matrix(vectors)
+        return vectors
+
+    def featureChunk(self,
+                     records : list,
+                     transform : bool = False) -> tuple | sparse.csr_matrix:
+        '''
+        Vectorises a chunk of records in a worker. POS tagging is done by the
+        worker itself rather than by further processes.
+
+        Parameters
+        ----------
+        records : list
+            The records to be vectorised.
+        transform : bool
+            Whether to apply the fitted bag of words vectoriser, as 
+            vectoriseList() does, rather than returning the records' tokens.
+
+        Returns
+        -------
+        corpus : list | sparse.csr_matrix
+            The tokens of each record given to the bag of words pipeline or, 
+            for the HASHING techniques, their hashed n-gram counts. An empty 
+            list if no corpus level technique is used. Only returned if 
+            transform is False.
+        vectors : sparse.csr_matrix
+            The hand-crafted features of each record or, if transform is True,
+            the complete vector of each record.
+        '''
+        fieldTokens = [self.tokeniseRecord(record) for record in records]
+        corpus = []
+        if self.corpusLevelLA != '':
+            corpus = [self.corpusTokens(record) for record in records]
+        vectors = self.recordsToVectors(records, fieldTokens, 1)
+        if not transform:
+            if self.hashing():
+                hasher = n.hashingVectoriser('HASH_COUNT',
+                                             self.ngramRange,
+                                             self.hashFeatures)
+                corpus = hasher.transform(corpus)
+            return (corpus, vectors)
+        if self.corpusLevelLA != '':
+            vectors = hstack((self.vectoriser.transform(corpus), vectors),
+                             format= 'csr')
+        return vectors
+
+    def hashing(self) -> bool:
+        '''
+        Gives whether the corpus level technique hashes n-grams rather than 
+        fitting a vocabulary.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        hashing : bool
+            Whether a HASHING technique is used.
+        '''
+        hashing = (self.corpusLevelLA != '' 
+                   and c.BOW_VECTORISERS[self.corpusLevelLA] 
+                   in c.HASH_VECTORISERS)
+        return hashing
+
+    def parallelChunks(self,
+                       records : list,
+                       transform : bool = False) -> list:
+        '''
+        Splits records into chunks and vectorises them across a pool of 
+        vectWorkers workers of type poolType.
+
+        Parameters
+        ----------
+        records : list
+            The records to be vectorised.
+        transform : bool
+            Whether to apply the fitted bag of words vectoriser to each chunk.
+
+        Returns
+        -------
+        results : list
+            The output of featureChunk() for each chunk, in the order of 
+            records.
+        '''
+        size = math.ceil(len(records) / self.vectWorkers)
+        size = max(min(size, c.VECT_CHUNK_SIZE), 1)
+        chunks = [records[i: i + size] for i in range(0, len(records), size)]
+        if len(chunks) <= 1:
+            return [self.featureChunk(records, transform)]
+        if self.poolType == 'THREAD':
+            with ThreadPoolExecutor(max_workers= self.vectWorkers) as pool:
+                results = list(pool.map(
+                    lambda chunk: self.featureChunk(chunk, transform), 
+                    chunks
+                    ))
+        else:
+            with ProcessPoolExecutor(max_workers= self.vectWorkers,
+                                     initializer= initWorker,
+                                     initargs= (self,)) as pool:
+                results = list(pool.map(workerChunk, 
+                                        [(chunk, transform) 
+                                         for chunk in chunks]))
+        return results
+
+    def blockConfigs(self,
+                     sampleWeight : np.ndarray = None) -> dict:
+        '''
+        Gives the settings which change each feature block used, which key 
+        the cached block with the records. Settings which only change how 
+        quickly the vectors are produced are left out, as are settings of 
+        other blocks, so changing one technique only misses its own block.
+        The keywords and field widths a block is built from are included, so
+        editing them misses the blocks built from the old ones.
+
+        Parameters
+        ----------
+        sampleWeight : np.ndarray | None
+            The number of times each training record is counted when fitting
+            the corpus level technique.
+
+        Returns
+        -------
+        configs : dict
+            The settings of each block used.
+        '''
+        configs = {}
+        if self.corpusLevelLA != '':
+            config = dict(corpusLevelLA= self.corpusLevelLA,
+                          ngramRange= self.ngramRange)
+            if self.hashing():
+                config.update(hashFeatures= self.hashFeatures)
+            else:
+                config.update(minDF= self.minDF,
+                              maxDF= self.maxDF,
+                              maxFeatures= self.maxFeatures,
+                              sketchWidth= self.sketchWidth)
+            if sampleWeight is not None:
+                config.update(sampleWeight= np.asarray(sampleWeight).tolist())
+            configs[c.CORPUS_BLOCK] = config
+        for name, _ in self.fieldBlocks():
+            configs[name] = dict(preLAChanges= self.preLAChanges)
+            if name == 'POS_TAG' or self.preLAChanges != []:
+                configs[name].update(tokeniser= self.tokeniser)
+            if name == 'KEYWORDS':
+                configs[name].update(keywords= c.KEYWORDS)
+            if name == 'ASCII_CONVERSION':
+                configs[name].update(maxChars= c.MAX_CHARS)
+            if name == 'POS_TAG':
+                configs[name].update(maxTokens= c.MAX_TOKENS)
+        return configs
+
+    def splitBlocks(self,
+                    vectors : sparse.csr_matrix,
+                    nFields : int) -> dict:
+        '''
+        Splits vectors produced with this object's settings into their 
+        feature blocks.
+
+        Parameters
+        ----------
+        vectors : sparse.csr_matrix
+            The vectors.
+        nFields : int
+            The number of fields in each record.
+
+        Returns
+        -------
+        blocks : dict
+            The columns of the vectors belonging to each block used. The
+            hand-crafted blocks hold the features of each field in turn.
+        '''
+        corpusWidth = vectors.shape[1] - nFields * self.fieldWidth()
+        blocks = {}
+        if self.corpusLevelLA != '':
+            blocks[c.CORPUS_BLOCK] = vectors[:, 0: corpusWidth]
+        for name, columns in self.blockColumns(nFields).items():
+            blocks[name] = vectors[:, corpusWidth + columns]
+        return blocks
+
+    def joinBlocks(self,
+                   blocks : dict,
+                   nFields : int) -> sparse.csr_matrix:
+        '''
+        Assembles vectors from their feature blocks, as splitBlocks() splits
+        them.
+
+        Parameters
+        ----------
+        blocks : dict
+            The block of the vectors for each block used.
+        nFields : int
+            The number of fields in each record.
+
+        Returns
+        -------
+        vectors : sparse.csr_matrix
+            The vectors.
+        '''
+        nRecords = next(iter(blocks.values())).shape[0]
+        columns = self.blockColumns(nFields)
+        if columns == {}:
+            vectors = sparse.csr_matrix((nRecords, 0), dtype= np.int64)
+        else:
+            vectors = hstack([blocks[name] for name in columns], 
+                             format= 'csr', 
+                             dtype= np.int64)
+            vectors = vectors[:, np.argsort(np.concatenate(
+                list(columns.values())
+                ))]
+        if self.corpusLevelLA != '':
+            vectors = hstack((blocks[c.CORPUS_BLOCK], vectors), format= 'csr')
+        return vectors
+
+    def computeBlocks(self,
+                      trainRecords : list,
+                      testRecords : list,
+                      names : list,
+                      sampleWeight : np.ndarray = None) -> dict:
+        '''
+        Vectorises the input training and testing data with only some of the 
+        feature blocks, sharing this object's settings and memo.
+
+        Parameters
+        ----------
+        trainRecords : list
+            The list of training records to be vectorised.
+        testRecords : list
+            The list of testing records to be vectorised.
+        names : list
+            The names of the blocks to compute.
+        sampleWeight : np.ndarray | None
+            The number of times each training record is counted when fitting
+            the corpus level technique.
+
+        Returns
+        -------
+        blocks : dict
+            The blocks of the training and testing vectors and, for the 
+            corpus level block, the fitted vectoriser, or None, for each block
+            computed.
+        '''
+        partial = copy.copy(self)
+        partial.tokenLevelLA = [tokenLev for tokenLev in self.tokenLevelLA 
+                                if tokenLev in names]
+        partial.textLevelLA = [textLev for textLev in self.textLevelLA 
+                               if textLev in names]
+        if c.CORPUS_BLOCK not in names:
+            partial.corpusLevelLA = ''
+        partial.vectoriser = None
+        if self.vectWorkers > 1:
+            trainVecs, testVecs = partial.parallelVectorise(trainRecords, 
+                                                            testRecords,
+                                                            sampleWeight)
+        else:
+            trainVecs, testVecs = partial.serialVectorise(trainRecords, 
+                                                          testRecords,
+                                                          sampleWeight)
+        nFields = len(trainRecords[0] if trainRecords != [] else testRecords[0])
+        trainBlocks = partial.splitBlocks(trainVecs, nFields)
+        testBlocks = partial.splitBlocks(testVecs, nFields)
+        blocks = {}
+        for name in names:
+            vectoriser = partial.vectoriser if name == c.CORPUS_BLOCK else None
+            blocks[name] = (trainBlocks[name], testBlocks[name], vectoriser)
+        return blocks
+
     def vectorise(self, 
                   trainRecords : list, 
-                  testRecords : list) -> tuple[sparse.csr_matrix, 
-                                               sparse.csr_matrix]:
+                  testRecords : list,
+                  sampleWeight : np.ndarray = None) -> tuple[
+                      sparse.csr_matrix, sparse.csr_matrix]:
         '''
-        Vectorises the input training and testing data.
+        Vectorises the input training and testing data. If vectCacheDir is 
+        set, each feature block is cached separately, keyed by the records and
+        the block's own settings. Blocks cached before are read, with the 
+        fitted vectoriser, and only the other blocks are computed, so 
+        changing one technique costs only its own block. If vectWorkers is 
+        greater than 1, the records are vectorised in chunks across a pool of
+        workers. The vectors are CSR matrices with values of featureDtype and
+        indices of indexDtype, which are passed on without further 
+        conversion.
 
         Parameters
         ----------
@@ -306,6 +1172,10 @@ class Vectorise:
             The list of training records to be vectorised.
         testRecords : list
             The list of testing records to be vectorised.
+        sampleWeight : np.ndarray | None
+            The number of times each training record is counted when fitting
+            the corpus level technique, for records standing for several 
+            identical ones. None counts each record once.
 
         Returns
         -------
@@ -314,47 +1184,190 @@ class Vectorise:
         outTestVectors : sparse.crs_matrix
             The vectorised testing records.
         '''
-        if 'BAG_OF_WORDS_C' == self.corpusLevelLA:
-            trainVecs, testVecs, self.vectoriser = n.bagOfWordsC(
-                trainRecords, 
-                testRecords,
-                self.ngramRange
-                )
-        if 'MOD_BAG_OF_WORDS_C' == self.corpusLevelLA:
-            trainVecs, testVecs, self.vectoriser = n.modBagOfWordsC(
-                trainRecords, 
-                testRecords,
-                self.ngramRange
-                )
-        if 'BAG_OF_WORDS_F' == self.corpusLevelLA:
-            trainVecs, testVecs, self.vectoriser = n.bagOfWordsF(
-                trainRecords, 
-                testRecords,
-                self.ngramRange
-                )
-        if 'MOD_BAG_OF_WORDS_F' == self.corpusLevelLA:
-            trainVecs, testVecs, self.vectoriser = n.modBagOfWordsF(
-                trainRecords, 
-                testRecords,
-                self.ngramRange
-                )
-        outTrainVecs = sparse.csr_matrix(
-            [self.recordToVector(record) for record in trainRecords]
-            )
-        outTestVecs = sparse.csr_matrix(
-            [self.recordToVector(record) for record in testRecords]
-            )
+        nRecords = len(trainRecords) + len(testRecords)
+        if self.vectCacheDir == '' or nRecords == 0:
+            if self.vectWorkers > 1:
+                outTrainVecs, outTestVecs = self.parallelVectorise(trainRecords,
+                                                                   testRecords,
+                                                                   sampleWeight)
+            else:
+                outTrainVecs, outTestVecs = self.serialVectorise(trainRecords, 
+                                                                 testRecords,
+                                                                 sampleWeight)
+            return (b.featureMatrix(outTrainVecs, 
+                                    self.featureDtype, 
+                                    self.indexDtype),
+                    b.featureMatrix(outTestVecs, 
+                                    self.featureDtype, 
+                                    self.indexDtype))
+
+        with ins.span('readVectCache', nRecords):
+            fingerprint = vca.recordsFingerprint(trainRecords, testRecords)
+            paths = {name : vca.cachePath(self.vectCacheDir, 
+                                          fingerprint, 
+                                          name, 
+                                          config)
+                     for name, config 
+                     in self.blockConfigs(sampleWeight).items()}
+            blocks = {name : vca.readCache(path) 
+                      for name, path in paths.items()}
+        missing = [name for name, block in blocks.items() if block is None]
+        if missing != []:
+            blocks.update(self.computeBlocks(trainRecords, 
+                                            testRecords, 
+                                            missing,
+                                            sampleWeight))
+            with ins.span('writeVectCache', nRecords):
+                for name in missing:
+                    vca.writeCache(*blocks[name], paths[name])
+                vca.evictCache(self.vectCacheDir, self.vectCacheSize)
+
+        if c.CORPUS_BLOCK in blocks:
+            self.vectoriser = blocks[c.CORPUS_BLOCK][2]
+        nFields = len(trainRecords[0] if trainRecords != [] else testRecords[0])
+        outTrainVecs = self.joinBlocks({name : block[0] 
+                                        for name, block in blocks.items()}, 
+                                       nFields)
+        outTestVecs = self.joinBlocks({name : block[1]
+                                       for name, block in blocks.items()},
+                                      nFields)
+        return (b.featureMatrix(outTrainVecs, 
+                                self.featureDtype, 
+                                self.indexDtype),
+                b.featureMatrix(outTestVecs, 
+                                self.featureDtype, 
+                                self.indexDtype))
+
+    def serialVectorise(self, 
+                        trainRecords : list, 
+                        testRecords : list,
+                        sampleWeight : np.ndarray = None) -> tuple[
+                            sparse.csr_matrix, sparse.csr_matrix]:
+        '''
+        Vectorises the input training and testing data in this thread. Each 
+        field is tokenised once and its tokens are shared by the pre LA 
+        changes and token level techniques.
+
+        Parameters
+        ----------
+        trainRecords : list
+            The list of training records to be vectorised.
+        testRecords : list
+            The list of testing records to be vectorised.
+        sampleWeight : np.ndarray | None
+            The number of times each training record is counted when fitting
+            the corpus level technique, for records standing for several 
+            identical ones. None counts each record once.
+
+        Returns
+        -------
+        outTrainVecs : sparse.csr_matrix
+            The vectorised training records.
+        outTestVectors : sparse.crs_matrix
+            The vectorised testing records.
+        '''
+        with ins.span('tokenise', len(trainRecords) + len(testRecords)):
+            trainTokens = [self.tokeniseRecord(record) for record in trainRecords]
+            testTokens = [self.tokeniseRecord(record) for record in testRecords]
+        if self.corpusLevelLA != '':
+            with ins.span('bagOfWords', len(trainRecords) + len(testRecords)):
+                trainVecs, testVecs, self.vectoriser = n.bagOfTokens(
+                    [self.corpusTokens(record) for record in trainRecords],
+                    [self.corpusTokens(record) for record in testRecords],
+                    c.BOW_VECTORISERS[self.corpusLevelLA],
+                    self.ngramRange,
+                    self.hashFeatures,
+                    self.minDF,
+                    self.maxDF,
+                    self.maxFeatures,
+                    self.sketchWidth,
+                    sampleWeight
+                    )
+        with ins.span('recordVectors', len(trainRecords) + len(testRecords)):
+            outTrainVecs = self.recordsToVectors(trainRecords, trainTokens)
+            outTestVecs = self.recordsToVectors(testRecords, testTokens)
 
         if self.corpusLevelLA != '':
-            outTrainVecs = hstack((trainVecs, outTrainVecs))
-            outTestVecs = hstack((testVecs, outTestVecs))
+            outTrainVecs = hstack((trainVecs, outTrainVecs), format= 'csr')
+            outTestVecs = hstack((testVecs, outTestVecs), format= 'csr')
  
         return (outTrainVecs, outTestVecs)
+
+    def parallelVectorise(self,
+                          trainRecords : list,
+                          testRecords : list,
+                          sampleWeight : np.ndarray = None) -> tuple[
+                              sparse.csr_matrix, sparse.csr_matrix]:
+        '''
+        Vectorises the input training and testing data across a pool of 
+        workers. The per-chunk blocks are merged in order and match the 
+        output of vectorising in this thread.
+
+        Parameters
+        ----------
+        trainRecords : list
+            The list of training records to be vectorised.
+        testRecords : list
+            The list of testing records to be vectorised.
+        sampleWeight : np.ndarray | None
+            The number of times each training record is counted when fitting
+            the corpus level technique, for records standing for several 
+            identical ones. None counts each record once.
+
+        Returns
+        -------
+        outTrainVecs : sparse.csr_matrix
+            The vectorised training records.
+        outTestVectors : sparse.crs_matrix
+            The vectorised testing records.
+        '''
+        records = trainRecords + testRecords
+        with ins.span('parallelVectorise', len(records)):
+            results = self.parallelChunks(records)
+        vectors = sparse.vstack([chunkVectors for _, chunkVectors in results],
+                                format= 'csr')
+        outTrainVecs = vectors[0: len(trainRecords)]
+        outTestVecs = vectors[len(trainRecords):]
+        if self.hashing():
+            counts = sparse.vstack([chunkCorpus for chunkCorpus, _ in results],
+                                   format= 'csr')
+            with ins.span('bagOfWords', len(records)):
+                trainVecs, testVecs, self.vectoriser = n.hashedBagOfWords(
+                    counts[0: len(trainRecords)],
+                    counts[len(trainRecords):],
+                    c.BOW_VECTORISERS[self.corpusLevelLA],
+                    self.ngramRange,
+                    self.hashFeatures,
+                    sampleWeight
+                    )
+        elif self.corpusLevelLA != '':
+            corpus = [tokens for chunkCorpus, _ in results 
+                      for tokens in chunkCorpus]
+            with ins.span('bagOfWords', len(records)):
+                trainVecs, testVecs, self.vectoriser = n.bagOfTokens(
+                    corpus[0: len(trainRecords)],
+                    corpus[len(trainRecords):],
+                    c.BOW_VECTORISERS[self.corpusLevelLA],
+                    self.ngramRange,
+                    self.hashFeatures,
+                    self.minDF,
+                    self.maxDF,
+                    self.maxFeatures,
+                    self.sketchWidth,
+                    sampleWeight
+                    )
+        if self.corpusLevelLA != '':
+            outTrainVecs = hstack((trainVecs, outTrainVecs), format= 'csr')
+            outTestVecs = hstack((testVecs, outTestVecs), format= 'csr')
+
+        return (outTrainVecs, outTestVecs)
     
     def vectoriseList(self, records : list) -> sparse.csr_matrix:
         '''
         Converts a list of records into a list of vectors. Can only
-        be used after the vectorise() method has been run.
+        be used after the vectorise() method has been run. If vectWorkers is 
+        greater than 1, the records are vectorised in chunks across a pool of
+        workers. The vectors have the format vectorise() gives them.
 
         Parameters
         ----------
@@ -366,14 +1379,130 @@ class Vectorise:
         vectorList : sparse.csr_matrix
             The list of vectors corresponding to the input records.
         '''
-        texts = [n.recordToCorpusText(rec) for rec in records]
-        if self.corpusLevelLA in ['MOD_BAG_OF_WORDS_C', 'MOD_BAG_OF_WORDS_F']:
-            texts = n.prepareTexts(texts)
-        vectPart1 = self.vectoriser.transform(texts)
-        vectPart2 = sparse.csr_matrix([self.recordToVector(rec) for rec in records])
-        if self.corpusLevelLA == '':
-            vectorList = vectPart2
+        if self.vectWorkers > 1:
+            vectorList = sparse.vstack(self.parallelChunks(records, True),
+                                       format= 'csr')
         else:
-            vectorList = hstack((vectPart1, vectPart2))
+            fieldTokens = [self.tokeniseRecord(rec) for rec in records]
+            vectPart2 = self.recordsToVectors(records, fieldTokens)
+            if self.corpusLevelLA == '':
+                vectorList = vectPart2
+            else:
+                vectPart1 = self.vectoriser.transform(
+                    [self.corpusTokens(rec) for rec in records]
+                    )
+                vectorList = hstack((vectPart1, vectPart2), format= 'csr')
         
-        return vectorList
\ No newline at end of file
+        vectorList = b.featureMatrix(vectorList, 
+                                     self.featureDtype, 
+                                     self.indexDtype)
+        return vectorList
+
+    def vectoriseIter(self,
+                      records,
+                      batchSize : int = c.ITER_BATCH_SIZE):
+        '''
+        Converts records into vectors in batches, for streaming inference. 
+        Records are drawn from records only as each batch is needed and each
+        batch is vectorised as vectoriseList() does, so at most batchSize 
+        records and their vectors are held at a time. Can only be used after 
+        the vectorise() method has been run. The iterRecords, iterBatches and
+        iterSeconds counters are reset when iteration starts.
+
+        Parameters
+        ----------
+        records : iterable
+            The records to be converted, which may be a generator.
+        batchSize : int
+            The most records in each batch.
+
+        Returns
+        -------
+        batches : generator
+            Yields the vectors of each batch of records, in order, as a 
+            sparse.csr_matrix.
+        '''
+        if (not isinstance(batchSize, int) 
+            or isinstance(batchSize, bool) or batchSize < 1):
+            raise e.VectoriseException(
+                'batchSize must be a positive int.'
+            )
+
+        def batches():
+            self.iterRecords = 0
+            self.iterBatches = 0
+            self.iterSeconds = 0.0
+            iterator = iter(records)
+            batch = list(itertools.islice(iterator, batchSize))
+            while batch != []:
+                start = time.perf_counter()
+                with ins.span('vectoriseBatch', len(batch), aggregate= True):
+                    vectors = self.vectoriseList(batch)
+                self.iterSeconds += time.perf_counter() - start
+                self.iterRecords += len(batch)
+                self.iterBatches += 1
+                batch = None
+                yield vectors
+                batch = list(itertools.islice(iterator, batchSize))
+
+        return batches()
+
+    def iterThroughput(self) -> dict:
+        '''
+        Reports the throughput of the latest vectoriseIter() call. Only time
+        spent vectorising is counted, not time spent producing records or 
+        consuming vectors.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        throughput : dict
+            The records vectorised, batches yielded, seconds spent vectorising
+            and records vectorised per second, which is 0 before any batches.
+        '''
+        throughput = {'records' : self.iterRecords,
+                      'batches' : self.iterBatches,
+                      'seconds' : self.iterSeconds,
+                      'recordsPerSecond' : (self.iterRecords / self.iterSeconds
+                                            if self.iterSeconds > 0 else 0)}
+        return throughput
+
+def initWorker(vectorise : Vectorise):
+    '''
+    Sets the Vectorise object used by a worker process. Initialiser of the 
+    process pool of Vectorise.parallelChunks().
+
+    Parameters
+    ----------
+    vectorise : Vectorise
+        The Vectorise object.
+
+    Returns
+    -------
+    None
+    '''
+    global _worker
+    _worker = vectorise
+
+def workerChunk(args : tuple) -> tuple | sparse.csr_matrix:
+    '''
+    Vectorises a chunk of records in a worker process with the Vectorise 
+    object set by initWorker().
+
+    Parameters
+    ----------
+    args : tuple
+        The records of the chunk and whether to apply the fitted bag of words
+        vectoriser.
+
+    Returns
+    -------
+    result : tuple | sparse.csr_matrix
+        The output of Vectorise.featureChunk().
+    '''
+    records, transform = args
+    result = _worker.featureChunk(records, transform)
+    return result
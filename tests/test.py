@@ -6,6 +6,7 @@ import unittest
 from . import test_base
 from . import test_evaluate
 from . import test_importer
+from . import test_instrument
 from . import test_mlearn
 from . import test_nltk
 from . import test_vectorise
@@ -16,6 +17,7 @@ suite  = unittest.TestSuite()
 suite.addTests(loader.loadTestsFromModule(test_base))
 suite.addTests(loader.loadTestsFromModule(test_evaluate))
 suite.addTests(loader.loadTestsFromModule(test_importer))
+suite.addTests(loader.loadTestsFromModule(test_instrument))
 suite.addTests(loader.loadTestsFromModule(test_mlearn))
 suite.addTests(loader.loadTestsFromModule(test_nltk))
 suite.addTests(loader.loadTestsFromModule(test_vectorise))
@@ -22,11 +22,14 @@ Exceptions:
     None
 '''
 import unittest
+import csv
 import os
+import tempfile
 import time
 
 from ..package import base as b
 from ..package import exceptions as e
+from ..package import instrument as ins
 
 cwd = str(os.getcwd())
 deldir = cwd + '\\EpiNLPpb_dev\\model'
@@ -84,6 +87,15 @@ class TestBase(unittest.TestCase):
     test_crossValidate()
         Tests that invalid nFold inputs raise exceptions and the correct number
         of measurements are recorded.
+    test_measureMode()
+        Tests that each program measures its stages in its own measureMode 
+        and that invalid measureMode inputs raise exceptions.
+    test_annotateCSV()
+        Tests that annotating a CSV file adds a classification to each record,
+        keeping blank lines and quoted multi-line fields.
+    test_tracing()
+        Tests that the trace is stopped when a traced stage raises an 
+        exception and written when the stages complete.
     test_rec()
         Tests that startRec and stopRec record the correct time.
     '''
@@ -1154,12 +1166,90 @@ class TestBase(unittest.TestCase):
         self.assertEqual(len(results['Test Recall']), 7)
         self.assertEqual(len(results['Fold Times']), 7)
 
+    def test_measureMode(self):
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    trainSize= 50,
+                    testSize= 10,
+                    tokeniser= 'WORD_TOKENISER',
+                    corpusLevelLA= 'BAG_OF_WORDS_C',
+                    mlAlgType= 'DECISIONTREE',
+                    macLearnInput= {'impurity' : 'gini'})
+        unmeasured = b.NLP(name= 'Unmeasured', measureMode= 'OFF', **args)
+        timed = b.NLP(name= 'Timed', measureMode= 'TIME', **args)
+        unmeasured.create()
+        self.assertEqual(unmeasured.measureMode, 'OFF')
+        self.assertEqual(unmeasured.vectTime, 0.0)
+        timed.create()
+        self.assertGreater(timed.vectTime, 0.0)
+        unmeasured.create()
+        self.assertEqual(unmeasured.vectTime, 0.0)
+        with self.assertRaises(e.MeasureException):
+            b.NLP(name= 'Invalid', measureMode= 'ALL', **args)
+
+    def test_annotateCSV(self):
+        nlp = b.NLP(name= 'Annotator',
+                    fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    trainSize= 50,
+                    testSize= 10,
+                    chunkSize= 2,
+                    corpusLevelLA= 'BAG_OF_WORDS_C',
+                    mlAlgType= 'DECISIONTREE',
+                    macLearnInput= {'impurity' : 'gini'})
+        nlp.create()
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'annotate.csv')
+            with open(path, 'w', newline= '') as file:
+                file.write('TriageObject,TriageDescription,Other\n'
+                           'fall,hit head,1\n'
+                           '\n'
+                           'cut,"deep\nwound",2\n'
+                           'overdose,took pills,3\n')
+            nlp.annotateDataCSV(path, ['TriageObject','TriageDescription'], 'Flag')
+            with open(path, newline= '') as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(rows[0], ['TriageObject','TriageDescription','Other','Flag'])
+            self.assertEqual(rows[2], [])
+            self.assertEqual([len(row) for row in rows], [4, 4, 0, 4, 4])
+            self.assertEqual([row[2] for row in rows if row != []][1:], 
+                             ['1', '2', '3'])
+
+    def test_tracing(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            nlp = b.NLP(name= 'Tracer',
+                        fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                        textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                        flagColumnLabel= 'SSH_Flag',
+                        trainSize= 50,
+                        testSize= 10,
+                        corpusLevelLA= 'BAG_OF_WORDS_C',
+                        mlAlgType= 'DECISIONTREE',
+                        macLearnInput= {'impurity' : 'gini'},
+                        traceFile= os.path.join(tempDir, 'trace'))
+            with self.assertRaises(ValueError):
+                with nlp.tracing('failing'):
+                    raise ValueError('stage failed')
+            self.assertIsNone(ins.stopTrace())
+            self.assertEqual(os.listdir(tempDir), [])
+            with nlp.tracing('passing'):
+                with ins.span('stage'):
+                    pass
+            self.assertIsNone(ins.stopTrace())
+            self.assertEqual(nlp.tracer.toTree()[0]['name'], 'passing')
+            self.assertEqual(sorted(os.listdir(tempDir)), 
+                             ['trace.json', 'trace.trace.json'])
+
     def test_rec(self):
-        time0 = b.startRec()
+        ins.setMode('TIME')
+        record = ins.startRec()
         time.sleep(5)
-        time1, _ = b.stopRec(time0)
+        time1, _ = ins.stopRec(record)
         self.assertGreaterEqual(time1, 5)
         self.assertLess(time1, 6)
+        self.assertEqual(time1, record.wallTime)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -18,9 +18,20 @@ Exceptions:
     None
 '''
 import unittest
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import openpyxl
+import pandas as pd
 
 from ..package.Importer import importer as i
 from ..package.Importer import base as b
+from ..package.Importer import constants as c
+from ..package.Importer import xlsx as xl
+from ..package.Importer import manifest as mf
+from ..package.Importer.extractors import extractors as ex
 from ..package import exceptions as e
 
 class TestImporter(unittest.TestCase):
@@ -96,6 +107,28 @@ class TestImporter(unittest.TestCase):
         data contains the correct amount of data fields.
     test_invalidColumnLabel()
         Tests that invalid column labels cause exceptions.
+    test_chunkedImport()
+        Tests that importing in chunks produces the same records as importing
+        whole files and that invalid chunkSize inputs cause exceptions.
+    test_parallelImport()
+    test_importCache()
+    test_chunkedImportCache()
+        Tests that importing in chunks with a cache gives the records of an 
+        uncached import and that changed settings miss the cache.
+    test_demographicMask()
+    test_yearColumn()
+    test_compactDtypes()
+    test_extractors()
+    test_splitManifest()
+        Tests that reading files concurrently produces the same records, in 
+        the same order, as reading them one at a time.
+    test_xlsxStreaming()
+        Tests that streaming an xlsx file in chunks produces the same records 
+        as reading it whole and that annotating an xlsx file adds a column of 
+        classifications.
+    test_collapseDuplicates()
+        Tests that records with the same text fields and flag are collapsed 
+        into one record with their multiplicity.
     '''
     
     def test_noError_csv(self):
@@ -881,5 +914,336 @@ class TestImporter(unittest.TestCase):
                         testSize=10)
             _, _ = importer.importData()
 
+    def test_chunkedImport(self):
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    dateColumnLabel= 'EDPresentationDTTM',
+                    hospitalColumnLabel= 'hospid',
+                    sexColumnLabel= 'Sex',
+                    ageColumnLabel= 'AgeAtPresentation',
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    ageBounds= (18,60),
+                    hospital= 'CHHS',
+                    sex= 2,
+                    yearBounds= (2016,2020),
+                    trainSize= 20,
+                    trainDist= 'NEWESTBLOCK', 
+                    testSize= 10, 
+                    testDist= 'NEWESTBLOCK')
+        wholeTrain, wholeTest = i.Importer(**args).importData()
+        importer = i.Importer(chunkSize= 1000, **args)
+        chunkTrain, chunkTest = importer.importData()
+        self.assertTrue(wholeTrain.equals(chunkTrain))
+        self.assertTrue(wholeTest.equals(chunkTest))
+        self.assertEqual(importer.importSpace, importer.filterSpace)
+        with self.assertRaises(e.ChunkSizeException):
+            i.Importer(chunkSize= -1, **args)
+        with self.assertRaises(e.ChunkSizeException):
+            i.Importer(chunkSize= 10.5, **args)
+        with self.assertRaises(e.ChunkSizeException):
+            i.Importer(chunkSize= True, **args)
+
+    def test_parallelImport(self):
+        files = ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                 'EpiNLPpb_dev/data/MANUAL.csv',
+                 'EpiNLPpb_dev/data/KEYWORD2.csv']
+        serial = b.DataSet('', '', files, 'EDPresentationDTTM', 'hospid', 'Sex',
+                           'AgeAtPresentation', [], 
+                           ['TriageObject','TriageDescription'], 'SSH_Flag')
+        parallel = b.DataSet('', '', files, 'EDPresentationDTTM', 'hospid', 'Sex',
+                             'AgeAtPresentation', [], 
+                             ['TriageObject','TriageDescription'], 'SSH_Flag',
+                             importWorkers= 3)
+        self.assertTrue(serial.importToFrame().equals(parallel.importToFrame()))
+        self.assertEqual(len(parallel.fileTimes), len(files))
+        self.assertEqual(len(parallel.fileSpaces), len(files))
+        with self.assertRaises(e.WorkersException):
+            b.DataSet('', '', files, '', '', '', '', [], ['TriageObject'], 
+                      'SSH_Flag', importWorkers= 0)
+        with self.assertRaises(e.WorkersException):
+            b.DataSet('', '', files, '', '', '', '', [], ['TriageObject'], 
+                      'SSH_Flag', importWorkers= True)
+
+    def test_importCache(self):
+        files = ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                 'EpiNLPpb_dev/data/MANUALXLSXTEST.xlsx']
+        with tempfile.TemporaryDirectory() as cacheDir:
+            uncached = b.DataSet('', '', files, 'EDPresentationDTTM', 'hospid', 
+                                 'Sex', 'AgeAtPresentation', [], 
+                                 ['TriageObject','TriageDescription'], 
+                                 'SSH_Flag')
+            cached = b.DataSet('', '', files, 'EDPresentationDTTM', 'hospid', 
+                               'Sex', 'AgeAtPresentation', [], 
+                               ['TriageObject','TriageDescription'], 
+                               'SSH_Flag', importCacheDir= cacheDir)
+            expected = uncached.importToFrame()
+            self.assertTrue(expected.equals(cached.importToFrame()))
+            self.assertEqual(len(os.listdir(cacheDir)), len(files))
+            self.assertTrue(expected.equals(cached.importToFrame()))
+        with self.assertRaises(e.FileException):
+            b.DataSet('', '', files, '', '', '', '', [], ['TriageObject'], 
+                      'SSH_Flag', importCacheDir= 1)
+
+    def test_chunkedImportCache(self):
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    dateColumnLabel= 'EDPresentationDTTM',
+                    hospitalColumnLabel= 'hospid',
+                    sexColumnLabel= 'Sex',
+                    ageColumnLabel= 'AgeAtPresentation',
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    ageBounds= (18,60),
+                    hospital= 'CHHS',
+                    sex= 2,
+                    yearBounds= (2016,2020),
+                    trainSize= 20,
+                    trainDist= 'NEWESTBLOCK', 
+                    testSize= 10, 
+                    testDist= 'NEWESTBLOCK',
+                    chunkSize= 1000)
+        expectedTrain, expectedTest = i.Importer(**args).importData()
+        with tempfile.TemporaryDirectory() as cacheDir:
+            for _ in range(2):
+                importer = i.Importer(importCacheDir= cacheDir, **args)
+                cachedTrain, cachedTest = importer.importData()
+                self.assertTrue(expectedTrain.equals(cachedTrain))
+                self.assertTrue(expectedTest.equals(cachedTest))
+            self.assertEqual(len(os.listdir(cacheDir)), 2)
+            args['hospital'] = 'ALL'
+            i.Importer(importCacheDir= cacheDir, **args).importData()
+            self.assertEqual(len(os.listdir(cacheDir)), 4)
+
+    def test_demographicMask(self):
+        data = pd.DataFrame({
+            'date' : ['1/2/2018 10:00', '2019-03-04', '5/6/2021 08:00', 
+                      '7/8/2019', 'unknown', '1/1/2020'],
+            'hosp' : ['CHHS', 'CHHS', 'CHHS', 'CHPB', 'CHHS', 'CHHS'],
+            'sex' : [1, 1.0, 1, 1, 1, 2],
+            'age' : [20, '30', 40, np.nan, 20, '20.5'],
+            'cust' : [1.0, 2.0, np.nan, 8.0, 1.0, 9.0],
+            'code' : ['a', 'a', 'b', 'a', 'a', 'b']
+        })
+        demographic = b.Demographic('date', 'hosp', 'sex', 'age', 
+                                    ['cust', 'code'], ((18, 25), (30, 30)), 
+                                    'CHHS', 1, ((2018, 2018), (2019, 2020)), 
+                                    [((0, 1), (2, 3)), 'a'])
+        self.assertEqual(demographic.mask(data).tolist(), 
+                         [True, True, False, False, False, False])
+        self.assertEqual(demographic.filter(data)['age'].tolist(), [20, '30'])
+        demographic = b.Demographic('date', 'hosp', 'sex', 'age', 
+                                    ['cust'], (0, 100), 'ALL', 0, 
+                                    (1900, 2100), [1])
+        self.assertEqual(demographic.mask(data).tolist(), 
+                         [True, False, False, False, False, False])
+
+    def test_yearColumn(self):
+        dates = pd.Series(['1/2/2018 10:00', '2019-03-04', 'unknown', 
+                           '1/2/2018 10:00', np.nan])
+        self.assertEqual(b.getYearColumn(dates).tolist(), 
+                         [2018, 2019, -1, 2018, -1])
+        dataSet = b.DataSet('', '', ['EpiNLPpb_dev/data/KEYWORD1.csv'], 
+                            'EDPresentationDTTM', 'hospid', 'Sex', 
+                            'AgeAtPresentation', [], 
+                            ['TriageObject','TriageDescription'], 'SSH_Flag')
+        data = dataSet.importToFrame()
+        self.assertEqual(data[c.YEAR_COLUMN_LABEL].dtype, np.int16)
+        for value, year in zip(data['EDPresentationDTTM'][0:100], 
+                               data[c.YEAR_COLUMN_LABEL][0:100]):
+            self.assertEqual(b.getYear(value), year)
+        demographic = b.Demographic('EDPresentationDTTM', '', '', '', [], 
+                                    (0, 100), 'ALL', 0, (2017, 2019), [])
+        self.assertTrue((demographic.mask(data) == demographic.mask(
+            data.drop(columns= c.YEAR_COLUMN_LABEL))).all())
+
+    def test_compactDtypes(self):
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                                    'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    dateColumnLabel= 'EDPresentationDTTM',
+                    hospitalColumnLabel= 'hospid',
+                    sexColumnLabel= 'Sex',
+                    ageColumnLabel= 'AgeAtPresentation',
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    ageBounds= (18,60),
+                    hospital= 'CHHS',
+                    sex= 1,
+                    yearBounds= (2017,2020),
+                    trainSize= 20,
+                    trainDist= 'NEWESTBLOCK', 
+                    testSize= 10, 
+                    testDist= 'NEWESTBLOCK')
+        inferred = i.Importer(**args).importData()
+        for chunkSize in [0, 5000]:
+            compact = i.Importer(compactDtypes= True, chunkSize= chunkSize, 
+                                 **args).importData()
+            for inferredFrame, compactFrame in zip(inferred, compact):
+                self.assertEqual(compactFrame['hospid'].dtype, 'category')
+                self.assertEqual(compactFrame['Sex'].dtype, np.int8)
+                self.assertEqual(compactFrame['SSH_Flag'].dtype, np.int8)
+                self.assertEqual(compactFrame['AgeAtPresentation'].dtype, 'Int16')
+                self.assertEqual(compactFrame['TriageObject'].dtype, 'string')
+                self.assertEqual(b.frameToRecords(inferredFrame), 
+                                 b.frameToRecords(compactFrame))
+        with self.assertRaises(e.ImporterException):
+            b.DataSet('', '', ['EpiNLPpb_dev/data/KEYWORD1.csv'], '', '', '', 
+                      '', [], ['TriageObject'], 'SSH_Flag', 
+                      compactDtypes= 'True')
+
+    def test_extractors(self):
+        frame = pd.DataFrame({'id' : range(0, 50)})
+        for extractorType in [ex.NewestBlock, ex.RandomBlock, ex.Uniform]:
+            specified, leftover = extractorType(20, 7).extract(frame)
+            self.assertEqual(len(specified), 20)
+            self.assertEqual(len(leftover), 30)
+            self.assertEqual(sorted(specified['id'].tolist() + leftover['id'].tolist()), 
+                             list(range(0, 50)))
+            again = extractorType(20, 7).extract(frame)[0]
+            self.assertTrue(specified.equals(again))
+            self.assertEqual(len(extractorType(50, 7).extract(frame)[0]), 50)
+            with self.assertRaises(e.MoreDataThanRecordsException):
+                extractorType(51, 7).extract(frame)
+        extraction = ex.Uniform(20, 7).extract(frame)
+        test = ex.Uniform(30, 7).extract(frame, extraction.leftoverRows)[0]
+        self.assertTrue(test.equals(extraction[1]))
+        with self.assertRaises(e.ImporterException):
+            ex.Uniform(20, 'seed')
+
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                                    'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    trainSize= 20,
+                    trainDist= 'UNIFORM', 
+                    testSize= 10, 
+                    testDist= 'RANDOMBLOCK',
+                    extractSeed= 3)
+        train, test = i.Importer(**args).importData()
+        trainAgain, testAgain = i.Importer(**args).importData()
+        self.assertTrue(train.equals(trainAgain))
+        self.assertTrue(test.equals(testAgain))
+        self.assertEqual(len(train.index.intersection(test.index)), 0)
+        with self.assertRaises(e.ImporterException):
+            i.Importer(**dict(args, extractSeed= -1))
+
+    def test_splitManifest(self):
+        args = dict(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                                    'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                    textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                    flagColumnLabel= 'SSH_Flag',
+                    trainSize= 20,
+                    trainDist= 'UNIFORM', 
+                    testSize= 10, 
+                    testDist= 'UNIFORM',
+                    extractSeed= 3)
+        with tempfile.TemporaryDirectory() as manifestDir:
+            first = i.Importer(splitManifestDir= manifestDir, **args)
+            train, test = first.importData()
+            self.assertFalse(first.splitReused)
+            self.assertEqual(len(os.listdir(manifestDir)), 1)
+            second = i.Importer(splitManifestDir= manifestDir, **args)
+            trainAgain, testAgain = second.importData()
+            self.assertTrue(second.splitReused)
+            self.assertEqual(first.splitKey, second.splitKey)
+            self.assertTrue(train.equals(trainAgain))
+            self.assertTrue(test.equals(testAgain))
+            third = i.Importer(splitManifestDir= manifestDir, 
+                               **dict(args, testSize= 11))
+            self.assertEqual(len(third.importData()[1]), 11)
+            self.assertFalse(third.splitReused)
+            self.assertNotEqual(first.splitKey, third.splitKey)
+            path = mf.manifestPath(manifestDir, first.splitKey)
+            with np.load(path) as manifest:
+                settings = json.loads(str(manifest['settings']))
+                testRows = manifest['test']
+            mf.writeManifest(path, np.array([0, 10 ** 6]), testRows, settings)
+            with self.assertRaises(e.ImporterException):
+                i.Importer(splitManifestDir= manifestDir, **args).importData()
+        with self.assertRaises(e.ImporterException):
+            i.Importer(splitManifestDir= 1, **args)
+        with self.assertRaises(e.ImporterException):
+            i.Importer(splitManifestDir= 'manifests', 
+                       **dict(args, extractSeed= None))
+
+    def test_xlsxStreaming(self):
+        file = 'EpiNLPpb_dev/data/MANUALXLSXTEST.xlsx'
+        whole = b.DataSet('', '', [file], 'EDPresentationDTTM', 'hospid', 
+                          'Sex', 'AgeAtPresentation', [], 
+                          ['TriageObject','TriageDescription'], 'SSH_Flag')
+        chunked = b.DataSet('', '', [file], 'EDPresentationDTTM', 'hospid', 
+                            'Sex', 'AgeAtPresentation', [], 
+                            ['TriageObject','TriageDescription'], 'SSH_Flag',
+                            chunkSize= 64)
+        wholeFrame = whole.fileToFrame(file)
+        chunkFrame = chunked.fileToFrame(file)
+        self.assertTrue(wholeFrame.equals(chunkFrame))
+        chunks = list(xl.iterChunks(file, whole.columnLabels, 64))
+        self.assertEqual([len(chunk) for chunk in chunks[:-1]], 
+                         [64] * (len(chunks) - 1))
+        with self.assertRaises(e.ColumnLabelException):
+            list(xl.iterChunks(file, ['NotAColumn'], 64))
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, 'annotate.xlsx')
+            shutil.copy(file, path)
+            xl.annotate(path, 'Sheet1', ['TriageObject'], 64,
+                        lambda records : np.array([len(str(record[0])) 
+                                                   for record in records]),
+                        'Length')
+            annotated = pd.read_excel(path)
+            original = pd.read_excel(file)
+            self.assertTrue(annotated[original.columns].equals(original))
+            self.assertTrue(annotated['Length'].equals(
+                original['TriageObject'].astype(str).str.len()))
+            workbook = openpyxl.load_workbook(path)
+            workbook['Sheet1'].column_dimensions['A'].width = 42
+            lastRow = workbook['Sheet1'].max_row
+            workbook['Sheet1'].cell(row= lastRow + 2, 
+                                    column= 1).font = openpyxl.styles.Font(
+                                        bold= True
+                                        )
+            workbook.save(path)
+            xl.annotate(path, 'Sheet1', ['TriageObject'], 64,
+                        lambda records : np.zeros(len(records), dtype= int),
+                        'Zero')
+            workbook = openpyxl.load_workbook(path)
+            self.assertEqual(workbook['Sheet1'].column_dimensions['A'].width, 42)
+            flagColumn = [cell.value for cell in workbook['Sheet1'][1]].index(
+                'Zero'
+                ) + 1
+            self.assertEqual(workbook['Sheet1'].cell(row= lastRow, 
+                                                     column= flagColumn).value,
+                             0)
+            for row in [lastRow + 1, lastRow + 2]:
+                self.assertIsNone(workbook['Sheet1'].cell(
+                    row= row, 
+                    column= flagColumn
+                    ).value)
+            workbook.close()
+            outPath = os.path.join(tempDir, 'streamed.xlsx')
+            xl.annotate(path, 'Sheet1', ['TriageObject'], 64,
+                        lambda records : np.ones(len(records), dtype= int),
+                        'One', outPath)
+            streamed = pd.read_excel(outPath)
+            self.assertTrue(streamed['One'].eq(1).all())
+            self.assertTrue(streamed['Zero'].eq(0).all())
+            self.assertNotIn('One', pd.read_excel(path).columns)
+            with self.assertRaises(e.FileException):
+                xl.annotate(path, 'Sheet1', ['TriageObject'], 64,
+                            lambda records : np.ones(len(records)), 'One', path)
+
+    def test_collapseDuplicates(self):
+        records = [['fall', 'pain'], ['cut', np.nan], ['fall', 'pain'], 
+                   ['fall', 'pain'], ['cut', 'nan'], ['Fall', 'pain']]
+        flags = [0, 1, 0, 1, 1, 0]
+        uniqueRecords, uniqueFlags, counts, inverse = b.collapseDuplicates(
+            records, 
+            flags
+            )
+        self.assertEqual(uniqueRecords, [['fall', 'pain'], ['cut', np.nan], 
+                                         ['fall', 'pain'], ['Fall', 'pain']])
+        self.assertEqual(uniqueFlags, [0, 1, 1, 0])
+        self.assertEqual(counts.tolist(), [2, 2, 1, 1])
+        self.assertEqual(inverse.tolist(), [0, 1, 0, 2, 1, 3])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+'''
+Test module for package/instrument.py.
+
+Classes:
+
+    TestInstrument
+
+Functions:
+
+    None
+
+Misc Variables:
+
+    None
+
+Exceptions:
+
+    None
+'''
+import unittest
+import json
+import os
+import tempfile
+import threading
+import tracemalloc
+
+from ..package import instrument as ins
+from ..package import exceptions as e
+from ..package.Importer import importer as i
+
+class TestInstrument(unittest.TestCase):
+    '''
+    A class of tests to check the operation of package/instrument.py.
+
+    Attributes
+    ----------
+    None
+
+    Methods
+    -------
+    test_modes()
+        Tests that each measure mode records the expected measurements and that
+        invalid modes cause exceptions.
+    test_nestedTracemalloc()
+        Tests that a stage measured inside another stage with tracemalloc
+        does not stop the outer trace.
+    test_trace()
+        Tests that spans nest, aggregate and are exported as JSON and Chrome
+        trace-event files.
+    test_importTrace()
+        Tests that importing data within a trace records a span for each stage
+        and file.
+    '''
+
+    def tearDown(self):
+        ins.setMode('RSS')
+        ins.stopTrace()
+
+    def test_modes(self):
+        for mode in ins.MEASURE_MODES:
+            ins.setMode(mode)
+            self.assertEqual(ins.getMode(), mode)
+            record = ins.startRec()
+            data = [list(range(0, 100)) for _ in range(0, 2000)]
+            time1, space = ins.stopRec(record)
+            self.assertGreaterEqual(space, 0)
+            if mode == 'OFF':
+                self.assertEqual((time1, space), (0.0, 0))
+            else:
+                self.assertGreater(time1, 0.0)
+                self.assertGreaterEqual(record.cpuTime, 0.0)
+            if mode == 'TIME':
+                self.assertEqual(space, 0)
+            if mode == 'TRACEMALLOC':
+                self.assertGreater(space, 0)
+            del data
+        self.assertFalse(tracemalloc.is_tracing())
+        with self.assertRaises(e.MeasureException):
+            ins.setMode('ALL')
+
+    def test_nestedTracemalloc(self):
+        ins.setMode('TRACEMALLOC')
+        outer = ins.startRec()
+        block = bytearray(10 ** 7)
+        del block
+        inner = ins.startRec()
+        block = bytearray(10 ** 5)
+        _, innerSpace = ins.stopRec(inner)
+        self.assertTrue(tracemalloc.is_tracing())
+        _, outerSpace = ins.stopRec(outer)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(outerSpace, 10 ** 7)
+        self.assertGreaterEqual(innerSpace, 10 ** 5)
+        self.assertLess(innerSpace, 10 ** 6)
+
+    def test_trace(self):
+        self.assertIs(ins.span('outer'), ins.NULL_SPAN)
+        tracer = ins.startTrace()
+        with ins.span('outer', 10):
+            for _ in range(0, 3):
+                with ins.span('step', 2, aggregate= True):
+                    pass
+            worker = threading.Thread(target= lambda : ins.span('worker').__enter__().__exit__())
+            worker.start()
+            worker.join()
+            record = ins.startRec('stage')
+            ins.stopRec(record, 5)
+        self.assertIs(ins.stopTrace(), tracer)
+
+        roots = tracer.toTree()
+        self.assertEqual(len(roots), 1)
+        self.assertEqual(roots[0]['name'], 'outer')
+        self.assertEqual(roots[0]['records'], 10)
+        children = {child['name'] : child for child in roots[0]['children']}
+        self.assertEqual(set(children), {'step', 'worker', 'stage'})
+        self.assertEqual(children['step']['calls'], 3)
+        self.assertEqual(children['step']['records'], 6)
+        self.assertEqual(children['stage']['records'], 5)
+
+        with tempfile.TemporaryDirectory() as traceDir:
+            path = os.path.join(traceDir, 'trace')
+            with open(tracer.writeJSON(path + '.json')) as file:
+                self.assertEqual(json.load(file)['spans'], roots)
+            with open(tracer.writeChromeTrace(path + '.trace.json')) as file:
+                events = json.load(file)['traceEvents']
+        self.assertEqual(len(events), 4)
+        self.assertTrue(all(event['ph'] == 'X' for event in events))
+
+    def test_importTrace(self):
+        importer = i.Importer(fileLocations= ['EpiNLPpb_dev/data/KEYWORD1.csv', 
+                                              'EpiNLPpb_dev/data/KEYWORD2.csv'],
+                              textFieldColumnLabels= ['TriageObject','TriageDescription'],
+                              flagColumnLabel= 'SSH_Flag',
+                              trainSize= 20,
+                              testSize= 10)
+        tracer = ins.startTrace()
+        importer.importData()
+        ins.stopTrace()
+        names = [span['name'] for span in tracer.toTree()]
+        self.assertEqual(names, ['import', 'filter', 'extractTrain', 'extractTest'])
+        reads = tracer.toTree()[0]['children']
+        self.assertEqual([span['name'] for span in reads], 
+                         ['read KEYWORD1.csv', 'read KEYWORD2.csv'])
+        self.assertEqual(sum(span['records'] for span in reads), 
+                         tracer.toTree()[0]['records'])
+        importer.importData()
+        self.assertIsNone(ins.NULL_SPAN.records)
+
+if __name__ == '__main__':
+    unittest.main()
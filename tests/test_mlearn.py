@@ -18,6 +18,7 @@ Exceptions:
     None
 '''
 import unittest
+import numpy as np
 from scipy import sparse
 
 from ..package.mlearn import mlearn as m
@@ -64,6 +65,10 @@ class TestMlearn(unittest.TestCase):
         an exception.
     test_modelOutputResults()
         Tests the using the model to predict vectors outputs values in range.
+    test_sampleWeight()
+        Tests that training on weighted unique vectors predicts the same flags
+        as training on repeated vectors and that invalid weights cause 
+        exceptions.
     '''
     def test_noError(self):
         ml = m.MLearn(mlAlgType= 'DECISIONTREE',
@@ -363,5 +368,26 @@ class TestMlearn(unittest.TestCase):
         for flag in predictedFlags:
             self.assertTrue(flag in [0,1])
 
+    def test_sampleWeight(self):
+        vectors = sparse.csr_matrix([[0,1],[1,1],[1,0],[2,2]])
+        flags = [0,1,1,0]
+        weights = np.array([3,1,2,1])
+        rows = np.repeat(np.arange(4), weights)
+        testVectors = sparse.csr_matrix([[0,0],[1,1],[2,1],[0,2],[2,0]])
+        weighted = m.MLearn(mlAlgType= 'DECISIONTREE', 
+                            macLearnInput= {'impurity' : 'gini'})
+        weightedFlags, _ = weighted.trainAndPredict(vectors, flags, 
+                                                    testVectors, weights)
+        repeated = m.MLearn(mlAlgType= 'DECISIONTREE', 
+                            macLearnInput= {'impurity' : 'gini'})
+        repeatedFlags, _ = repeated.trainAndPredict(vectors[rows], 
+                                                    [flags[i] for i in rows], 
+                                                    testVectors)
+        self.assertTrue(np.array_equal(weightedFlags, repeatedFlags))
+        with self.assertRaises(e.SampleWeightException):
+            weighted.trainAndPredict(vectors, flags, testVectors, [1,1])
+        with self.assertRaises(e.SampleWeightException):
+            weighted.trainAndPredict(vectors, flags, testVectors, [1,-1,1,1])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -20,7 +20,9 @@ Exceptions:
 import unittest
 
 from ..package.vectorise import nltkvectorise as nv
+from ..package.vectorise import vectorise as v
 from ..package.vectorise import constants as c
+from ..package.vectorise import sketch as sk
 
 class TestNLTKVectorise(unittest.TestCase):
     '''
@@ -57,6 +59,20 @@ class TestNLTKVectorise(unittest.TestCase):
         Tests that reconstruct behaves as expected.
     test_bagOfWords()
         Tests that bagOfWords behaves as expected.
+    test_bagOfTokens()
+        Tests that bagOfTokens produces the same vectors from the corpus 
+        tokens of each record as bagOfWords does from their text.
+    test_hashedBagOfWords()
+        Tests that the hashing vectorisers produce a fixed number of features
+        matching the counts of the fitted vectorisers, and that counts hashed
+        separately give the same vectors.
+    test_sketchVocabulary()
+        Tests that sketched frequencies are never below the true frequencies
+        and that the sketched vocabulary keeps every n-gram the exact one 
+        does.
+    test_posTagSents()
+        Tests that tagging texts in batches, in one or more processes, 
+        produces the same vectors as tagging them one at a time.
     '''
      
     def test_wordTokeniser(self):
@@ -191,5 +207,109 @@ class TestNLTKVectorise(unittest.TestCase):
         self.assertEqual(len(trainRecords), trainVecs.shape[0])
         self.assertEqual(len(testRecords), testVecs.shape[0])
 
+    def test_bagOfTokens(self):
+        trainRecords = [['','',0],
+                        ['The quick brown','fox jumps over the lazy dog',0],
+                        ['She sells sea','shells by the sea shore.',0]]
+        testRecords = [['Peter piper picked a peck','of pickled peppers',0],
+                       ['Red leather','yellow-leather',0]]
+        for corpusLevelLA in ['BAG_OF_WORDS_C', 'BAG_OF_WORDS_F']:
+            vect = c.BOW_VECTORISERS[corpusLevelLA]
+            corpus = v.Vectorise(corpusLevelLA= corpusLevelLA)
+            trainTokens = [corpus.corpusTokens(record) 
+                           for record in trainRecords]
+            testTokens = [corpus.corpusTokens(record) 
+                          for record in testRecords]
+            self.assertEqual(trainTokens[1], 
+                             ['The quick brownfox jumps over the lazy dog0'])
+            trainVecs, testVecs, vectoriser = nv.bagOfWords(trainRecords, 
+                                                            testRecords, 
+                                                            vect, False, 
+                                                            (1,2))
+            trainToks, testToks, tokVectoriser = nv.bagOfTokens(trainTokens, 
+                                                                testTokens, 
+                                                                vect, (1,2))
+            self.assertEqual(vectoriser.vocabulary_, 
+                             tokVectoriser.vocabulary_)
+            self.assertEqual((trainVecs != trainToks).nnz, 0)
+            self.assertEqual((testVecs != testToks).nnz, 0)
+
+    def test_hashedBagOfWords(self):
+        trainTokens = [[], ['The', 'quick', 'brown', 'fox', 'the'],
+                       ['She', 'sells', 'sea', 'shells', 'sea']]
+        testTokens = [['Peter', 'piper', 'picked', 'a', 'peck'], ['red']]
+        countVecs, _, _ = nv.bagOfTokens(trainTokens, testTokens, 
+                                         'COUNT', (1,2))
+        for vect in ['HASH_COUNT', 'HASH_FREQ']:
+            trainVecs, testVecs, vectoriser = nv.bagOfTokens(trainTokens, 
+                                                             testTokens, 
+                                                             vect, (1,2), 
+                                                             2 ** 12)
+            self.assertEqual(trainVecs.shape, (len(trainTokens), 2 ** 12))
+            self.assertEqual(testVecs.shape, (len(testTokens), 2 ** 12))
+            self.assertFalse(hasattr(vectoriser, 'vocabulary_'))
+            self.assertEqual((vectoriser.transform(testTokens) 
+                              != testVecs).nnz, 0)
+            hasher = nv.hashingVectoriser('HASH_COUNT', (1,2), 2 ** 12)
+            hashedTrain, hashedTest, _ = nv.hashedBagOfWords(
+                hasher.transform(trainTokens),
+                hasher.transform(testTokens),
+                vect, (1,2), 2 ** 12
+                )
+            self.assertEqual((hashedTrain != trainVecs).nnz, 0)
+            self.assertEqual((hashedTest != testVecs).nnz, 0)
+        hashedCounts = hasher.transform(trainTokens)
+        self.assertEqual(sorted(hashedCounts.data.tolist()), 
+                         sorted(countVecs.data.tolist()))
+
+    def test_sketchVocabulary(self):
+        trainTokens = [['the', 'quick', 'brown', 'fox'],
+                       ['the', 'lazy', 'dog'],
+                       ['the', 'quick', 'dog', 'the'],
+                       ['sea', 'shells']]
+        testTokens = [['the', 'quick', 'fox']]
+        analyser = nv.TokenAnalyser((1,2))
+        sketch = sk.CountMinSketch(8, 2)
+        grams = [gram for tokens in trainTokens for gram in analyser(tokens)]
+        indices = sketch.indices(grams)
+        sketch.add(indices, [1] * len(grams))
+        estimates = sketch.estimate(indices).tolist()
+        for gram, estimate in zip(grams, estimates):
+            self.assertGreaterEqual(estimate, grams.count(gram))
+        _, _, exact = nv.bagOfTokens(trainTokens, testTokens, 'COUNT', (1,2),
+                                     minDF= 2)
+        self.assertEqual(sorted(exact.vocabulary_), 
+                         ['dog', 'fox', 'quick', 'the', 'the quick'])
+        for width in [2, 2 ** 16]:
+            vocabulary = sk.sketchVocabulary(trainTokens + testTokens, 
+                                             analyser, width, minDF= 2)
+            self.assertTrue(set(exact.vocabulary_).issubset(vocabulary))
+        for minDF, maxDF, maxFeatures in [(2, 1.0, None), (1, 0.5, None), 
+                                          (1, 1.0, 1), (0.5, 4, 1)]:
+            _, testVecs, exact = nv.bagOfTokens(trainTokens, testTokens, 
+                                                'COUNT', (1,2), 
+                                                minDF= minDF, 
+                                                maxDF= maxDF, 
+                                                maxFeatures= maxFeatures)
+            _, sketchTest, sketched = nv.bagOfTokens(trainTokens, testTokens,
+                                                     'COUNT', (1,2), 
+                                                     minDF= minDF, 
+                                                     maxDF= maxDF, 
+                                                     maxFeatures= maxFeatures,
+                                                     sketchWidth= 2 ** 16)
+            self.assertEqual(sketched.vocabulary_, exact.vocabulary_)
+            self.assertEqual((sketchTest != testVecs).nnz, 0)
+
+    def test_posTagSents(self):
+        texts = ['The-quick brown, fox "jumps" over the lazy dog.',
+                 'She sells sea shells by the sea shore',
+                 '']
+        sentences = [nv.wordTokeniser(text) for text in texts] * 1000
+        vectors = [nv.posTag(tokens) for tokens in sentences]
+        self.assertEqual(nv.posTagSents(sentences), vectors)
+        self.assertEqual(nv.posTagSents(sentences, 2), vectors)
+        self.assertIs(nv.getTagger(), nv.getTagger())
+        self.assertEqual(vectors[2], [-2] * c.MAX_TOKENS)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
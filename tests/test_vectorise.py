@@ -18,8 +18,21 @@ Exceptions:
     None
 '''
 import unittest
+import pickle
+import os
+import tempfile
+import numpy as np
+from scipy import sparse
 
 from ..package.vectorise import vectorise as v
+from ..package.vectorise import nltkvectorise as n
+from ..package.vectorise import memo as mm
+from ..package.vectorise import constants as c
+from ..package.vectorise import base as b
+from ..package.vectorise import keywords as kw
+from ..package.vectorise import cache as vca
+from ..package.Importer import base as ib
+from ..package.mlearn import mlearn as m
 from ..package import exceptions as e
 
 class TestVectorise(unittest.TestCase):
@@ -72,6 +85,57 @@ class TestVectorise(unittest.TestCase):
     test_vectorise()
         Tests that vectorise produces the correct number of vectors and vectors 
         of the same length.
+    test_sharedTokens()
+        Tests that vectors built from the tokens shared between techniques 
+        match vectors built by tokenising each field again.
+    test_corpusFeatures()
+        Tests that the bag of words features match those of the text-based
+        pipeline in bagOfWords for every tokeniser.
+    test_batchedPosTag()
+        Tests that vectorising records with batched POS tagging matches 
+        building each record's vector alone and that invalid tagWorkers inputs
+        cause exceptions.
+    test_tokenMemo()
+        Tests that memoised stems and stopword checks match computing them 
+        again, that hits and the memo size bound are counted and kept, that 
+        the memo is only pickled when persistMemo is set and that invalid 
+        memo inputs cause exceptions.
+    test_directCSR()
+        Tests that the CSR matrix written from preallocated feature blocks 
+        matches the vectors built as lists and that overlong fields are 
+        truncated to the fixed feature layout.
+    test_asciiEncoder()
+        Tests that batches of texts are encoded into fixed width int16 arrays
+        and sparse matrices which match converting each text alone.
+    test_keywordMatcher()
+        Tests that the compiled keyword matcher, on single texts and batches,
+        matches checking each keyword group separately.
+    test_parallelVectorise()
+        Tests that vectorising across process and thread pools matches 
+        vectorising serially and that invalid vectWorkers and poolType inputs
+        cause exceptions.
+    test_hashing()
+        Tests that the HASHING techniques produce hashFeatures bag of words 
+        features, match in parallel and that invalid hashFeatures inputs cause
+        exceptions.
+    test_boundedVocabulary()
+        Tests that the vocabulary options bound the bag of words features,
+        with and without a sketch, and that invalid inputs and options which
+        prune every n-gram cause exceptions.
+    test_vectCache()
+        Tests that vectors assembled from cached blocks match freshly fitted
+        ones, that changed records or settings miss only the blocks they 
+        change, that the least recently used blocks are evicted and that 
+        invalid inputs cause exceptions.
+    test_featureMatrix()
+        Tests that vectors are CSR matrices with the chosen value and index
+        dtypes and that invalid dtypes cause exceptions.
+    test_vectoriseIter()
+        Tests that streaming records in batches gives the vectors of 
+        vectoriseList, counts its throughput and rejects invalid batch sizes.
+    test_collapsedCorpus()
+        Tests that collapsed records weighted by their multiplicities give the
+        bag of words features and predictions of the uncollapsed records.
     '''
     
     def test_noError(self):
@@ -413,5 +477,478 @@ class TestVectorise(unittest.TestCase):
         self.assertEqual(trainVects.shape[0], len(trainRecords))
         self.assertEqual(testVects.shape[0], len(testRecords))
 
+    def test_sharedTokens(self):
+        trainRecords = [['','',0],
+                        ['The quick brown',
+                         'fox jumps over the lazy dog',0],
+                        ['She sells sea','shells by the sea shore',0]]
+        testRecords = [['Peter piper picked a peck',
+                        'of pickled peppers',0],
+                       ['Red leather','yellow leather',0]]
+        vect = v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                           preLAChanges= ['REMOVE_STOPWORDS', 'STEMMING'],
+                           textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'],
+                           corpusLevelLA= 'MOD_BAG_OF_WORDS_C')
+        trainVects, testVects = vect.vectorise(trainRecords, testRecords)
+        for record in testRecords:
+            self.assertEqual(vect.recordToVector(record), 
+                             vect.recordToVector(record, 
+                                                 vect.tokeniseRecord(record)))
+        self.assertEqual((vect.vectoriseList(testRecords) 
+                          != testVects.tocsr()).nnz, 0)
+
+    def test_corpusFeatures(self):
+        trainRecords = [['','',0],
+                        ['I cannot stop.','we are gonna fall',0],
+                        ['She sells sea','shells by the sea shore.',0]]
+        testRecords = [['Peter piper picked a peck',
+                        'of pickled peppers',0],
+                       ['Red leather','yellow-leather',0]]
+        for tokeniser in ['WORD_TOKENISER', 'PUNC_TOKENISER', '']:
+            for corpusLevelLA, vect, mod in [
+                ('BAG_OF_WORDS_C', 'COUNT', False),
+                ('BAG_OF_WORDS_F', 'FREQ', False),
+                ('MOD_BAG_OF_WORDS_C', 'COUNT', True),
+                ('MOD_BAG_OF_WORDS_F', 'FREQ', True)]:
+                vectoriser = v.Vectorise(tokeniser= tokeniser,
+                                         preLAChanges= ['STEMMING'],
+                                         corpusLevelLA= corpusLevelLA)
+                trainVects, testVects = vectoriser.vectorise(trainRecords, 
+                                                             testRecords)
+                trainWords, testWords, words = n.bagOfWords(trainRecords,
+                                                            testRecords,
+                                                            vect, mod, (1,1))
+                self.assertEqual(vectoriser.vectoriser.vocabulary_, 
+                                 words.vocabulary_)
+                width = len(words.vocabulary_)
+                self.assertTrue(np.allclose(trainVects[:, 0:width].toarray(), 
+                                            trainWords.toarray()))
+                self.assertTrue(np.allclose(testVects[:, 0:width].toarray(), 
+                                            testWords.toarray()))
+        vectoriser = v.Vectorise(tokeniser= 'WORD_TOKENISER',
+                                 corpusLevelLA= 'BAG_OF_WORDS_C')
+        vectoriser.vectorise(trainRecords, testRecords)
+        self.assertIn('cannot', vectoriser.vectoriser.vocabulary_)
+        self.assertIn('gonna', vectoriser.vectoriser.vocabulary_)
+        self.assertNotIn('na', vectoriser.vectoriser.vocabulary_)
+
+    def test_batchedPosTag(self):
+        trainRecords = [['','',0],
+                        ['The quick brown',
+                         'fox jumps over the lazy dog',0],
+                        ['She sells sea','shells by the sea shore',0]]
+        testRecords = [['Peter piper picked a peck',
+                        'of pickled peppers',0],
+                       ['Red leather','yellow leather',0]]
+        for tagWorkers in [1, 2]:
+            vect = v.Vectorise(tokeniser= 'WORD_TOKENISER',
+                               preLAChanges= ['STEMMING'],
+                               tokenLevelLA= ['POS_TAG'],
+                               textLevelLA= ['KEYWORDS'],
+                               tagWorkers= tagWorkers)
+            trainVects, testVects = vect.vectorise(trainRecords, testRecords)
+            self.assertEqual(trainVects.toarray().tolist(), 
+                             [vect.recordToVector(record) 
+                              for record in trainRecords])
+            self.assertEqual(testVects.toarray().tolist(), 
+                             [vect.recordToVector(record) 
+                              for record in testRecords])
+        with self.assertRaises(e.TokenLevelException):
+            v.Vectorise(tokeniser= 'WORD_TOKENISER',
+                        tokenLevelLA= ['POS_TAG'],
+                        tagWorkers= 0)
+
+    def test_tokenMemo(self):
+        tokens = ['The', 'running', 'dogs', 'and', 'the', 'running', 'cats']
+        memo = mm.TokenMemo(3)
+        for _ in range(0, 2):
+            self.assertEqual(memo.removeStop(tokens), n.removeStop(tokens))
+            self.assertEqual(memo.stem(tokens), n.stem(tokens))
+        rates = memo.hitRates()
+        self.assertEqual(rates['stem']['lookups'], 2 * len(tokens))
+        self.assertEqual(rates['stem']['size'], 3)
+        self.assertGreater(rates['stem']['hitRate'], 0)
+        self.assertEqual(mm.TokenMemo(0).stem(tokens), n.stem(tokens))
+
+        records = [['The running dogs','and the running cats',0]]
+        for persistMemo in [False, True]:
+            vect = v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                               preLAChanges= ['REMOVE_STOPWORDS', 'STEMMING'],
+                               corpusLevelLA= 'BAG_OF_WORDS_C',
+                               persistMemo= persistMemo)
+            trainVects, _ = vect.vectorise(records, records)
+            loaded = pickle.loads(pickle.dumps(vect))
+            self.assertEqual(len(loaded.memo.stems) > 0, persistMemo)
+            self.assertEqual((loaded.vectoriseList(records) 
+                              != trainVects.tocsr()).nnz, 0)
+        with self.assertRaises(e.PreLAException):
+            v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                        preLAChanges= ['STEMMING'],
+                        memoSize= -1)
+        with self.assertRaises(e.PreLAException):
+            v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                        preLAChanges= ['STEMMING'],
+                        persistMemo= 1)
+
+    def test_directCSR(self):
+        records = [['','',0],
+                   ['The quick brown suicide','fox jumps over the lazy dog',0],
+                   ['naïve café','\x00 overdose',0]]
+        vect = v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                           preLAChanges= ['STEMMING'],
+                           textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'],
+                           corpusLevelLA= 'BAG_OF_WORDS_C')
+        trainVects, testVects = vect.vectorise(records, records)
+        self.assertEqual(trainVects.format, 'csr')
+        self.assertEqual(trainVects.shape[1], 
+                         len(vect.vectoriser.vocabulary_) 
+                         + 3 * vect.fieldWidth())
+        handCrafted = trainVects[:, len(vect.vectoriser.vocabulary_):]
+        self.assertEqual(handCrafted.toarray().tolist(),
+                         [vect.recordToVector(record) for record in records])
+        self.assertEqual(handCrafted.nnz, 
+                         sum(value != 0 for record in records 
+                             for value in vect.recordToVector(record)))
+
+        vect = v.Vectorise(textLevelLA= ['ASCII_CONVERSION'])
+        vectors = vect.vectoriseList([['a' * (c.MAX_CHARS + 10)]])
+        self.assertEqual(vectors.shape, (1, c.MAX_CHARS))
+        self.assertEqual(vectors.toarray().tolist()[0], [ord('a')] * c.MAX_CHARS)
+
+    def test_asciiEncoder(self):
+        texts = ['', 'Overdose', 'naïve café \x00', 'a' * (c.MAX_CHARS + 10), 5]
+        codes = b.asciiEncode(texts)
+        self.assertEqual(codes.shape, (len(texts), c.MAX_CHARS))
+        self.assertEqual(codes.dtype.name, 'int16')
+        self.assertEqual(codes.tolist(), 
+                         [b.asciiConversion(text) for text in texts])
+        self.assertEqual(codes[1].tolist()[0:9], 
+                         [ord(char) for char in 'Overdose'] + [0])
+        matrix = b.asciiSparse(texts)
+        self.assertEqual(matrix.toarray().tolist(), codes.tolist())
+        self.assertEqual(matrix.nnz, int((codes != 0).sum()))
+        self.assertEqual(b.asciiEncode(['\U0001F600'])[0, 0], 32767)
+
+    def test_keywordMatcher(self):
+        texts = ['', 'Took an OVERDOSE', 'self harm by lacerations', 
+                 'selfharm, self-harm', 'hanging herself', 'xtosh od.', 5]
+        expected = [[int(b.wordCheck(words, str(text).lower())) 
+                     for words in c.KEYWORDS] for text in texts]
+        self.assertEqual([b.keyWordCheck(text) for text in texts], expected)
+        self.assertEqual(b.keywordBatch(texts).tolist(), expected)
+
+        groups = [['ab', 'abc'], ['b'], ['abcd'], [], ['c', 'ab']]
+        matcher = kw.KeywordMatcher(groups)
+        texts = ['abc', 'xabcd', 'ab c', 'b', '']
+        expected = [[int(b.wordCheck(words, text)) for words in groups] 
+                    for text in texts]
+        self.assertEqual([matcher.check(text) for text in texts], expected)
+        self.assertEqual(matcher.checkBatch(texts).tolist(), expected)
+
+    def test_parallelVectorise(self):
+        trainRecords = [['','',0],
+                        ['The quick brown suicide',
+                         'fox jumps over the lazy dog',0],
+                        ['She sells sea','shells by the sea shore',0]]
+        testRecords = [['Peter piper picked a peck',
+                        'of pickled peppers overdose',0],
+                       ['Red leather','yellow leather',0],
+                       ['naïve café','self harm',0]]
+        options = dict(tokeniser= 'PUNC_TOKENISER',
+                       preLAChanges= ['REMOVE_STOPWORDS', 'STEMMING'],
+                       textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'],
+                       corpusLevelLA= 'MOD_BAG_OF_WORDS_F')
+        vect = v.Vectorise(**options)
+        trainVects, testVects = vect.vectorise(trainRecords, testRecords)
+        listVects = vect.vectoriseList(testRecords)
+        for poolType in c.POOL_TYPES:
+            parallel = v.Vectorise(**options, 
+                                   vectWorkers= 2, 
+                                   poolType= poolType)
+            outputs = parallel.vectorise(trainRecords, testRecords)
+            outputs += (parallel.vectoriseList(testRecords),)
+            for output, expected in zip(outputs, 
+                                        [trainVects, testVects, listVects]):
+                self.assertEqual(output.shape, expected.shape)
+                self.assertEqual(output.dtype, expected.dtype)
+                self.assertEqual((output != expected).nnz, 0)
+        with self.assertRaises(e.WorkersException):
+            v.Vectorise(textLevelLA= ['KEYWORDS'], vectWorkers= 0)
+        with self.assertRaises(e.VectoriseException):
+            v.Vectorise(textLevelLA= ['KEYWORDS'], poolType= 'GPU')
+
+    def test_hashing(self):
+        trainRecords = [['','',0],
+                        ['The quick brown','fox jumps over the lazy dog',0],
+                        ['She sells sea','shells by the sea shore',0]]
+        testRecords = [['Peter piper picked a peck','of pickled peppers',0],
+                       ['Red leather','yellow leather',0],
+                       ['Red leather','yellow leather',0]]
+        for corpusLevelLA in ['HASHING_C', 'HASHING_F']:
+            options = dict(tokeniser= 'PUNC_TOKENISER',
+                           textLevelLA= ['KEYWORDS'],
+                           corpusLevelLA= corpusLevelLA,
+                           ngramRange= (1,3),
+                           hashFeatures= 2 ** 10)
+            vect = v.Vectorise(**options)
+            trainVects, testVects = vect.vectorise(trainRecords, testRecords)
+            self.assertEqual(trainVects.shape[1], 
+                             2 ** 10 + 3 * len(c.KEYWORDS))
+            self.assertEqual((vect.vectoriseList(testRecords) 
+                              != testVects).nnz, 0)
+            parallel = v.Vectorise(**options, 
+                                   vectWorkers= 2, 
+                                   poolType= 'THREAD')
+            parallelTrain, parallelTest = parallel.vectorise(trainRecords, 
+                                                             testRecords)
+            self.assertEqual((parallelTrain != trainVects).nnz, 0)
+            self.assertEqual((parallelTest != testVects).nnz, 0)
+        with self.assertRaises(e.CorpusLevelException):
+            v.Vectorise(corpusLevelLA= 'HASHING_C', hashFeatures= 0)
+
+    def test_boundedVocabulary(self):
+        trainRecords = [['The quick brown','fox jumps over the lazy dog',0],
+                        ['The lazy','dog sleeps',0],
+                        ['She sells sea','shells by the sea shore',0]]
+        testRecords = [['The quick','dog',0],
+                       ['Red leather','yellow leather',0]]
+        for corpusLevelLA in ['BAG_OF_WORDS_C', 'BAG_OF_WORDS_F']:
+            options = dict(tokeniser= 'PUNC_TOKENISER',
+                           textLevelLA= ['KEYWORDS'],
+                           corpusLevelLA= corpusLevelLA,
+                           ngramRange= (1,2))
+            full, _ = v.Vectorise(**options).vectorise(trainRecords, 
+                                                        testRecords)
+            for sketchWidth in [0, 2 ** 16]:
+                vect = v.Vectorise(**options, 
+                                   maxFeatures= 3,
+                                   sketchWidth= sketchWidth)
+                trainVects, testVects = vect.vectorise(trainRecords, 
+                                                       testRecords)
+                self.assertEqual(trainVects.shape[1], 
+                                 3 + 3 * len(c.KEYWORDS))
+                self.assertIn('the', vect.vectoriser.vocabulary_)
+                self.assertEqual((vect.vectoriseList(testRecords) 
+                                  != testVects).nnz, 0)
+                vect = v.Vectorise(**options, 
+                                   minDF= 2,
+                                   sketchWidth= sketchWidth)
+                trainVects, _ = vect.vectorise(trainRecords, testRecords)
+                self.assertEqual(list(vect.vectoriser.vocabulary_), ['the'])
+                self.assertLess(trainVects.shape[1], full.shape[1])
+                vect = v.Vectorise(**options, 
+                                   maxDF= 0.7,
+                                   sketchWidth= sketchWidth)
+                vect.vectorise(trainRecords, testRecords)
+                self.assertNotIn('the', vect.vectoriser.vocabulary_)
+                self.assertIn('lazy', vect.vectoriser.vocabulary_)
+                for thresholds in [dict(minDF= 20), dict(maxDF= 0.1)]:
+                    vect = v.Vectorise(**options,
+                                       **thresholds,
+                                       sketchWidth= sketchWidth)
+                    with self.assertRaisesRegex(e.CorpusLevelException,
+                                                c.EMPTY_VOCABULARY):
+                        vect.vectorise(trainRecords, testRecords)
+                    with self.assertRaisesRegex(e.CorpusLevelException,
+                                                c.EMPTY_VOCABULARY):
+                        vect.vectorise(trainRecords, testRecords, 
+                                       np.full(len(trainRecords), 2))
+        for options in [dict(minDF= 0), dict(minDF= 1.5), dict(maxDF= -1),
+                        dict(maxDF= '1'), dict(maxFeatures= 0), 
+                        dict(sketchWidth= -1), dict(sketchWidth= 1.5)]:
+            with self.assertRaises(e.CorpusLevelException):
+                v.Vectorise(corpusLevelLA= 'BAG_OF_WORDS_C', **options)
+
+    def test_vectCache(self):
+        trainRecords = [['The quick brown','fox jumps over the lazy dog'],
+                        ['She sells sea','shells by the sea shore']]
+        testRecords = [['Peter piper picked a peck','of pickled peppers'],
+                       ['Red leather', float('nan')]]
+        options = dict(tokeniser= 'PUNC_TOKENISER',
+                       textLevelLA= ['KEYWORDS'],
+                       corpusLevelLA= 'BAG_OF_WORDS_F',
+                       ngramRange= (1,2))
+        expectedTrain, expectedTest = v.Vectorise(**options).vectorise(
+            trainRecords, testRecords
+            )
+        with tempfile.TemporaryDirectory() as cacheDir:
+            for _ in range(0, 2):
+                vect = v.Vectorise(**options, vectCacheDir= cacheDir)
+                trainVects, testVects = vect.vectorise(trainRecords, 
+                                                       testRecords)
+                self.assertEqual((trainVects != expectedTrain).nnz, 0)
+                self.assertEqual((testVects != expectedTest).nnz, 0)
+                self.assertEqual((vect.vectoriseList(testRecords) 
+                                  != expectedTest).nnz, 0)
+                self.assertEqual(len(os.listdir(cacheDir)), 6)
+            parallel = v.Vectorise(**options, 
+                                   vectWorkers= 2, 
+                                   poolType= 'THREAD',
+                                   vectCacheDir= cacheDir)
+            parallel.vectorise(trainRecords, testRecords)
+            self.assertEqual(len(os.listdir(cacheDir)), 6)
+            v.Vectorise(**options, vectCacheDir= cacheDir).vectorise(
+                trainRecords[0:1], testRecords
+                )
+            self.assertEqual(len(os.listdir(cacheDir)), 12)
+            v.Vectorise(**options, minDF= 2, vectCacheDir= cacheDir).vectorise(
+                trainRecords, testRecords
+                )
+            self.assertEqual(len(os.listdir(cacheDir)), 15)
+            v.Vectorise(**dict(options, tokeniser= 'WORD_TOKENISER'), 
+                        vectCacheDir= cacheDir).vectorise(trainRecords, 
+                                                          testRecords)
+            self.assertEqual(len(os.listdir(cacheDir)), 15)
+            asciiOptions = dict(options, 
+                                textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'])
+            asciiTrain, asciiTest = v.Vectorise(**asciiOptions).vectorise(
+                trainRecords, testRecords
+                )
+            trainVects, testVects = v.Vectorise(
+                **asciiOptions, 
+                vectCacheDir= cacheDir
+                ).vectorise(trainRecords, testRecords)
+            self.assertEqual(len(os.listdir(cacheDir)), 18)
+            self.assertEqual((trainVects != asciiTrain).nnz, 0)
+            self.assertEqual((testVects != asciiTest).nnz, 0)
+            configs = v.Vectorise(**asciiOptions, 
+                                  tokenLevelLA= ['POS_TAG']).blockConfigs()
+            self.assertEqual(configs['KEYWORDS']['keywords'], c.KEYWORDS)
+            self.assertEqual(configs['ASCII_CONVERSION']['maxChars'], 
+                             c.MAX_CHARS)
+            self.assertEqual(configs['POS_TAG']['maxTokens'], c.MAX_TOKENS)
+            oldest = vca.cachePath(cacheDir, 
+                                   vca.recordsFingerprint(trainRecords, 
+                                                          testRecords),
+                                   c.CORPUS_BLOCK,
+                                   vect.blockConfigs()[c.CORPUS_BLOCK])
+            for file in vca.entryFiles(oldest):
+                os.utime(file, ns= (0, 0))
+            cacheSize = sum(os.path.getsize(os.path.join(cacheDir, file))
+                            for file in os.listdir(cacheDir))
+            self.assertEqual(vca.evictCache(cacheDir, cacheSize - 1), 
+                             [oldest])
+            self.assertEqual(len(os.listdir(cacheDir)), 15)
+            self.assertIsNone(vca.readCache(oldest))
+            vect = v.Vectorise(**options, vectCacheDir= cacheDir)
+            trainVects, _ = vect.vectorise(trainRecords, testRecords)
+            self.assertEqual(len(os.listdir(cacheDir)), 18)
+            self.assertEqual((trainVects != expectedTrain).nnz, 0)
+        for options in [dict(vectCacheDir= 1), dict(vectCacheSize= 0)]:
+            with self.assertRaises(e.VectoriseException):
+                v.Vectorise(textLevelLA= ['KEYWORDS'], **options)
+
+    def test_featureMatrix(self):
+        coo = sparse.coo_matrix(np.array([[0, 3], [2, 0]], dtype= np.int64))
+        matrix = b.featureMatrix(coo, 'float32', 'int32')
+        self.assertEqual(matrix.format, 'csr')
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertEqual(matrix.indices.dtype, np.int32)
+        self.assertEqual(matrix.indptr.dtype, np.int32)
+        self.assertEqual(matrix.toarray().tolist(), [[0, 3], [2, 0]])
+        wide = b.featureMatrix(matrix, 'float64', 'int64')
+        self.assertEqual(wide.dtype, np.float64)
+        self.assertEqual(wide.indices.dtype, np.int64)
+        self.assertEqual(matrix.indices.dtype, np.int32)
+        trainRecords = [['The quick brown','fox jumps over the lazy dog'],
+                        ['She sells sea','shells by the sea shore']]
+        testRecords = [['Red leather','yellow leather']]
+        for featureDtype, indexDtype in [('float32', 'int32'), 
+                                         ('float64', 'int64')]:
+            vect = v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                               textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'],
+                               corpusLevelLA= 'BAG_OF_WORDS_F',
+                               featureDtype= featureDtype,
+                               indexDtype= indexDtype)
+            vectors = list(vect.vectorise(trainRecords, testRecords))
+            vectors.append(vect.vectoriseList(testRecords))
+            for matrix in vectors:
+                self.assertEqual(matrix.format, 'csr')
+                self.assertEqual(matrix.dtype, featureDtype)
+                self.assertEqual(matrix.indices.dtype, indexDtype)
+                self.assertEqual(matrix.indptr.dtype, indexDtype)
+        for options in [dict(featureDtype= 'int64'), 
+                        dict(indexDtype= 'int16')]:
+            with self.assertRaises(e.VectoriseException):
+                v.Vectorise(textLevelLA= ['KEYWORDS'], **options)
+
+    def test_vectoriseIter(self):
+        trainRecords = [['The quick brown','fox jumps over the lazy dog'],
+                        ['She sells sea','shells by the sea shore']]
+        testRecords = [['Red leather','yellow leather'],
+                       ['The lazy fox','sells leather'],
+                       ['Sea shells','by the quick dog'],
+                       ['Yellow','brown'],
+                       ['Quick','shore']]
+        vect = v.Vectorise(tokeniser= 'PUNC_TOKENISER',
+                           textLevelLA= ['KEYWORDS', 'ASCII_CONVERSION'],
+                           corpusLevelLA= 'BAG_OF_WORDS_C')
+        vect.vectorise(trainRecords, testRecords)
+        listVects = vect.vectoriseList(testRecords)
+        blocks = list(vect.vectoriseIter(iter(testRecords), 2))
+        self.assertEqual([block.shape[0] for block in blocks], [2, 2, 1])
+        for block in blocks:
+            self.assertEqual(block.format, 'csr')
+            self.assertEqual(block.dtype, listVects.dtype)
+        self.assertEqual((sparse.vstack(blocks) != listVects).nnz, 0)
+        throughput = vect.iterThroughput()
+        self.assertEqual(throughput['records'], 5)
+        self.assertEqual(throughput['batches'], 3)
+        self.assertGreater(throughput['seconds'], 0)
+        self.assertEqual(list(vect.vectoriseIter([], 2)), [])
+        self.assertEqual(vect.iterThroughput()['recordsPerSecond'], 0)
+        for batchSize in [0, -1, 2.0, True]:
+            with self.assertRaises(e.VectoriseException):
+                vect.vectoriseIter(testRecords, batchSize)
+
+
+    def test_collapsedCorpus(self):
+        trainRecords = [['She sells sea','shells by the sea shore'],
+                        ['Red leather','yellow leather'],
+                        ['She sells sea','shells by the sea shore'],
+                        ['Peter piper picked','a peck of pickled peppers'],
+                        ['She sells sea','shells by the sea shore'],
+                        ['Red leather','yellow leather'],
+                        ['The quick brown','fox jumps over the lazy dog']]
+        trainFlags = [1, 0, 1, 0, 1, 0, 0]
+        testRecords = [['Red sea shells','by the lazy dog'],
+                       ['She picked','yellow peppers']]
+        uniqueRecords, uniqueFlags, sampleWeight, inverse = ib.collapseDuplicates(
+            trainRecords,
+            trainFlags
+            )
+        for corpusLevelLA in ['BAG_OF_WORDS_F', 'HASHING_F']:
+            for options in [dict(),
+                            dict(minDF= 2),
+                            dict(maxDF= 0.3, maxFeatures= 6),
+                            dict(minDF= 2, sketchWidth= 64)]:
+                vect = v.Vectorise(tokeniser= 'WORD_TOKENISER',
+                                   corpusLevelLA= corpusLevelLA,
+                                   hashFeatures= 64,
+                                   **options)
+                trainVects, testVects = vect.vectorise(trainRecords, 
+                                                       testRecords)
+                uniqueTrain, uniqueTest = vect.vectorise(uniqueRecords,
+                                                         testRecords,
+                                                         sampleWeight)
+                self.assertTrue(np.allclose(uniqueTrain[inverse].toarray(),
+                                            trainVects.toarray()))
+                self.assertTrue(np.allclose(uniqueTest.toarray(),
+                                            testVects.toarray()))
+                self.assertTrue(np.allclose(
+                    vect.vectoriseList(testRecords).toarray(),
+                    testVects.toarray()
+                    ))
+                ml = m.MLearn(mlAlgType= 'DECISIONTREE',
+                              macLearnInput= {'impurity' : 'gini'})
+                predicted, _ = ml.trainAndPredict(trainVects, 
+                                                  trainFlags, 
+                                                  testVects)
+                uniquePredicted, _ = ml.trainAndPredict(uniqueTrain,
+                                                        uniqueFlags,
+                                                        uniqueTest,
+                                                        sampleWeight)
+                self.assertEqual(list(uniquePredicted), list(predicted))
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()